@@ -0,0 +1,104 @@
+# app/cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+
+@dataclass(frozen=True)
+class CachedPayload:
+    """Corpo JSON já serializado + ETag correspondente."""
+    body: bytes
+    etag: str
+
+
+def make_payload(data: Any) -> CachedPayload:
+    body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return make_file_payload(body)
+
+
+def make_file_payload(body: bytes) -> CachedPayload:
+    """Payload de um arquivo já gerado (ex.: exportações DOCX/PDF)."""
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+    return CachedPayload(body=body, etag=etag)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    O cliente já tem essa versão? Aceita listas ("a", "b"), "*" e ETags
+    fracos (W/"..."), que alguns proxies geram ao comprimir a resposta.
+    """
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def cached_json_response(request: Request, payload: CachedPayload) -> Response:
+    """
+    Responde com o payload pré-serializado.
+    Se o cliente já tem essa versão (If-None-Match), devolve 304 sem corpo.
+    """
+    headers = {"ETag": payload.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+class SnapshotCache:
+    """
+    Cache em memória de payloads pré-calculados, indexados por nome.
+
+    Cada payload só é reconstruído depois de `invalidate()`, que deve ser
+    chamado após qualquer commit que altere os dados usados para montá-lo.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = 0
+        self._payloads: Dict[str, CachedPayload] = {}
+
+    def get(self, name: str, builder: Callable[[], Any]) -> CachedPayload:
+        return self.get_payload(name, lambda: make_payload(builder()))
+
+    def get_payload(self, name: str, builder: Callable[[], CachedPayload]) -> CachedPayload:
+        """Igual a get(), mas o builder já devolve o CachedPayload pronto."""
+        cached, version = self._lookup(name)
+        if cached is not None:
+            return cached
+        return self._store(name, version, builder())
+
+    async def aget(self, name: str, builder: Callable[[], Awaitable[Any]]) -> CachedPayload:
+        """Igual a get(), com um builder assíncrono (rotas com AsyncSession)."""
+        cached, version = self._lookup(name)
+        if cached is not None:
+            return cached
+        return self._store(name, version, make_payload(await builder()))
+
+    def _lookup(self, name: str) -> Tuple[Optional[CachedPayload], int]:
+        with self._lock:
+            return self._payloads.get(name), self._version
+
+    def _store(self, name: str, version: int, payload: CachedPayload) -> CachedPayload:
+        with self._lock:
+            # Só guarda se ninguém invalidou enquanto o payload era montado
+            if version == self._version:
+                self._payloads[name] = payload
+        return payload
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._payloads = {}
+
+
+# Payloads públicos das mesas (/tables/view, /tables/people/public, /tables/seating)
+# e exportações da lista de confirmados (DOCX/PDF).
+# Invalidado por mudanças em mesas, convidados e acompanhantes.
+seating_cache = SnapshotCache()
@@ -2,25 +2,113 @@
 from __future__ import annotations
 
 import os
-from sqlalchemy import create_engine
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 # Carrega variáveis do .env (para desenvolvimento local)
 load_dotenv()
 
+# Pasta rsvp-backend/ (onde ficam alembic.ini e migrations/)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./rsvp.db")
 
 # Ajuste para URLs postgres antigas (postgres:// → postgresql://)
 if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# Para SQLite precisamos de um connect_args específico
-connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, "1" if default else "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+if IS_SQLITE:
+    # Para SQLite precisamos de um connect_args específico
+    engine_options = {"connect_args": {"check_same_thread": False}}
+    async_engine_options = {}
+else:
+    # Pool pensado para o Postgres gratuito do Render (poucas conexões):
+    # DB_POOL_SIZE conexões fixas + DB_MAX_OVERFLOW extras nos picos.
+    # Vale para cada engine (síncrono e assíncrono).
+    pool_options = {
+        "pool_size": _env_int("DB_POOL_SIZE", 5),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 5),
+        # Tempo (s) esperando uma conexão livre antes de dar erro
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        # Recria conexões mais velhas que isso (s); o servidor derruba as ociosas
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        # Testa a conexão antes de usar (evita erro após o app ficar ocioso)
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        # Reusa sempre as mesmas conexões; as extras ficam ociosas e são recicladas
+        "pool_use_lifo": True,
+    }
+    engine_options = {
+        **pool_options,
+        "connect_args": {"connect_timeout": _env_int("DB_CONNECT_TIMEOUT", 10)},
+    }
+    async_engine_options = {
+        **pool_options,
+        "connect_args": {"timeout": _env_int("DB_CONNECT_TIMEOUT", 10)},
+    }
+
+engine = create_engine(DATABASE_URL, **engine_options)
+
+
+def _async_url(url: str):
+    """Mesma URL, com o driver assíncrono (aiosqlite / asyncpg)."""
+    async_url = make_url(url)
+    if IS_SQLITE:
+        return async_url.set(drivername="sqlite+aiosqlite")
+
+    # asyncpg não aceita sslmode na URL; vai como argumento "ssl"
+    sslmode = async_url.query.get("sslmode")
+    if sslmode:
+        async_url = async_url.difference_update_query(["sslmode"])
+        async_engine_options["connect_args"]["ssl"] = sslmode
+    return async_url.set(drivername="postgresql+asyncpg")
+
+
+# Engine assíncrono, usado pelas rotas públicas de mais tráfego
+# (não ocupam uma thread do threadpool enquanto esperam o banco)
+async_engine = create_async_engine(_async_url(DATABASE_URL), **async_engine_options)
+
+
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Ajustes do SQLite (desenvolvimento local):
+    WAL permite leituras enquanto alguém grava; busy_timeout espera
+    o lock em vez de falhar na hora; foreign_keys liga os ON DELETE.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+if IS_SQLITE:
+    event.listen(engine, "connect", _sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: após o commit os objetos continuam legíveis
+# (em async não dá para recarregar atributos preguiçosamente)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -30,3 +118,52 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def run_migrations():
+    """
+    Aplica as migrações pendentes do Alembic (migrations/versions).
+    Chamado na inicialização da API; equivale a `alembic upgrade head`.
+    """
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    command.upgrade(config, "head")
+
+
+def warm_up_pool() -> int:
+    """
+    Abre de uma vez as conexões fixas do pool (DB_POOL_SIZE) e as devolve,
+    para que as primeiras requisições não paguem o custo de conectar.
+    Retorna quantas conexões foram abertas.
+    """
+    size = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(1, size)):
+            conn = engine.connect()
+            connections.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+async def warm_up_async_pool() -> int:
+    """Igual a warm_up_pool, para o engine assíncrono."""
+    pool = async_engine.sync_engine.pool
+    size = pool.size() if hasattr(pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(max(1, size)):
+            conn = await async_engine.connect()
+            connections.append(conn)
+            await conn.execute(text("SELECT 1"))
+    finally:
+        for conn in connections:
+            await conn.close()
+    return len(connections)
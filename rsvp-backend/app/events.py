@@ -0,0 +1,144 @@
+# app/events.py
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Set
+
+
+# Eventos guardados por cliente; um cliente lento que enche o buffer é
+# desconectado com um evento "resync" (recarrega tudo e reconecta)
+BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "100"))
+# Últimos eventos guardados para quem reconecta com Last-Event-ID
+HISTORY_SIZE = int(os.getenv("EVENTS_HISTORY_SIZE", "200"))
+# Limite de conexões abertas ao mesmo tempo (cada uma segura um socket)
+MAX_CLIENTS = int(os.getenv("EVENTS_MAX_CLIENTS", "50"))
+
+
+@dataclass(frozen=True)
+class Event:
+    id: Optional[int]
+    type: str
+    data: str  # JSON já serializado
+
+    def encode(self) -> str:
+        """Formato Server-Sent Events."""
+        lines = []
+        if self.id is not None:
+            lines.append(f"id: {self.id}")
+        lines.append(f"event: {self.type}")
+        lines.append(f"data: {self.data}")
+        return "\n".join(lines) + "\n\n"
+
+
+RESYNC = Event(id=None, type="resync", data="{}")
+
+
+class Subscription:
+    """
+    Fila de um cliente conectado. `offer` pode ser chamado de qualquer
+    thread (rotas síncronas, worker de fotos); a fila vive no event loop.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, event: Event) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if running is self._loop:
+            self._put(event)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Loop já encerrado (desligando o servidor)
+            pass
+
+    def _put(self, event: Event) -> None:
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Cliente não está dando conta: descarta o que sobrou e pede
+            # para ele recarregar, em vez de acumular memória sem limite
+            self.overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        """Próximo evento, ou None se nada chegou dentro do timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """
+    Pub/sub em memória (um processo) para o feed ao vivo do admin.
+    As rotas publicam depois do commit; cada cliente SSE tem sua fila.
+    """
+
+    def __init__(self, buffer_size: int = BUFFER_SIZE, history_size: int = HISTORY_SIZE) -> None:
+        self._lock = threading.Lock()
+        self._buffer_size = buffer_size
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._next_id = 1
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, data: Any) -> None:
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            event = Event(id=self._next_id, type=event_type, data=payload)
+            self._next_id += 1
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Nova fila (chamar dentro do event loop). Com `last_event_id`,
+        reenvia o que o cliente perdeu; se isso já saiu do histórico
+        (ou o servidor reiniciou), manda "resync".
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self._buffer_size)
+        with self._lock:
+            missed: List[Event] = []
+            if last_event_id is not None:
+                oldest = self._history[0].id if self._history else self._next_id
+                if last_event_id + 1 < oldest or last_event_id >= self._next_id:
+                    missed = [RESYNC]
+                else:
+                    missed = [e for e in self._history if e.id > last_event_id]
+                    if len(missed) > self._buffer_size:
+                        missed = [RESYNC]
+            self._subscribers.add(subscription)
+
+        for event in missed:
+            subscription.offer(event)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+broker = EventBroker()
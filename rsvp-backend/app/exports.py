@@ -0,0 +1,432 @@
+# app/exports.py
+"""
+Exportações da lista de confirmados (DOCX, PDF, CSV e XLSX) e dos
+cartões de mesa (PDF, uma página por mesa).
+
+Os dados vêm de uma única query (convidados + acompanhantes + mesa);
+DOCX/PDF são montados inteiros (e guardados em cache pelas rotas),
+CSV/XLSX são gerados em streaming, linha a linha.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import groupby
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from xml.sax.saxutils import escape
+
+from docx import Document
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4, A5
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.platypus import ListFlowable, ListItem, PageBreak, Paragraph, SimpleDocTemplate, Spacer
+from sqlalchemy import null, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.database import SessionLocal
+from app.models import Companion, Guest, TableArrangement
+
+
+TITLE = "Lista de Presença"
+NO_TABLE = "Sem mesa"
+
+# Quantas exportações pesadas (ex.: cartões de mesa) são geradas ao mesmo tempo
+EXPORT_WORKERS = max(1, int(os.getenv("EXPORT_WORKERS", "1")))
+_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+
+T = TypeVar("T")
+
+
+def run_in_worker(fn: Callable[[], T]) -> "asyncio.Future[T]":
+    """
+    Executa fn no pool de exportação (fora do event loop e do threadpool
+    das requisições), para que PDFs grandes não travem a API.
+    """
+    return asyncio.wrap_future(_executor.submit(fn))
+
+
+@lru_cache(maxsize=1)
+def _styles() -> StyleSheet1:
+    """
+    Estilos do reportlab montados uma única vez por processo
+    (getSampleStyleSheet() recria todos os estilos a cada chamada).
+    """
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(
+        "CardTitle", parent=styles["Title"], fontSize=30, leading=36, spaceAfter=4,
+    ))
+    styles.add(ParagraphStyle(
+        "CardCount", parent=styles["Normal"], alignment=TA_CENTER, textColor=colors.grey, spaceAfter=14,
+    ))
+    styles.add(ParagraphStyle(
+        "CardGuest", parent=styles["Normal"], fontName="Helvetica-Bold", fontSize=14, leading=18, spaceBefore=6,
+    ))
+    styles.add(ParagraphStyle(
+        "CardCompanion", parent=styles["Normal"], fontSize=12, leading=15, leftIndent=16,
+    ))
+    return styles
+
+
+@dataclass(frozen=True)
+class Attendee:
+    name: str
+    host: Optional[str]  # Convidado principal (só para acompanhantes)
+    table: Optional[int]
+
+    @property
+    def label(self) -> str:
+        return f"{self.name} - Mesa {self.table}" if self.table else self.name
+
+
+class ZipStreamBuffer:
+    """Destino do ZipFile que acumula só o que ainda não foi enviado ao cliente."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# ==========================
+#  Dados
+# ==========================
+def confirmed_attendees(db: Session) -> List[Attendee]:
+    """
+    Todos os confirmados (YES) e seus acompanhantes, com a mesa de cada um,
+    em uma única query (UNION ALL de convidados e acompanhantes).
+    Ordem: alfabética, sem repetir a mesma pessoa/mesa.
+    """
+    guests = (
+        select(
+            Guest.name.label("name"),
+            null().label("host"),
+            TableArrangement.table_number.label("table_number"),
+        )
+        .outerjoin(TableArrangement, TableArrangement.guest_id == Guest.id)
+        .where(Guest.rsvp_status == "YES")
+    )
+    companions = (
+        select(
+            Companion.name.label("name"),
+            Guest.name.label("host"),
+            TableArrangement.table_number.label("table_number"),
+        )
+        .join(Guest, Companion.guest_id == Guest.id)
+        .outerjoin(TableArrangement, TableArrangement.companion_id == Companion.id)
+        .where(Guest.rsvp_status == "YES")
+    )
+
+    attendees = {
+        Attendee(name=row.name.strip(), host=row.host, table=row.table_number)
+        for row in db.execute(union_all(guests, companions))
+        if row.name and row.name.strip()
+    }
+    return sorted(attendees, key=lambda a: (a.label.casefold(), a.host or ""))
+
+
+def group_by_table(attendees: Iterable[Attendee]) -> List[Tuple[str, List[Attendee]]]:
+    """[("Mesa 1", [...]), ("Mesa 2", [...]), ..., ("Sem mesa", [...])]"""
+    ordered = sorted(
+        attendees,
+        key=lambda a: (a.table is None, a.table or 0, a.name.casefold()),
+    )
+    return [
+        (f"Mesa {table}" if table else NO_TABLE, list(people))
+        for table, people in groupby(ordered, key=lambda a: a.table)
+    ]
+
+
+# ==========================
+#  DOCX / PDF
+# ==========================
+def _add_styled_paragraph(doc, text: str, style_id: str) -> None:
+    """
+    Igual a doc.add_paragraph(text, style=...), mas com o id do estilo já
+    resolvido: o python-docx procura o estilo a cada chamada, o que deixa
+    listas de milhares de nomes lentíssimas (segundos).
+    """
+    doc.add_paragraph(text)._p.style = style_id
+
+
+def build_docx(attendees: List[Attendee], by_table: bool = False) -> bytes:
+    doc = Document()
+    doc.add_heading(TITLE, level=1)
+    doc.add_paragraph(f"Total: {len(attendees)}")
+    doc.add_paragraph("")
+
+    if by_table:
+        bullet = doc.styles["List Bullet"].style_id
+        for section, people in group_by_table(attendees):
+            doc.add_heading(f"{section} ({len(people)})", level=2)
+            for person in people:
+                _add_styled_paragraph(doc, person.name, bullet)
+    else:
+        numbered = doc.styles["List Number"].style_id
+        for person in attendees:
+            _add_styled_paragraph(doc, person.label, numbered)
+
+    bio = io.BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+
+def build_pdf(attendees: List[Attendee], by_table: bool = False) -> bytes:
+    bio = io.BytesIO()
+    styles = _styles()
+
+    pdf = SimpleDocTemplate(bio, pagesize=A4, title=TITLE)
+    story = [
+        Paragraph(TITLE, styles["Title"]),
+        Spacer(1, 12),
+        Paragraph(f"Total: {len(attendees)}", styles["Normal"]),
+        Spacer(1, 16),
+    ]
+
+    if by_table:
+        for section, people in group_by_table(attendees):
+            story.append(Paragraph(f"{section} ({len(people)})", styles["Heading2"]))
+            items = [ListItem(Paragraph(escape(p.name), styles["Normal"])) for p in people]
+            story.append(ListFlowable(items, bulletType="bullet"))
+            story.append(Spacer(1, 8))
+    else:
+        items = [ListItem(Paragraph(escape(p.label), styles["Normal"])) for p in attendees]
+        story.append(ListFlowable(items, bulletType="1"))
+
+    pdf.build(story)
+    return bio.getvalue()
+
+
+# ==========================
+#  Cartões de mesa
+# ==========================
+@dataclass
+class CardGroup:
+    """Convidado com os acompanhantes sentados na mesma mesa."""
+    name: str
+    companions: List[str] = field(default_factory=list)
+    host: Optional[str] = None  # Acompanhante cujo convidado está em outra mesa
+
+
+def table_cards(db: Session) -> List[Tuple[int, List[CardGroup]]]:
+    """
+    Pessoas de cada mesa, em ordem de lugar, agrupando os acompanhantes
+    sob o seu convidado quando estão na mesma mesa. Uma única query.
+    """
+    host = aliased(Guest)
+    rows = db.execute(
+        select(
+            TableArrangement.table_number,
+            Guest.id.label("guest_id"),
+            Guest.name.label("guest_name"),
+            Companion.name.label("companion_name"),
+            host.id.label("host_id"),
+            host.name.label("host_name"),
+        )
+        .outerjoin(Guest, TableArrangement.guest_id == Guest.id)
+        .outerjoin(Companion, TableArrangement.companion_id == Companion.id)
+        .outerjoin(host, Companion.guest_id == host.id)
+        # Mesmo critério das mesas públicas: só quem confirmou (YES)
+        .where((Guest.rsvp_status == "YES") | (host.rsvp_status == "YES"))
+        .order_by(TableArrangement.table_number, TableArrangement.seat, TableArrangement.id)
+    ).all()
+
+    cards: List[Tuple[int, List[CardGroup]]] = []
+    for table_number, table_rows in groupby(rows, key=lambda r: r.table_number):
+        table_rows = list(table_rows)
+        groups: List[CardGroup] = []
+        by_guest: Dict[int, CardGroup] = {}
+
+        for row in table_rows:
+            if row.guest_id is not None:
+                by_guest[row.guest_id] = CardGroup(name=row.guest_name)
+
+        for row in table_rows:
+            if row.guest_id is not None:
+                groups.append(by_guest[row.guest_id])
+            elif row.host_id in by_guest:
+                by_guest[row.host_id].companions.append(row.companion_name)
+            else:
+                groups.append(CardGroup(name=row.companion_name, host=row.host_name))
+
+        cards.append((table_number, groups))
+    return cards
+
+
+def build_table_cards_pdf(cards: List[Tuple[int, List[CardGroup]]]) -> bytes:
+    """Um cartão (página A5) por mesa, com o total de pessoas."""
+    bio = io.BytesIO()
+    styles = _styles()
+
+    pdf = SimpleDocTemplate(bio, pagesize=A5, title="Cartões das mesas")
+    story = []
+    for i, (table_number, groups) in enumerate(cards):
+        if i:
+            story.append(PageBreak())
+
+        total = sum(1 + len(g.companions) for g in groups)
+        story.append(Paragraph(f"Mesa {table_number}", styles["CardTitle"]))
+        story.append(Paragraph(f"{total} pessoa{'s' if total != 1 else ''}", styles["CardCount"]))
+
+        for group in groups:
+            name = escape(group.name)
+            if group.host:
+                name += f' <font size="10" color="grey">(acompanhante de {escape(group.host)})</font>'
+            story.append(Paragraph(name, styles["CardGuest"]))
+            for companion in group.companions:
+                story.append(Paragraph(f"– {escape(companion)}", styles["CardCompanion"]))
+
+    if not story:
+        story.append(Paragraph("Nenhuma mesa organizada ainda.", styles["Normal"]))
+
+    pdf.build(story)
+    return bio.getvalue()
+
+
+def table_cards_pdf() -> bytes:
+    """Consulta + PDF com sessão própria (roda no pool de exportação)."""
+    db = SessionLocal()
+    try:
+        cards = table_cards(db)
+    finally:
+        db.close()
+    return build_table_cards_pdf(cards)
+
+
+# ==========================
+#  CSV / XLSX (streaming)
+# ==========================
+HEADER = ("Nome", "Convidado principal", "Mesa")
+
+# Linhas acumuladas antes de enviar um pedaço da resposta
+STREAM_BATCH = 500
+
+
+# Textos que o Excel/LibreOffice interpretariam como fórmula
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_text(value: str) -> str:
+    """Neutraliza injeção de fórmula (ex.: nome "=HYPERLINK(...)") com um apóstrofo."""
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+
+def _rows(attendees: List[Attendee], by_table: bool) -> Iterator[Tuple[str, str, Optional[int]]]:
+    if by_table:
+        attendees = [p for _, people in group_by_table(attendees) for p in people]
+    for person in attendees:
+        yield person.name, person.host or "", person.table
+
+
+def iter_csv(attendees: List[Attendee], by_table: bool = False) -> Iterator[bytes]:
+    """
+    CSV em UTF-8 com BOM e separador ";" (abre direto no Excel em pt-BR).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    buffer.write("\ufeff")
+    writer.writerow(HEADER)
+
+    for i, (name, host, table) in enumerate(_rows(attendees, by_table), start=1):
+        writer.writerow((_safe_text(name), _safe_text(host), table if table else ""))
+        if i % STREAM_BATCH == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Confirmados" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_row(values: Iterable) -> str:
+    cells = []
+    for value in values:
+        if value is None or value == "":
+            cells.append("<c/>")
+        elif isinstance(value, int):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_safe_text(str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def iter_xlsx(attendees: List[Attendee], by_table: bool = False) -> Iterator[bytes]:
+    """
+    Planilha XLSX mínima (uma aba, textos inline), escrita direto no ZIP
+    em streaming, sem depender de openpyxl nem montar o arquivo na memória.
+    """
+    buffer = ZipStreamBuffer()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _XLSX_STATIC.items():
+            zf.writestr(name, content)
+        yield buffer.drain()
+
+        with zf.open("xl/worksheets/sheet1.xml", mode="w") as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(HEADER).encode("utf-8"))
+
+            rows: List[str] = []
+            for values in _rows(attendees, by_table):
+                rows.append(_xlsx_row(values))
+                if len(rows) >= STREAM_BATCH:
+                    sheet.write("".join(rows).encode("utf-8"))
+                    rows.clear()
+                    yield buffer.drain()
+
+            sheet.write("".join(rows).encode("utf-8"))
+            sheet.write(b"</sheetData></worksheet>")
+
+    # Fim da aba + diretório central do ZIP
+    yield buffer.drain()
@@ -0,0 +1,273 @@
+# app/limits.py
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app import photo_jobs
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+# Quantos proxies (Render) acrescentam o IP do cliente em X-Forwarded-For.
+# O IP usado é o N-ésimo a partir da direita; o resto pode ser forjado.
+# 0 = ignora o header e usa o IP da conexão.
+PROXY_HOPS = _env_int("RATE_LIMIT_PROXY_HOPS", 1)
+
+
+class TokenBucketLimiter:
+    """
+    Limite por chave (IP, telefone): `per_minute` pedidos por minuto, com
+    rajadas de até `burst`. per_minute=0 desliga o limite.
+    """
+
+    # Acima disso, baldes cheios (chaves ociosas) são descartados
+    MAX_KEYS = 10_000
+
+    def __init__(self, per_minute: int, burst: int) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(max(1, burst))
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # chave -> (fichas, última vez)
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def hit(self, key: str) -> Optional[float]:
+        """Consome uma ficha. Retorna None se liberado, ou os segundos até liberar."""
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                if len(self._buckets) > self.MAX_KEYS:
+                    self._prune(now)
+                return None
+
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate
+
+    def _prune(self, now: float) -> None:
+        full = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * self.rate >= self.capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+
+
+class ConcurrencyLimit:
+    """Quantas requisições podem estar em andamento ao mesmo tempo (sem fila)."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.limit > 0 and self._active >= self.limit:
+                return False
+            self._active += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+
+# ==========================
+#  Limites das rotas públicas de escrita
+# ==========================
+rsvp_ip_limiter = TokenBucketLimiter(
+    _env_int("RSVP_RATE_PER_MINUTE", 10), _env_int("RSVP_RATE_BURST", 5)
+)
+# O mesmo telefone não precisa responder várias vezes por minuto
+rsvp_phone_limiter = TokenBucketLimiter(
+    _env_int("RSVP_PHONE_RATE_PER_MINUTE", 2), _env_int("RSVP_PHONE_RATE_BURST", 5)
+)
+upload_ip_limiter = TokenBucketLimiter(
+    _env_int("UPLOAD_RATE_PER_MINUTE", 6), _env_int("UPLOAD_RATE_BURST", 3)
+)
+# Envios de fotos recebendo/gravando arquivos ao mesmo tempo
+upload_slots = ConcurrencyLimit(_env_int("UPLOAD_MAX_CONCURRENT", 4))
+# Jobs de foto esperando o armazenamento; acima disso recusa novos envios
+UPLOAD_MAX_PENDING_JOBS = _env_int("UPLOAD_MAX_PENDING_JOBS", 300)
+# Sugestão de espera quando o servidor está cheio
+BUSY_RETRY_AFTER = _env_int("BUSY_RETRY_AFTER_SECONDS", 30)
+# Corpo máximo de um envio de fotos: 30 arquivos de 10MB + cabeçalhos do multipart.
+# Recusado antes de o Starlette ler (e gravar em disco) o corpo inteiro.
+UPLOAD_MAX_BODY_BYTES = _env_int(
+    "UPLOAD_MAX_BODY_BYTES",
+    photo_jobs.MAX_PHOTOS_PER_UPLOAD * photo_jobs.MAX_PHOTO_SIZE + 1024 * 1024,
+)
+
+
+def _retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def check_rate(limiter: TokenBucketLimiter, key: str) -> None:
+    """Para usar dentro das rotas (ex.: limite por telefone)."""
+    wait = limiter.hit(key)
+    if wait is not None:
+        raise HTTPException(
+            status.HTTP_429_TOO_MANY_REQUESTS,
+            "Muitas tentativas. Aguarde um pouco e tente novamente.",
+            headers={"Retry-After": _retry_after(wait)},
+        )
+
+
+def client_ip(scope) -> str:
+    if PROXY_HOPS > 0:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                hops: List[str] = [ip.strip() for ip in value.decode("latin-1").split(",") if ip.strip()]
+                if hops:
+                    return hops[-min(PROXY_HOPS, len(hops))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class WriteLimitMiddleware:
+    """
+    Protege as rotas públicas de escrita (POST /guests/ e /photos/upload)
+    antes de ler o corpo: limite por IP e, nos envios de fotos, um teto de
+    envios simultâneos e de jobs pendentes. Responde 429/503 com
+    Retry-After em vez de enfileirar sem limite.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path == "/guests/":
+            wait = rsvp_ip_limiter.hit(client_ip(scope))
+            if wait is not None:
+                await self._reject(scope, send, 429, "Muitas respostas enviadas. Aguarde um pouco.", wait)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        if path == "/photos/upload":
+            await self._upload(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _upload(self, scope, receive, send) -> None:
+        content_length = _content_length(scope)
+        if content_length is not None and content_length > UPLOAD_MAX_BODY_BYTES:
+            await self._reject(scope, send, 413, _TOO_LARGE)
+            return
+
+        wait = upload_ip_limiter.hit(client_ip(scope))
+        if wait is not None:
+            await self._reject(scope, send, 429, "Muitos envios de fotos. Aguarde um pouco.", wait)
+            return
+
+        if photo_jobs.pending_count() >= UPLOAD_MAX_PENDING_JOBS or not upload_slots.try_acquire():
+            await self._reject(
+                scope, send, 503, "Servidor ocupado com outros envios. Tente novamente em instantes.",
+                BUSY_RETRY_AFTER,
+            )
+            return
+        body_limit = _BodyLimit(receive, send, UPLOAD_MAX_BODY_BYTES)
+        try:
+            await self.app(scope, body_limit.receive, body_limit.send)
+        except Exception:
+            # O app vê o corte como desconexão do cliente; a resposta (413) já foi
+            if not body_limit.exceeded:
+                raise
+        finally:
+            upload_slots.release()
+
+    @staticmethod
+    async def _reject(scope, send, status_code: int, detail: str, retry_after: Optional[float] = None) -> None:
+        # Recusada antes do roteador: as rotas limitadas não têm parâmetros no
+        # caminho, então ele mesmo serve de rótulo nas métricas (em vez de "unmatched")
+        scope["route_path"] = scope["path"]
+        await _send_error(send, status_code, detail, retry_after)
+
+
+_TOO_LARGE = "Envio grande demais. Mande menos fotos por vez (máximo 10MB cada)."
+
+
+def _content_length(scope) -> Optional[int]:
+    for name, value in scope.get("headers", []):
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+async def _send_error(send, status_code: int, detail: str, retry_after: Optional[float] = None) -> None:
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if retry_after is not None:
+        headers.append((b"retry-after", _retry_after(retry_after).encode()))
+    await send({"type": "http.response.start", "status": status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class _BodyLimit:
+    """
+    Conta os bytes do corpo conforme chegam (vale também para envios
+    chunked, sem Content-Length). Passou do limite: responde 413 na hora
+    e entrega ao app uma desconexão, para ele parar de ler.
+    """
+
+    def __init__(self, receive, send, limit: int) -> None:
+        self._receive = receive
+        self._send = send
+        self._limit = limit
+        self._received = 0
+        self._response_started = False
+        self.exceeded = False
+
+    async def receive(self):
+        if self.exceeded:
+            return {"type": "http.disconnect"}
+
+        message = await self._receive()
+        if message["type"] == "http.request":
+            self._received += len(message.get("body", b""))
+            if self._received > self._limit:
+                self.exceeded = True
+                if not self._response_started:
+                    self._response_started = True
+                    await _send_error(self._send, 413, _TOO_LARGE)
+                return {"type": "http.disconnect"}
+        return message
+
+    async def send(self, message) -> None:
+        if self.exceeded:
+            # Já respondemos 413; descarta o erro que o app tentar mandar
+            return
+        if message["type"] == "http.response.start":
+            self._response_started = True
+        await self._send(message)
@@ -1,13 +1,55 @@
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app import photo_jobs
+from app.limits import WriteLimitMiddleware
+from app.metrics import MetricsMiddleware, instrument_engine
+from app.database import SessionLocal, async_engine, engine, run_migrations, warm_up_async_pool, warm_up_pool
+from app.search import companion_index, guest_index
+from app.routers import guests, companions, photos, tables, events, metrics
+
+# Cria/atualiza as tabelas e índices (substitui o antigo create_all)
+run_migrations()
+
+# Conta comandos e tempo de SQL por requisição (/metrics e Server-Timing)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+
+async def warm_up():
+    """
+    Abre as conexões do pool e preenche os caches (mesas e busca)
+    antes de o uvicorn começar a aceitar requisições.
+    Desligue com STARTUP_WARMUP=0.
+    """
+    if os.getenv("STARTUP_WARMUP", "1").strip().lower() in {"0", "false", "no", "off"}:
+        return
+
+    warm_up_pool()
+    await warm_up_async_pool()
+    db = SessionLocal()
+    try:
+        tables.prime_cache(db)
+        guest_index.ensure_loaded(db)
+        companion_index.ensure_loaded(db)
+    finally:
+        db.close()
+
 
-from app.database import Base, engine
-from app.routers import guests, companions, photos, tables
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Retoma uploads de fotos que ficaram pendentes
+    photo_jobs.resume_pending()
+    await warm_up()
+    yield
+    await async_engine.dispose()
 
-Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="Formatura RSVP API", version="1.0.0")
+app = FastAPI(title="Formatura RSVP API", version="1.0.0", lifespan=lifespan)
 
 origins = [
     o.strip()
@@ -15,14 +57,46 @@ origins = [
     if o.strip()
 ]
 
+# Limites das rotas públicas de escrita (antes do CORS, que fica por fora
+# e também adiciona os headers nas respostas 429/503)
+app.add_middleware(WriteLimitMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Versão das mesas (concorrência otimista no admin)
+    # Retry-After: espera sugerida nas respostas 429/503
+    # Server-Timing: tempos da requisição (app, banco, armazenamento) no DevTools
+    expose_headers=["ETag", "Retry-After", "Server-Timing"],
 )
 
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZip, exceto no feed ao vivo (SSE) e em arquivos já comprimidos.
+    O Starlette só passou a ignorar text/event-stream na 0.46 (e ZIP/JPEG
+    bem depois); em versões antigas o feed ficaria preso no buffer do gzip.
+    """
+
+    SKIP_PATHS = ("/events/", "/photos/export.zip")
+    SKIP_PREFIXES = ("/photos/files/",)
+
+    async def __call__(self, scope, receive, send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] == "http" and (path in self.SKIP_PATHS or path.startswith(self.SKIP_PREFIXES)):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Comprime respostas maiores (ex.: /tables/seating na noite do evento)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1000)
+
+# Por fora de tudo: mede o tempo total, inclusive respostas 429/503
+app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 def root():
     return {"status": "ok", "message": "API de RSVP funcionando."}
@@ -30,4 +104,6 @@ def root():
 app.include_router(guests.router)
 app.include_router(companions.router)
 app.include_router(photos.router)
-app.include_router(tables.router)
\ No newline at end of file
+app.include_router(tables.router)
+app.include_router(events.router)
+app.include_router(metrics.router)
\ No newline at end of file
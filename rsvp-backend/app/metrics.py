@@ -0,0 +1,265 @@
+# app/metrics.py
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# Limites (s) dos buckets dos histogramas de latência
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Limites dos buckets de "comandos SQL por requisição"
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = Tuple[str, ...]
+
+
+# ==========================
+#  Métricas (formato texto do Prometheus)
+# ==========================
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> (contagem por bucket, soma, total)
+        self._series: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            counts, total_sum, count = self._series.get(label_values) or ([0] * len(self.buckets), 0.0, 0)
+            index = bisect_left(self.buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            self._series[label_values] = (counts, total_sum + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for label_values, (counts, total_sum, count) in series:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _labels(self.labels + ("le",), label_values + (_number(bound),))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            le = _labels(self.labels + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{le} {count}")
+            labels = _labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_number(total_sum)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), kind: str = "counter") -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            values = sorted(self._values.items())
+        if not values and not self.labels:
+            values = [((), 0.0)]
+        for label_values, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {_number(value)}")
+        return lines
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Tempo de resposta por rota.",
+    ("method", "route", "status"), LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Counter(
+    "http_requests_in_flight", "Requisições em andamento.", kind="gauge",
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "Comandos SQL por requisição.",
+    ("method", "route"), STATEMENT_BUCKETS,
+)
+REQUEST_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Tempo total de SQL por requisição.",
+    ("method", "route"), LATENCY_BUCKETS,
+)
+SQL_STATEMENTS = Counter("db_statements_total", "Comandos SQL executados (inclui jobs em segundo plano).")
+SQL_DURATION = Counter("db_statement_seconds_total", "Tempo total gasto em comandos SQL.")
+STORAGE_DURATION = Histogram(
+    "storage_call_duration_seconds", "Chamadas ao armazenamento de fotos (Cloudinary ou disco).",
+    ("operation", "outcome"), LATENCY_BUCKETS,
+)
+
+_ALL = (
+    REQUEST_DURATION, REQUESTS_IN_FLIGHT, REQUEST_SQL_STATEMENTS, REQUEST_SQL_DURATION,
+    SQL_STATEMENTS, SQL_DURATION, STORAGE_DURATION,
+)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _ALL:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ==========================
+#  Contadores da requisição atual
+# ==========================
+@dataclass
+class RequestStats:
+    sql_count: int = 0
+    sql_seconds: float = 0.0
+    storage_count: int = 0
+    storage_seconds: float = 0.0
+
+
+# O objeto é compartilhado com o threadpool (as rotas síncronas recebem
+# uma cópia do contexto, mas apontando para o mesmo RequestStats)
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish_statement(conn)
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None:
+        _finish_statement(conn)
+
+
+def _finish_statement(conn) -> None:
+    starts = conn.info.get("metrics_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    SQL_STATEMENTS.inc()
+    SQL_DURATION.inc(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.sql_count += 1
+        stats.sql_seconds += elapsed
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Conta comandos e tempo de SQL (use engine.sync_engine no assíncrono)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def storage_timer(operation: str) -> Iterator[None]:
+    """Mede uma chamada ao armazenamento (upload, delete, read)."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - start
+        STORAGE_DURATION.observe(elapsed, operation, outcome)
+        stats = _current.get()
+        if stats is not None:
+            stats.storage_count += 1
+            stats.storage_seconds += elapsed
+
+
+# ==========================
+#  Middleware
+# ==========================
+class MetricsMiddleware:
+    """
+    Mede cada requisição (latência por rota, em andamento, SQL e
+    armazenamento) e devolve o resumo no header Server-Timing.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+        REQUESTS_IN_FLIGHT.inc(1)
+
+        async def send_with_timing(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(stats, start).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.inc(-1)
+            _current.reset(token)
+
+            route = _route_label(scope)
+            method = scope["method"]
+            REQUEST_DURATION.observe(elapsed, method, route, str(status_code))
+            REQUEST_SQL_STATEMENTS.observe(stats.sql_count, method, route)
+            REQUEST_SQL_DURATION.observe(stats.sql_seconds, method, route)
+
+
+def _route_label(scope) -> str:
+    # Caminho com parâmetros ("/guests/{guest_id}"), para não criar uma série por id
+    # (ou o caminho deixado por quem recusou antes do roteador, ex.: WriteLimitMiddleware)
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("route_path")
+    return path or "unmatched"
+
+
+def _server_timing(stats: RequestStats, start: float) -> str:
+    total_ms = (time.perf_counter() - start) * 1000
+    parts = [
+        f"app;dur={total_ms:.1f}",
+        f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_count} queries"',
+    ]
+    if stats.storage_count:
+        parts.append(f'storage;dur={stats.storage_seconds * 1000:.1f};desc="{stats.storage_count} calls"')
+    return ", ".join(parts)
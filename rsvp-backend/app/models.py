@@ -1,13 +1,20 @@
 # app/models.py
 from __future__ import annotations
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
 
 
+def _utcnow() -> datetime:
+    # Com microssegundos: o now() do SQLite grava só segundos e quebra os cursores
+    return datetime.now(timezone.utc)
+
+
 class Guest(Base):
     __tablename__ = "guests"
 
@@ -17,20 +24,38 @@ class Guest(Base):
 
     # Substitui "confirmed" por um status mais completo.
     # YES = vou, NO = não vou, MAYBE = talvez.
-    rsvp_status = Column(String, nullable=False, default="YES")
+    rsvp_status = Column(String, nullable=False, default="YES", index=True)
 
     # Data/hora em que a pessoa respondeu (ou atualizou a resposta).
-    responded_at = Column(DateTime, nullable=False, server_default=func.now())
+    responded_at = Column(DateTime, nullable=False, default=_utcnow, server_default=func.now())
 
     # Campo livre de recado.
     note = Column(Text, nullable=True)
 
+    # Chave enviada pelo formulário (header Idempotency-Key): reenvios do
+    # mesmo RSVP devolvem este convidado em vez de criar outro.
+    idempotency_key = Column(String, nullable=True, unique=True, index=True)
+    # SHA-256 do corpo enviado com a chave: outro corpo com a mesma chave é recusado
+    idempotency_hash = Column(String(64), nullable=True)
+
+    # Sincronização incremental do admin: versão (GuestListVersion) da última
+    # alteração do convidado ou de algum acompanhante dele.
+    version = Column(Integer, nullable=False, server_default="1", index=True)
+    updated_at = Column(DateTime, nullable=True)
+
     companions = relationship(
         "Companion",
         back_populates="guest",
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # Painel do admin: lista por status, da resposta mais recente para a mais antiga
+        Index("ix_guests_rsvp_status_responded_at_id", "rsvp_status", "responded_at", "id"),
+        # Última resposta / lista sem filtro de status
+        Index("ix_guests_responded_at_id", "responded_at", "id"),
+    )
+
 
 class Companion(Base):
     __tablename__ = "companions"
@@ -38,9 +63,13 @@ class Companion(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
 
-    guest_id = Column(Integer, ForeignKey("guests.id", ondelete="CASCADE"))
+    guest_id = Column(Integer, ForeignKey("guests.id", ondelete="CASCADE"), index=True)
     guest = relationship("Guest", back_populates="companions")
 
+    # Versão (GuestListVersion) da última alteração do acompanhante
+    version = Column(Integer, nullable=False, server_default="1")
+    updated_at = Column(DateTime, nullable=True)
+
 
 class Photo(Base):
     __tablename__ = "photos"
@@ -50,10 +79,47 @@ class Photo(Base):
     sender_name = Column(String, nullable=True)
     
     photo_url = Column(String, nullable=False)
+
+    # Versões menores para a galeria (fotos antigas podem não ter)
+    thumbnail_url = Column(String, nullable=True)
+    medium_url = Column(String, nullable=True)
     
     cloudinary_public_id = Column(String, nullable=False)
     
-    uploaded_at = Column(DateTime, nullable=False, server_default=func.now())
+    uploaded_at = Column(DateTime, nullable=False, default=_utcnow, server_default=func.now())
+
+    __table_args__ = (
+        # Paginação por cursor da galeria: ORDER BY uploaded_at DESC, id DESC
+        Index("ix_photos_uploaded_at_id", "uploaded_at", "id"),
+    )
+
+
+class PhotoJob(Base):
+    """
+    Fila de processamento de fotos.
+    O upload grava o arquivo bruto em disco e cria um job PENDING;
+    um worker envia para o armazenamento e cria a Photo correspondente.
+    """
+    __tablename__ = "photo_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # PENDING, PROCESSING, DONE ou ERROR
+    status = Column(String, nullable=False, default="PENDING")
+
+    sender_name = Column(String, nullable=True)
+    filename = Column(String, nullable=True)
+
+    # Caminho do arquivo bruto aguardando processamento
+    raw_path = Column(String, nullable=True)
+
+    error = Column(Text, nullable=True)
+
+    photo_id = Column(Integer, ForeignKey("photos.id", ondelete="SET NULL"), nullable=True)
+    photo = relationship("Photo")
+
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    finished_at = Column(DateTime, nullable=True)
 
 
 class TableArrangement(Base):
@@ -61,6 +127,9 @@ class TableArrangement(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     table_number = Column(Integer, nullable=False)
+
+    # Posição (lugar) dentro da mesa, na ordem enviada pelo admin
+    seat = Column(Integer, nullable=True)
     
     # Pode ser um guest_id ou companion_id
     guest_id = Column(Integer, ForeignKey("guests.id", ondelete="CASCADE"), nullable=True)
@@ -69,3 +138,47 @@ class TableArrangement(Base):
     # Relacionamentos
     guest = relationship("Guest")
     companion = relationship("Companion")
+
+    __table_args__ = (
+        # Pessoas de uma mesa, em ordem de lugar
+        Index("ix_table_arrangements_table_number_seat", "table_number", "seat"),
+        # Cada pessoa ocupa no máximo um lugar (NULLs não conflitam)
+        Index("uq_table_arrangements_guest_id", "guest_id", unique=True),
+        Index("uq_table_arrangements_companion_id", "companion_id", unique=True),
+    )
+
+
+class SeatingVersion(Base):
+    """
+    Versão da organização das mesas (linha única, id=1).
+    Incrementada a cada alteração; usada para rejeitar salvamentos
+    feitos a partir de uma versão desatualizada (concorrência otimista).
+    """
+    __tablename__ = "seating_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class GuestListVersion(Base):
+    """
+    Contador da lista de convidados (linha única, id=1).
+    Incrementado a cada alteração de convidado/acompanhante; o valor vira
+    a `version` dos registros alterados e o cursor `updated_since` do admin.
+    """
+    __tablename__ = "guest_list_versions"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class GuestTombstone(Base):
+    """
+    Registro de convidado apagado, para o admin remover da cópia local
+    na próxima sincronização incremental.
+    """
+    __tablename__ = "guest_tombstones"
+
+    guest_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, nullable=False, server_default=func.now())
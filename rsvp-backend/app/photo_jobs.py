@@ -0,0 +1,163 @@
+# app/photo_jobs.py
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import BinaryIO, List, Optional
+
+from app.database import SessionLocal
+from app.events import broker
+from app.metrics import storage_timer
+from app.models import Photo, PhotoJob
+from app.schemas import PhotoJobStatus, PhotoResponse
+from app.storage import storage
+
+
+logger = logging.getLogger(__name__)
+
+
+MAX_PHOTO_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_PHOTOS_PER_UPLOAD = 30
+
+# Tamanho dos blocos lidos/gravados ao salvar o arquivo bruto
+READ_CHUNK_SIZE = 64 * 1024
+
+# Onde os arquivos brutos ficam até serem processados
+SPOOL_DIR = os.getenv("PHOTO_SPOOL_DIR", "./uploads/pending")
+
+# Quantos jobs podem enviar para o armazenamento ao mesmo tempo
+UPLOAD_CONCURRENCY = max(1, int(os.getenv("PHOTO_UPLOAD_CONCURRENCY", "4")))
+_executor = ThreadPoolExecutor(
+    max_workers=UPLOAD_CONCURRENCY,
+    thread_name_prefix="photo-job",
+)
+
+
+def spool_upload(stream: BinaryIO, size: Optional[int] = None) -> str:
+    """
+    Copia o upload para SPOOL_DIR em blocos, validando o tamanho no caminho.
+    Retorna o caminho do arquivo salvo ou levanta ValueError.
+    """
+    if size is not None and size > MAX_PHOTO_SIZE:
+        raise ValueError("Imagem muito grande. Máximo 10MB")
+
+    os.makedirs(SPOOL_DIR, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=SPOOL_DIR, suffix=".upload")
+
+    total = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := stream.read(READ_CHUNK_SIZE):
+                total += len(chunk)
+                if total > MAX_PHOTO_SIZE:
+                    raise ValueError("Imagem muito grande. Máximo 10MB")
+                out.write(chunk)
+
+        if total == 0:
+            raise ValueError("Arquivo vazio")
+    except Exception:
+        _remove_raw(path)
+        raise
+
+    return path
+
+
+# Jobs enfileirados ou em andamento (usado para recusar envios quando lota)
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def pending_count() -> int:
+    return _pending
+
+
+def enqueue(job_id: int) -> None:
+    global _pending
+    with _pending_lock:
+        _pending += 1
+    _executor.submit(_run_job, job_id)
+
+
+def resume_pending() -> None:
+    """Reenfileira jobs que ficaram pela metade (ex.: servidor reiniciou)."""
+    db = SessionLocal()
+    try:
+        job_ids: List[int] = [
+            job_id
+            for (job_id,) in db.query(PhotoJob.id)
+            .filter(PhotoJob.status.in_([PhotoJobStatus.PENDING.value, PhotoJobStatus.PROCESSING.value]))
+            .order_by(PhotoJob.id)
+        ]
+    finally:
+        db.close()
+
+    for job_id in job_ids:
+        enqueue(job_id)
+
+
+def _run_job(job_id: int) -> None:
+    global _pending
+    try:
+        process_job(job_id)
+    except Exception:
+        logger.exception("Falha inesperada no job de foto %s", job_id)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+
+def process_job(job_id: int) -> None:
+    """Processa um job: envia o arquivo e cria a Photo (ou registra o erro)."""
+    db = SessionLocal()
+    try:
+        job = db.get(PhotoJob, job_id)
+        if job is None or job.status in {PhotoJobStatus.DONE.value, PhotoJobStatus.ERROR.value}:
+            return
+
+        job.status = PhotoJobStatus.PROCESSING.value
+        db.commit()
+
+        try:
+            with storage_timer("upload"):
+                stored = storage.upload(job.raw_path, job.filename)
+        except Exception as e:
+            job.status = PhotoJobStatus.ERROR.value
+            job.error = str(e)
+        else:
+            photo = Photo(
+                sender_name=job.sender_name,
+                photo_url=stored.url,
+                thumbnail_url=stored.thumbnail_url,
+                medium_url=stored.medium_url,
+                cloudinary_public_id=stored.public_id,
+                # Com microssegundos: o now() do SQLite só guarda segundos inteiros
+                # e fotos do mesmo segundo quebrariam o cursor da galeria
+                uploaded_at=datetime.now(timezone.utc),
+            )
+            db.add(photo)
+            job.photo = photo
+            job.status = PhotoJobStatus.DONE.value
+
+        job.finished_at = datetime.now(timezone.utc)
+        db.commit()
+
+        # Feed ao vivo do admin: a foto já aparece na galeria
+        if job.photo is not None:
+            broker.publish("photo.created", PhotoResponse.model_validate(job.photo).model_dump(mode="json"))
+
+        _remove_raw(job.raw_path)
+    finally:
+        db.close()
+
+
+def _remove_raw(path: Optional[str]) -> None:
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,19 +1,28 @@
 # app/routers/companions.py
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.cache import seating_cache
 from app.database import get_db
+from app.events import broker
 from app import models, schemas
+from app.search import companion_index
 
 from app.security import require_admin
+from app.sync import next_version, stamp
 
 router = APIRouter(
     prefix="/companions",
     tags=["Companions"],
 )
 
+def _publish_guest_updated(guest: models.Guest) -> None:
+    """O convidado mudou junto com os acompanhantes: avisa o feed ao vivo."""
+    broker.publish("guest.updated", schemas.GuestResponse.model_validate(guest).model_dump(mode="json"))
+
+
 # ==========================
 #  Normalização de nomes
 # ==========================
@@ -27,6 +36,31 @@ def normalize_name(name: str) -> str:
     return " ".join(word.capitalize() for word in name.split())
 
 
+def _companions_with_guest(db: Session):
+    """
+    Query única (JOIN) com os dados do acompanhante e do convidado principal.
+    Evita carregar `c.guest` preguiçosamente para cada linha (N+1).
+    """
+    return (
+        db.query(
+            models.Companion.id.label("companion_id"),
+            models.Companion.name.label("companion_name"),
+            models.Guest.id.label("guest_id"),
+            models.Guest.name.label("guest_name"),
+        )
+        .join(models.Guest, models.Companion.guest_id == models.Guest.id)
+    )
+
+
+def _companion_row(row) -> dict:
+    return {
+        "companion_id": row.companion_id,
+        "companion_name": row.companion_name,
+        "guest_id": row.guest_id,
+        "guest_name": row.guest_name,
+    }
+
+
 # ==========================
 #  LIST ALL COMPANIONS
 # ==========================
@@ -35,17 +69,9 @@ def list_companions(
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin)
 ):
-    comps = db.query(models.Companion).all()
-    
-    return [
-        {
-            "companion_id": c.id,
-            "companion_name": c.name,
-            "guest_id": c.guest.id,
-            "guest_name": c.guest.name,
-        }
-        for c in comps
-    ]
+    comps = _companions_with_guest(db).all()
+
+    return [_companion_row(c) for c in comps]
 
 
 # ==========================
@@ -54,29 +80,29 @@ def list_companions(
 @router.get("/find")
 def find_companions(
     q: str, 
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin)
 ):
-    possible_id = int(q) if q.isdigit() else None
+    # Busca no índice (sem acentos, por prefixo e aproximada), já ordenada
+    companion_index.ensure_loaded(db)
+    ids = companion_index.search(q, limit)
 
-    comps = (
-        db.query(models.Companion)
-        .filter(
-            (models.Companion.id == possible_id) |
-            (models.Companion.name.ilike(f"%{q}%"))
-        )
+    # Busca pelo id exato vem primeiro
+    if q.isdigit():
+        ids = [int(q)] + [i for i in ids if i != int(q)]
+
+    if not ids:
+        return []
+
+    rows = (
+        _companions_with_guest(db)
+        .filter(models.Companion.id.in_(ids))
         .all()
     )
+    by_id = {row.companion_id: row for row in rows}
 
-    return [
-        {
-            "companion_id": c.id,
-            "companion_name": c.name,
-            "guest_id": c.guest.id,
-            "guest_name": c.guest.name,
-        }
-        for c in comps
-    ]
+    return [_companion_row(by_id[i]) for i in ids if i in by_id]
 
 
 # ==========================
@@ -101,9 +127,14 @@ def add_companion(
         guest_id=guest_id
     )
 
+    # O convidado também muda de versão: a lista do admin traz os acompanhantes
+    stamp(next_version(db), new_comp, guest)
     db.add(new_comp)
     db.commit()
     db.refresh(new_comp)
+    seating_cache.invalidate()
+    companion_index.add(new_comp.id, new_comp.name)
+    _publish_guest_updated(guest)
 
     return {
         "message": "Acompanhante adicionado.",
@@ -134,6 +165,13 @@ def delete_companion(
     if not comp:
         raise HTTPException(404, "Acompanhante não encontrado.")
 
+    guest = comp.guest
+    if guest is not None:
+        stamp(next_version(db), guest)
     db.delete(comp)
     db.commit()
+    seating_cache.invalidate()
+    companion_index.remove(companion_id)
+    if guest is not None:
+        _publish_guest_updated(guest)
     return
@@ -0,0 +1,73 @@
+# app/routers/events.py
+from __future__ import annotations
+
+import os
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.events import MAX_CLIENTS, RESYNC, broker
+from app.security import require_admin
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"],
+)
+
+# Comentário enviado quando nada acontece, para proxies não fecharem a conexão
+HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+
+async def _event_stream(last_event_id: Optional[int]) -> AsyncIterator[str]:
+    # Inscreve só quando a resposta começa: se nunca começar, nada fica pendurado
+    subscription = broker.subscribe(last_event_id)
+    try:
+        # Reconexão automática do navegador depois de 5s
+        yield "retry: 5000\n\n"
+        while True:
+            event = await subscription.get(HEARTBEAT_SECONDS)
+            if event is None:
+                yield ": ping\n\n"
+                continue
+            yield event.encode()
+            if event is RESYNC:
+                break
+    finally:
+        # Cliente desconectou (a resposta é cancelada) ou ficou para trás
+        broker.unsubscribe(subscription)
+
+
+# ==========================
+#  FEED AO VIVO (SSE)
+# ==========================
+@router.get("/")
+async def live_events(
+    last_event_id: Optional[int] = Header(default=None, alias="Last-Event-ID"),
+    admin: None = Depends(require_admin),
+):
+    """
+    Feed ao vivo para o admin (Server-Sent Events): guest.created,
+    guest.updated, guest.deleted, photo.created, photo.deleted e
+    seating.updated (com a nova versão das mesas).
+
+    Envie Last-Event-ID ao reconectar para receber o que perdeu. O evento
+    "resync" avisa que é preciso recarregar tudo (histórico perdido ou
+    cliente lento demais); a conexão é encerrada em seguida.
+    """
+    if broker.client_count >= MAX_CLIENTS:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Muitas conexões ao vivo abertas. Tente novamente em instantes.",
+            headers={"Retry-After": "30"},
+        )
+
+    return StreamingResponse(
+        _event_stream(last_event_id),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desliga o buffer de proxies (nginx/Render) para os eventos chegarem na hora
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -1,27 +1,34 @@
 # app/routers/guests.py
 from __future__ import annotations
 
+import base64
+import hashlib
+import json
 from datetime import datetime, timezone
 
-from typing import List
+from typing import Callable, List, Optional, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from sqlalchemy import and_, exists, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.database import get_db
-from app import models, schemas
+from app.cache import cached_json_response, etag_matches, make_file_payload, seating_cache
+from app.database import get_async_db, get_db
+from app.events import broker
+from app.limits import check_rate, rsvp_phone_limiter
+from app import exports, models, schemas
+from app.search import companion_index, guest_index, index_guest, unindex_guest
 
 from app.security import require_admin
+from app.sync import add_tombstone, current_version, next_version, next_version_async, stamp
 
-from io import BytesIO
 from datetime import datetime
 
 from fastapi.responses import StreamingResponse
 
-from docx import Document
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, ListFlowable, ListItem
-from reportlab.lib.styles import getSampleStyleSheet
 
 
 router = APIRouter(
@@ -29,6 +36,11 @@ router = APIRouter(
     tags=["Guests"],
 )
 
+def _publish_guest(event_type: str, guest: models.Guest) -> None:
+    """Avisa o feed ao vivo do admin (após o commit)."""
+    broker.publish(event_type, schemas.GuestResponse.model_validate(guest).model_dump(mode="json"))
+
+
 def ensure_utc(dt):
     if not dt:
         return dt
@@ -54,49 +66,347 @@ def normalize_name(name: str) -> str:
 # ==========================
 #  CREATE GUEST (RSVP)
 # ==========================
+async def _guest_by_idempotency_key(db: AsyncSession, key: str) -> Optional[models.Guest]:
+    result = await db.execute(
+        select(models.Guest)
+        .options(selectinload(models.Guest.companions))
+        .where(models.Guest.idempotency_key == key)
+    )
+    guest = result.scalar_one_or_none()
+    if guest is not None:
+        # Mesma resposta da criação (o banco devolve a data sem fuso)
+        set_committed_value(guest, "responded_at", ensure_utc(guest.responded_at))
+    return guest
+
+
+def _request_hash(guest: schemas.GuestCreate) -> str:
+    return hashlib.sha256(guest.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def _replay(existing: models.Guest, request_hash: str, response: Response) -> models.Guest:
+    # Registros antigos (sem hash) continuam sendo devolvidos como antes
+    if existing.idempotency_hash not in (None, request_hash):
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_CONTENT,
+            "Esta Idempotency-Key já foi usada com outra resposta. Gere uma nova chave.",
+        )
+    response.headers["Idempotent-Replayed"] = "true"
+    return existing
+
+
 @router.post("/", response_model=schemas.GuestResponse, status_code=status.HTTP_201_CREATED)
-def create_guest(guest: schemas.GuestCreate, db: Session = Depends(get_db)):
+async def create_guest(
+    guest: schemas.GuestCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Registra o RSVP (convidado + acompanhantes) em uma única transação.
+
+    Com o header Idempotency-Key, reenvios com a mesma chave (duplo clique,
+    nova tentativa após erro de rede) devolvem o convidado já criado,
+    com o header Idempotent-Replayed: true. A mesma chave com outro corpo
+    é recusada com 422.
+    """
+    request_hash = _request_hash(guest)
+    if idempotency_key:
+        existing = await _guest_by_idempotency_key(db, idempotency_key)
+        if existing is not None:
+            return _replay(existing, request_hash, response)
+
+    # Limite por telefone (o limite por IP fica no WriteLimitMiddleware)
+    check_rate(rsvp_phone_limiter, "".join(ch for ch in guest.phone if ch.isdigit()) or guest.phone)
+
     normalized_name = normalize_name(guest.name)
+    now = datetime.now(timezone.utc)
 
     db_guest = models.Guest(
         name=normalized_name,
         phone=guest.phone,
         rsvp_status=guest.rsvp_status.value if hasattr(guest.rsvp_status, "value") else str(guest.rsvp_status),
         note=guest.note,
-        responded_at=datetime.now(timezone.utc),
+        responded_at=now,
+        idempotency_key=idempotency_key,
+        idempotency_hash=request_hash if idempotency_key else None,
+        updated_at=now,
     )
-    db.add(db_guest)
-    db.commit()
-    db.refresh(db_guest)
-
-    # Só cria acompanhantes se a pessoa marcou que VAI.
-    if db_guest.rsvp_status == schemas.RSVPStatus.YES.value:
-        for comp in guest.companions:
-            normalized_comp_name = normalize_name(comp.name)
-            new_comp = models.Companion(
-                name=normalized_comp_name,
-                guest_id=db_guest.id,
-            )
-            db.add(new_comp)
-
-        db.commit()
-        db.refresh(db_guest)
 
+    try:
+        db_guest.version = await next_version_async(db)
+        db.add(db_guest)
+        await db.flush()
+
+        # Só cria acompanhantes se a pessoa marcou que VAI.
+        # Todos em um único INSERT de várias linhas.
+        companions = []
+        if db_guest.rsvp_status == schemas.RSVPStatus.YES.value and guest.companions:
+            result = await db.scalars(
+                insert(models.Companion)
+                .values([
+                    {
+                        "name": normalize_name(comp.name),
+                        "guest_id": db_guest.id,
+                        "version": db_guest.version,
+                        "updated_at": now,
+                    }
+                    for comp in guest.companions
+                ])
+                .returning(models.Companion)
+            )
+            companions = sorted(result.all(), key=lambda c: c.id)
+        set_committed_value(db_guest, "companions", companions)
+
+        # Convidado + acompanhantes no mesmo commit
+        await db.commit()
+    except IntegrityError:
+        # Outra requisição com a mesma chave gravou primeiro
+        await db.rollback()
+        existing = await _guest_by_idempotency_key(db, idempotency_key) if idempotency_key else None
+        if existing is None:
+            raise
+        return _replay(existing, request_hash, response)
+
+    seating_cache.invalidate()
+    index_guest(db_guest)
+    _publish_guest("guest.created", db_guest)
     return db_guest
 
 
 # ==========================
 #  LIST ALL GUESTS
 # ==========================
-@router.get("/", response_model=List[schemas.GuestResponse])
+@router.get("/", response_model=Union[List[schemas.GuestResponse], schemas.GuestChanges])
 def list_guests(
+    updated_since: Optional[int] = Query(None, ge=0),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin),
+):
+    """
+    Sem parâmetros: lista completa.
+
+    Com `updated_since`: só o que mudou desde aquela versão (convidados
+    criados/alterados e ids apagados) e a versão atual, para o cliente
+    manter uma cópia local. Use updated_since=0 na primeira vez.
+    """
+    # Lê o contador antes dos dados: tudo até essa versão já está visível
+    version = current_version(db) if updated_since is not None else None
+
+    # selectinload: carrega todos os acompanhantes em uma única query extra,
+    # em vez de uma query por convidado (N+1)
+    query = db.query(models.Guest).options(selectinload(models.Guest.companions))
+    if updated_since is not None:
+        query = query.filter(models.Guest.version > updated_since)
+    guests = query.all()
+
+    for g in guests:
+        g.responded_at = ensure_utc(g.responded_at)
+
+    if updated_since is None:
+        return guests
+
+    # Um id reaproveitado depois de apagado (SQLite) não conta como apagado
+    deleted = (
+        db.query(models.GuestTombstone.guest_id)
+        .filter(
+            models.GuestTombstone.version > updated_since,
+            ~exists().where(models.Guest.id == models.GuestTombstone.guest_id),
+        )
+        .all()
+    )
+    return schemas.GuestChanges(
+        items=[schemas.GuestResponse.model_validate(g) for g in guests],
+        deleted=[row.guest_id for row in deleted],
+        version=max([version] + [g.version for g in guests]),
+    )
+
+
+# ==========================
+#  DASHBOARD: RESUMO
+# ==========================
+def _guest_summary(db: Session) -> dict:
+    yes = schemas.RSVPStatus.YES.value
+
+    # Status desconhecidos contam como "talvez" (igual ao painel)
+    counts = {s.value: 0 for s in schemas.RSVPStatus}
+    rows = (
+        db.query(models.Guest.rsvp_status, func.count(models.Guest.id))
+        .group_by(models.Guest.rsvp_status)
+        .all()
+    )
+    for rsvp_status, total in rows:
+        key = rsvp_status if rsvp_status in counts else schemas.RSVPStatus.MAYBE.value
+        counts[key] += total
+
+    companions_yes = (
+        db.query(func.count(models.Companion.id))
+        .join(models.Guest, models.Companion.guest_id == models.Guest.id)
+        .filter(models.Guest.rsvp_status == yes)
+        .scalar()
+    )
+
+    # Lugares ocupados por confirmados ou por acompanhantes de confirmados
+    seated = (
+        db.query(func.count(models.TableArrangement.id))
+        .outerjoin(models.Companion, models.TableArrangement.companion_id == models.Companion.id)
+        .join(
+            models.Guest,
+            models.Guest.id == func.coalesce(
+                models.TableArrangement.guest_id, models.Companion.guest_id
+            ),
+        )
+        .filter(models.Guest.rsvp_status == yes)
+        .scalar()
+    )
+
+    last = (
+        db.query(models.Guest.id, models.Guest.name, models.Guest.responded_at)
+        .order_by(models.Guest.responded_at.desc(), models.Guest.id.desc())
+        .first()
+    )
+
+    people_yes = counts[yes] + companions_yes
+    summary = schemas.GuestSummary(
+        counts=counts,
+        total_responses=sum(counts.values()),
+        companions_yes=companions_yes,
+        people_yes=people_yes,
+        seated=seated,
+        unseated=max(people_yes - seated, 0),
+        last_response=(
+            schemas.LastResponse(
+                id=last.id, name=last.name, responded_at=ensure_utc(last.responded_at)
+            )
+            if last else None
+        ),
+    )
+    return summary.model_dump(mode="json")
+
+
+@router.get("/summary", response_model=schemas.GuestSummary)
+def guests_summary(
+    request: Request,
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin),
+):
+    """
+    Números do painel (respostas por status, presentes, com/sem mesa e
+    última resposta), calculados no banco. Fica em cache até a próxima
+    alteração de convidados, acompanhantes ou mesas.
+    """
+    payload = seating_cache.get("guests:summary", lambda: _guest_summary(db))
+    return cached_json_response(request, payload)
+
+
+# ==========================
+#  DASHBOARD: LISTA PAGINADA
+# ==========================
+def _encode_cursor(guest: models.Guest) -> str:
+    raw = json.dumps([guest.responded_at.isoformat(), guest.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        responded_at, guest_id = json.loads(raw)
+        return datetime.fromisoformat(responded_at), int(guest_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _search_filter(db: Session, q: str):
+    """
+    Convidados cujo nome/telefone ou algum acompanhante contém o texto
+    (pelos índices em memória, sem acentos) ou cujo recado contém o texto.
+    Buscas muito amplas ("a") ficam nos melhores resultados de cada índice
+    (search.MAX_CONTAINING), para o IN não virar milhares de parâmetros.
+    """
+    guest_index.ensure_loaded(db)
+    companion_index.ensure_loaded(db)
+
+    ids = set(guest_index.containing(q))
+    if q.isdigit():
+        ids.add(int(q))
+
+    companion_ids = companion_index.containing(q)
+    if companion_ids:
+        rows = (
+            db.query(models.Companion.guest_id)
+            .filter(models.Companion.id.in_(companion_ids))
+            .all()
+        )
+        ids.update(row.guest_id for row in rows)
+
+    return or_(
+        models.Guest.id.in_(ids),
+        models.Guest.note.icontains(q, autoescape=True),
+    )
+
+
+@router.get("/page", response_model=schemas.GuestPage)
+def list_guests_page(
+    rsvp_status: Optional[schemas.RSVPStatus] = Query(None, alias="status"),
+    q: Optional[str] = Query(None, max_length=100),
+    with_note: bool = False,
+    with_companions: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin),
 ):
-    guests = db.query(models.Guest).all()
+    """
+    Lista do painel, filtrada e paginada no banco: da resposta mais
+    recente para a mais antiga. Para a próxima página, envie o
+    `next_cursor` recebido como `cursor`.
+    """
+    query = db.query(models.Guest)
+
+    if rsvp_status is not None:
+        query = query.filter(models.Guest.rsvp_status == rsvp_status.value)
+    if q and q.strip():
+        query = query.filter(_search_filter(db, q.strip()))
+    if with_note:
+        query = query.filter(
+            models.Guest.note.isnot(None),
+            func.trim(models.Guest.note) != "",
+        )
+    if with_companions:
+        query = query.filter(models.Guest.companions.any())
+
+    total = query.with_entities(func.count(models.Guest.id)).scalar()
+
+    if cursor:
+        responded_at, guest_id = _decode_cursor(cursor)
+        # O "<=" na frente deixa o banco buscar direto no índice (sem o OR sozinho)
+        query = query.filter(
+            models.Guest.responded_at <= responded_at,
+            or_(
+                models.Guest.responded_at < responded_at,
+                models.Guest.id < guest_id,
+            ),
+        )
+
+    guests = (
+        query.options(selectinload(models.Guest.companions))
+        .order_by(models.Guest.responded_at.desc(), models.Guest.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(guests) > limit:
+        guests = guests[:limit]
+        next_cursor = _encode_cursor(guests[-1])
+
     for g in guests:
         g.responded_at = ensure_utc(g.responded_at)
-    return guests
+
+    return schemas.GuestPage(
+        items=[schemas.GuestResponse.model_validate(g) for g in guests],
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 
@@ -108,22 +418,30 @@ def list_guests(
 @router.get("/find", response_model=List[schemas.GuestResponse])
 def find_guests(
     q: str,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin),
 ):
-    possible_id = int(q) if q.isdigit() else None
+    # Busca no índice (sem acentos, por prefixo e aproximada), já ordenada
+    guest_index.ensure_loaded(db)
+    ids = guest_index.search(q, limit)
+
+    # Busca pelo id exato vem primeiro
+    if q.isdigit():
+        ids = [int(q)] + [i for i in ids if i != int(q)]
+
+    if not ids:
+        return []
 
     guests = (
         db.query(models.Guest)
-        .filter(
-            (models.Guest.id == possible_id)
-            | (models.Guest.name.ilike(f"%{q}%"))
-            | (models.Guest.phone.ilike(f"%{q}%"))
-        )
+        .options(selectinload(models.Guest.companions))
+        .filter(models.Guest.id.in_(ids))
         .all()
     )
+    by_id = {g.id: g for g in guests}
 
-    return guests
+    return [by_id[i] for i in ids if i in by_id]
 
 
 # ==========================
@@ -176,14 +494,20 @@ def update_guest(
         status_changed = True
 
     # Se mudou pra NO/MAYBE, remove acompanhantes (não faz sentido manter)
+    removed_companion_ids = []
     if status_changed:
         guest.responded_at = datetime.now(timezone.utc)
 
         if guest.rsvp_status in {schemas.RSVPStatus.NO.value, schemas.RSVPStatus.MAYBE.value}:
+            removed_companion_ids = [c.id for c in guest.companions]
             guest.companions.clear()  # cascade delete-orphan
 
+    stamp(next_version(db), guest)
     db.commit()
     db.refresh(guest)
+    seating_cache.invalidate()
+    index_guest(guest, removed_companion_ids)
+    _publish_guest("guest.updated", guest)
     return guest
 
 
@@ -199,103 +523,100 @@ def delete_guest(
     guest = db.query(models.Guest).filter(models.Guest.id == guest_id).first()
     if not guest:
         raise HTTPException(404, "Convidado não encontrado.")
+    companion_ids = [c.id for c in guest.companions]
     db.delete(guest)
+    version = next_version(db)
+    add_tombstone(db, guest_id, version)
     db.commit()
+    seating_cache.invalidate()
+    unindex_guest(guest_id, companion_ids)
+    broker.publish("guest.deleted", {"id": guest_id, "version": version})
     return
 
 
-def _confirmed_attendees_with_tables(db: Session) -> list[str]:
-    """Retorna lista de strings 'Nome - Mesa X' (ou só 'Nome' se sem mesa),
-    ordenada alfabeticamente."""
-    confirmed_guests = (
-        db.query(models.Guest)
-        .filter(models.Guest.rsvp_status == schemas.RSVPStatus.YES.value)
-        .order_by(models.Guest.name.asc())
-        .all()
+# ==========================
+#  EXPORTS (lista de confirmados)
+# ==========================
+_EXPORT_MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def _export_headers(ext: str) -> dict:
+    filename = f"confirmados-{datetime.now().strftime('%Y-%m-%d_%H-%M')}.{ext}"
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+def _cached_document(
+    request: Request,
+    db: Session,
+    ext: str,
+    group_by_table: bool,
+    build: Callable[[list, bool], bytes],
+) -> Response:
+    """
+    DOCX/PDF guardados em cache até a próxima mudança em convidados,
+    acompanhantes ou mesas (mesma invalidação do seating_cache).
+    """
+    payload = seating_cache.get_payload(
+        f"export:{ext}:{int(group_by_table)}",
+        lambda: make_file_payload(build(exports.confirmed_attendees(db), group_by_table)),
     )
 
-    # Monta mapa person_id -> table_number a partir de TableArrangement
-    arrangements = db.query(models.TableArrangement).all()
-    guest_table: dict[int, int] = {}
-    companion_table: dict[int, int] = {}
-    for a in arrangements:
-        if a.guest_id is not None:
-            guest_table[a.guest_id] = a.table_number
-        if a.companion_id is not None:
-            companion_table[a.companion_id] = a.table_number
-
-    entries: list[str] = []
-    for g in confirmed_guests:
-        if g.name:
-            tbl = guest_table.get(g.id)
-            label = f"{g.name.strip()} - Mesa {tbl}" if tbl else g.name.strip()
-            entries.append(label)
-
-        for c in (g.companions or []):
-            if c.name:
-                tbl = companion_table.get(c.id)
-                label = f"{c.name.strip()} - Mesa {tbl}" if tbl else c.name.strip()
-                entries.append(label)
-
-    # remove duplicados e ordena por casefold
-    unique = sorted(set(entries), key=lambda s: s.casefold())
-    return unique
+    headers = {**_export_headers(ext), "ETag": payload.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type=_EXPORT_MEDIA_TYPES[ext], headers=headers)
 
 
 @router.get("/export/confirmed.docx")
 def export_confirmed_docx(
+    request: Request,
+    group_by_table: bool = False,
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin),
 ):
-    names = _confirmed_attendees_with_tables(db)
-
-    doc = Document()
-    doc.add_heading("Lista de Presença", level=1)
-    doc.add_paragraph(f"Total: {len(names)}")
-    doc.add_paragraph("")
-
-    for n in names:
-        doc.add_paragraph(n, style="List Number")
-
-    bio = BytesIO()
-    doc.save(bio)
-    bio.seek(0)
-
-    filename = f"confirmados-{datetime.now().strftime('%Y-%m-%d_%H-%M')}.docx"
-    return StreamingResponse(
-        bio,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
+    return _cached_document(request, db, "docx", group_by_table, exports.build_docx)
 
 
 @router.get("/export/confirmed.pdf")
 def export_confirmed_pdf(
+    request: Request,
+    group_by_table: bool = False,
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin),
 ):
-    names = _confirmed_attendees_with_tables(db)
-
-    bio = BytesIO()
-    styles = getSampleStyleSheet()
+    return _cached_document(request, db, "pdf", group_by_table, exports.build_pdf)
 
-    pdf = SimpleDocTemplate(bio, pagesize=A4, title="Lista de Presença")
-    story = [
-        Paragraph("Lista de Presença", styles["Title"]),
-        Spacer(1, 12),
-        Paragraph(f"Total: {len(names)}", styles["Normal"]),
-        Spacer(1, 16),
-    ]
 
-    items = [ListItem(Paragraph(n, styles["Normal"])) for n in names]
-    story.append(ListFlowable(items, bulletType="1"))
+@router.get("/export/confirmed.csv")
+def export_confirmed_csv(
+    group_by_table: bool = False,
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin),
+):
+    """Planilha simples (Nome;Convidado principal;Mesa), enviada em streaming."""
+    attendees = exports.confirmed_attendees(db)
+    return StreamingResponse(
+        exports.iter_csv(attendees, group_by_table),
+        media_type=_EXPORT_MEDIA_TYPES["csv"],
+        headers=_export_headers("csv"),
+    )
 
-    pdf.build(story)
 
-    bio.seek(0)
-    filename = f"confirmados-{datetime.now().strftime('%Y-%m-%d_%H-%M')}.pdf"
+@router.get("/export/confirmed.xlsx")
+def export_confirmed_xlsx(
+    group_by_table: bool = False,
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin),
+):
+    """Mesmas colunas do CSV, em XLSX, enviado em streaming."""
+    attendees = exports.confirmed_attendees(db)
     return StreamingResponse(
-        bio,
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        exports.iter_xlsx(attendees, group_by_table),
+        media_type=_EXPORT_MEDIA_TYPES["xlsx"],
+        headers=_export_headers("xlsx"),
     )
@@ -0,0 +1,47 @@
+# app/routers/metrics.py
+from __future__ import annotations
+
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.metrics import render_metrics
+from app.security import require_admin
+
+router = APIRouter(tags=["Metrics"])
+
+
+def require_metrics_token(
+    authorization: str | None = Header(default=None),
+    x_admin_token: str | None = Header(default=None, alias="X-Admin-Token"),
+) -> None:
+    """
+    Com METRICS_TOKEN configurado, o coletor (Prometheus) envia
+    "Authorization: Bearer <token>". Sem ele, vale o token do admin.
+    """
+    expected = os.getenv("METRICS_TOKEN")
+    if not expected:
+        require_admin(x_admin_token)
+        return
+
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip(), expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# ==========================
+#  MÉTRICAS (PROMETHEUS)
+# ==========================
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics(auth: None = Depends(require_metrics_token)):
+    """
+    Latência por rota, requisições em andamento, SQL por requisição e
+    chamadas ao armazenamento, no formato texto do Prometheus.
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,26 +1,39 @@
 # app/routers/photos.py
+import base64
+import json
+import logging
 import os
-from typing import List
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Form, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-import cloudinary
-import cloudinary.uploader
-
-from app.database import get_db
-from app.models import Photo
-from app.schemas import PhotoResponse
+from app import photo_jobs
+from app.database import get_async_db, get_db
+from app.events import broker
+from app.exports import ZipStreamBuffer
+from app.metrics import storage_timer
+from app.models import Photo, PhotoJob
+from app.schemas import PhotoJobResponse, PhotoPage, PhotoResponse, PhotoUploadError, PhotoUploadResponse
 from app.security import require_admin
+from app.storage import LocalStorage, StoredPhoto, storage
 
 
-# Configuração do Cloudinary
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-    secure=True
-)
+logger = logging.getLogger(__name__)
+
+# Quantas fotos são buscadas no armazenamento ao mesmo tempo na exportação
+EXPORT_CONCURRENCY = max(1, int(os.getenv("PHOTO_EXPORT_CONCURRENCY", "4")))
+
+EXPORT_FOLDER = "fotos-festa-duda"
 
 
 router = APIRouter(
@@ -29,90 +42,143 @@ router = APIRouter(
 )
 
 
-@router.post("/upload", response_model=List[PhotoResponse], status_code=status.HTTP_201_CREATED)
+def _commit_jobs(db: Session, jobs: List[PhotoJob]) -> List[PhotoJobResponse]:
+    db.commit()
+    return [PhotoJobResponse.model_validate(job) for job in jobs]
+
+
+@router.post("/upload", response_model=PhotoUploadResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_photos(
     files: List[UploadFile] = File(...),
     sender_name: str = Form(None),
     db: Session = Depends(get_db)
 ):
     """
-    Faz upload de múltiplas fotos (até 30) para o Cloudinary e salva no banco de dados.
+    Recebe múltiplas fotos (até 30), grava os arquivos brutos e cria um job
+    de processamento para cada uma. Responde 202 na hora com os jobs;
+    o envio para o armazenamento acontece em segundo plano.
+    Acompanhe o andamento em GET /photos/jobs.
     """
     # Validar quantidade de arquivos
-    if len(files) > 30:
-        raise HTTPException(400, "Máximo de 30 fotos por envio")
+    if len(files) > photo_jobs.MAX_PHOTOS_PER_UPLOAD:
+        raise HTTPException(400, f"Máximo de {photo_jobs.MAX_PHOTOS_PER_UPLOAD} fotos por envio")
     
     if len(files) == 0:
         raise HTTPException(400, "Nenhuma foto foi enviada")
     
-    uploaded_photos = []
+    jobs = []
     errors = []
     
     for idx, file in enumerate(files):
         try:
             # Validar tipo de arquivo
-            if not file.content_type.startswith("image/"):
-                errors.append(f"Arquivo {idx + 1}: Apenas imagens são permitidas")
-                continue
-            
-            # Validar tamanho (máximo 10MB)
-            contents = await file.read()
-            if len(contents) > 10 * 1024 * 1024:
-                errors.append(f"Arquivo {idx + 1}: Imagem muito grande. Máximo 10MB")
-                continue
+            if not (file.content_type or "").startswith("image/"):
+                raise ValueError("Apenas imagens são permitidas")
             
-            # Upload para o Cloudinary
-            upload_result = cloudinary.uploader.upload(
-                contents,
-                folder="formatura-duda",
-                resource_type="image",
-                transformation=[
-                    {"width": 1920, "height": 1920, "crop": "limit"},
-                    {"quality": "auto:good"}
-                ]
-            )
-            
-            # Salvar no banco de dados
-            db_photo = Photo(
-                sender_name=sender_name if sender_name else None,
-                photo_url=upload_result["secure_url"],
-                cloudinary_public_id=upload_result["public_id"]
-            )
-            db.add(db_photo)
-            uploaded_photos.append(db_photo)
-            
-        except Exception as e:
-            errors.append(f"Arquivo {idx + 1}: {str(e)}")
+            # Salva o arquivo bruto validando o tamanho (máximo 10MB)
+            raw_path = await run_in_threadpool(photo_jobs.spool_upload, file.file, file.size)
+        except ValueError as e:
+            errors.append(PhotoUploadError(index=idx + 1, filename=file.filename, detail=str(e)))
+            continue
+        
+        job = PhotoJob(
+            sender_name=sender_name if sender_name else None,
+            filename=file.filename,
+            raw_path=raw_path,
+        )
+        db.add(job)
+        jobs.append(job)
     
-    # Commit de todas as fotos que deram certo
-    if uploaded_photos:
-        db.commit()
-        for photo in uploaded_photos:
-            db.refresh(photo)
+    # Se nenhuma foto foi aceita
+    if not jobs:
+        detail = "; ".join(f"Arquivo {e.index}: {e.detail}" for e in errors)
+        raise HTTPException(400, f"Nenhuma foto foi enviada com sucesso. Erros: {detail}")
     
-    # Se nenhuma foto foi enviada com sucesso
-    if not uploaded_photos:
-        raise HTTPException(400, f"Nenhuma foto foi enviada com sucesso. Erros: {'; '.join(errors)}")
+    # Commit e leitura dos ids fora do event loop: com o SQLite ocupado,
+    # esperar o lock aqui travaria todas as outras requisições
+    job_responses = await run_in_threadpool(_commit_jobs, db, jobs)
     
-    # Se algumas falharam, retorna as que deram certo mas avisa
-    if errors:
-        # Aqui poderíamos logar os erros, mas ainda retornamos as fotos que deram certo
-        pass
+    response = PhotoUploadResponse(
+        jobs=job_responses,
+        errors=errors,
+    )
     
-    return uploaded_photos
+    for job in jobs:
+        photo_jobs.enqueue(job.id)
+    
+    return response
 
 
-@router.get("/", response_model=List[PhotoResponse])
-def list_photos(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+@router.get("/jobs", response_model=List[PhotoJobResponse])
+def get_photo_jobs(
+    ids: List[int] = Query(...),
+    db: Session = Depends(get_db)
 ):
     """
-    Lista todas as fotos enviadas, ordenadas da mais recente para a mais antiga.
+    Status dos jobs de upload (PENDING, PROCESSING, DONE ou ERROR).
+    Quando DONE, inclui a foto criada.
     """
-    photos = db.query(Photo).order_by(Photo.uploaded_at.desc()).offset(skip).limit(limit).all()
-    return photos
+    return (
+        db.query(PhotoJob)
+        .options(selectinload(PhotoJob.photo))
+        .filter(PhotoJob.id.in_(ids))
+        .order_by(PhotoJob.id)
+        .all()
+    )
+
+
+def _encode_cursor(photo: Photo) -> str:
+    raw = json.dumps([photo.uploaded_at.isoformat(), photo.id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        uploaded_at, photo_id = json.loads(raw)
+        return datetime.fromisoformat(uploaded_at), int(photo_id)
+    except (ValueError, TypeError):
+        raise HTTPException(400, "Cursor inválido")
+
+
+def _page_query(cursor: Optional[str], limit: int):
+    """Fotos da mais recente para a mais antiga, a partir do cursor."""
+    query = select(Photo)
+    if cursor:
+        uploaded_at, photo_id = _decode_cursor(cursor)
+        # O "uploaded_at <=" na frente deixa o banco pular direto para o ponto
+        # do cursor no índice; só o OR faria o SQLite varrer desde o início
+        query = query.where(
+            Photo.uploaded_at <= uploaded_at,
+            or_(Photo.uploaded_at < uploaded_at, Photo.id < photo_id),
+        )
+    return query.order_by(Photo.uploaded_at.desc(), Photo.id.desc()).limit(limit)
+
+
+@router.get("/", response_model=PhotoPage)
+async def list_photos(
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Lista as fotos enviadas, da mais recente para a mais antiga, em páginas.
+    Para a próxima página, envie o `next_cursor` recebido como `cursor`.
+    A paginação é por (uploaded_at, id): fotos novas não deslocam as páginas.
+    """
+    # Busca um a mais para saber se existe próxima página
+    result = await db.execute(_page_query(cursor, limit + 1))
+    photos = result.scalars().all()
+    
+    next_cursor = None
+    if len(photos) > limit:
+        photos = photos[:limit]
+        next_cursor = _encode_cursor(photos[-1])
+    
+    return PhotoPage(
+        items=[PhotoResponse.model_validate(p) for p in photos],
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/count")
@@ -124,6 +190,120 @@ def count_photos(db: Session = Depends(get_db)):
     return {"total": total}
 
 
+@router.get("/files/{public_id}")
+def get_photo_file(public_id: str):
+    """
+    Serve as fotos do armazenamento local (PHOTO_STORAGE=local).
+    Os nomes são únicos, então o navegador pode guardar em cache para sempre.
+    """
+    if not isinstance(storage, LocalStorage):
+        raise HTTPException(404, "Foto não encontrada")
+    
+    path = storage.path_for(public_id)
+    if not os.path.isfile(path):
+        raise HTTPException(404, "Foto não encontrada")
+    
+    return FileResponse(
+        path,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+def _export_filename(photo: Photo, used: set) -> str:
+    """Mesmo padrão do download antigo do admin: data_hora_nome.ext"""
+    uploaded = photo.uploaded_at or datetime.now()
+    date_str = uploaded.strftime("%Y-%m-%d")
+    time_str = uploaded.strftime("%H-%M-%S")
+
+    extension = photo.photo_url.split("?")[0].rsplit(".", 1)[-1] or "jpg"
+    if "/" in extension or len(extension) > 5:
+        extension = "jpg"
+
+    if photo.sender_name:
+        safe_name = re.sub(r"[^a-zA-Z0-9]", "_", photo.sender_name)
+        base = f"{date_str}_{time_str}_{safe_name}"
+    else:
+        base = f"{date_str}_{time_str}"
+
+    filename = f"{base}.{extension}"
+    if filename in used:
+        filename = f"{base}_{photo.id}.{extension}"
+    used.add(filename)
+    return filename
+
+
+def _read_photo(photo: Photo) -> Optional[bytes]:
+    try:
+        with storage_timer("read"):
+            return storage.read(StoredPhoto(url=photo.photo_url, public_id=photo.cloudinary_public_id))
+    except Exception:
+        logger.exception("Erro ao baixar foto %s para exportação", photo.id)
+        return None
+
+
+def _fetch_in_order(photos: List[Photo]) -> Iterator[Tuple[Photo, Optional[bytes]]]:
+    """
+    Busca as fotos em paralelo mantendo a ordem, com no máximo
+    EXPORT_CONCURRENCY * 2 fotos em memória ao mesmo tempo.
+    """
+    window = EXPORT_CONCURRENCY * 2
+    with ThreadPoolExecutor(max_workers=EXPORT_CONCURRENCY, thread_name_prefix="photo-export") as pool:
+        pending = deque()
+        for photo in photos:
+            pending.append((photo, pool.submit(_read_photo, photo)))
+            if len(pending) >= window:
+                done_photo, future = pending.popleft()
+                yield done_photo, future.result()
+        while pending:
+            done_photo, future = pending.popleft()
+            yield done_photo, future.result()
+
+
+def _zip_stream(photos: List[Photo]) -> Iterator[bytes]:
+    """Gera o ZIP (sem recompressão) à medida que as fotos chegam."""
+    buffer = ZipStreamBuffer()
+    used_names: set = set()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as zf:
+        for photo, data in _fetch_in_order(photos):
+            if data is None:
+                continue
+            info = zipfile.ZipInfo(
+                f"{EXPORT_FOLDER}/{_export_filename(photo, used_names)}",
+                date_time=(photo.uploaded_at or datetime.now()).timetuple()[:6],
+            )
+            zf.writestr(info, data)
+            yield buffer.drain()
+
+    # Diretório central do ZIP
+    yield buffer.drain()
+
+
+@router.get("/export.zip")
+def export_photos_zip(
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """
+    Baixa todas as fotos em um único ZIP (apenas admin).
+    O arquivo é gerado em streaming, sem montar o ZIP inteiro na memória.
+    """
+    photos = db.query(Photo).order_by(Photo.uploaded_at.asc(), Photo.id.asc()).all()
+    if not photos:
+        raise HTTPException(404, "Nenhuma foto para baixar")
+    
+    # Desacopla as fotos da sessão: o streaming continua depois do fim da requisição ao banco
+    db.expunge_all()
+    
+    filename = f"{EXPORT_FOLDER}-{datetime.now().strftime('%Y-%m-%d')}.zip"
+    return StreamingResponse(
+        _zip_stream(photos),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.delete("/{photo_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_photo(
     photo_id: int,
@@ -132,15 +312,16 @@ def delete_photo(
 ):
     """
     Deleta uma foto (apenas admin).
-    Remove do Cloudinary e do banco de dados.
+    Remove do armazenamento e do banco de dados.
     """
     photo = db.query(Photo).filter(Photo.id == photo_id).first()
     if not photo:
         raise HTTPException(404, "Foto não encontrada")
     
     try:
-        # Deletar do Cloudinary
-        cloudinary.uploader.destroy(photo.cloudinary_public_id)
+        # Deletar do armazenamento (Cloudinary ou disco local)
+        with storage_timer("delete"):
+            storage.delete(photo.cloudinary_public_id)
         
         # Deletar do banco
         db.delete(photo)
@@ -149,4 +330,5 @@ def delete_photo(
     except Exception as e:
         raise HTTPException(500, f"Erro ao deletar foto: {str(e)}")
     
+    broker.publish("photo.deleted", {"id": photo_id})
     return
\ No newline at end of file
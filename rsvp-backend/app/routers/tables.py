@@ -1,13 +1,31 @@
 # app/routers/tables.py
-from typing import List, Dict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Request, Response, status
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, selectinload
 
-from app.database import get_db
-from app.models import TableArrangement
+from app import exports
+from app.cache import cached_json_response, etag_matches, make_file_payload, seating_cache
+from app.database import get_async_db, get_db
+from app.events import broker
+from app.models import TableArrangement, SeatingVersion
 from app.models import Guest, Companion
-from app.schemas import TableCreate, TableResponse, PersonInfo
+from app.schemas import TableCreate, TableResponse, PersonInfo, SeatedPerson
+from app.schemas import (
+    ClearTableOperation,
+    MoveOperation,
+    RemoveOperation,
+    SeatingOperation,
+    SeatingOptimizeRequest,
+    SeatingOptimizeResponse,
+    SeatingPatch,
+    SwapOperation,
+)
+from app.seating_optimizer import SeatingError, optimize_seating
 from app.security import require_admin
 
 
@@ -17,17 +35,19 @@ router = APIRouter(
 )
 
 
-@router.get("/people", response_model=List[PersonInfo])
-def list_people(
-    db: Session = Depends(get_db),
-    admin: None = Depends(require_admin)
-):
+def _confirmed_people(db: Session) -> List[dict]:
     """
-    Lista todas as pessoas (guests + companions confirmados) disponíveis para organizar nas mesas.
-    Retorna em ordem alfabética com acompanhantes agrupados com seus convidados.
+    Monta a lista de pessoas confirmadas (guests + companions).
+    Os acompanhantes são carregados com selectinload: são sempre 2 queries,
+    independente da quantidade de convidados.
     """
     # Pegar apenas convidados confirmados (YES)
-    confirmed_guests = db.query(Guest).filter(Guest.rsvp_status == "YES").all()
+    confirmed_guests = (
+        db.query(Guest)
+        .options(selectinload(Guest.companions))
+        .filter(Guest.rsvp_status == "YES")
+        .all()
+    )
     
     people = []
     
@@ -57,131 +77,591 @@ def list_people(
     return people
 
 
-@router.get("/arrangements", response_model=Dict[int, List[str]])
-def get_arrangements(
-    db: Session = Depends(get_db),
-    admin: None = Depends(require_admin)
-):
+def _arrangements_query():
+    return select(
+        TableArrangement.table_number,
+        TableArrangement.seat,
+        TableArrangement.guest_id,
+        TableArrangement.companion_id,
+    ).order_by(TableArrangement.table_number, TableArrangement.seat, TableArrangement.id)
+
+
+def _group_arrangements(arrangements, keep_empty_seats: bool = False) -> Dict[int, List[Optional[str]]]:
     """
-    Retorna a organização atual das mesas.
     Formato: { mesa_numero: ["guest_123", "companion_456", ...] }
+    Com keep_empty_seats=True, cada pessoa fica no índice do seu lugar
+    (lugares vazios = None), como o admin envia ao salvar.
     """
-    arrangements = db.query(TableArrangement).all()
-    
     tables = {}
     for arr in arrangements:
         if arr.table_number not in tables:
             tables[arr.table_number] = []
         
         if arr.guest_id:
-            tables[arr.table_number].append(f"guest_{arr.guest_id}")
+            person_id = f"guest_{arr.guest_id}"
         elif arr.companion_id:
-            tables[arr.table_number].append(f"companion_{arr.companion_id}")
+            person_id = f"companion_{arr.companion_id}"
+        else:
+            continue
+        
+        people = tables[arr.table_number]
+        if keep_empty_seats and arr.seat is not None and arr.seat >= len(people):
+            people.extend([None] * (arr.seat - len(people)))
+        people.append(person_id)
     
     return tables
 
 
+def _arrangements_map(db: Session, keep_empty_seats: bool = False) -> Dict[int, List[Optional[str]]]:
+    return _group_arrangements(db.execute(_arrangements_query()).all(), keep_empty_seats)
+
+
+async def _arrangements_map_async(db: AsyncSession) -> Dict[int, List[Optional[str]]]:
+    return _group_arrangements((await db.execute(_arrangements_query())).all())
+
+
+def _seating_by_table(db: Session) -> Dict[int, List[dict]]:
+    """
+    Mesas já resolvidas em nomes, em uma única query (JOIN de
+    TableArrangement com Guest e Companion + convidado principal).
+    Formato: { mesa_numero: [{"name": "Maria", "host": None},
+                             {"name": "João", "host": "Maria"}, ...] }
+    """
+    host = aliased(Guest)
+    rows = (
+        db.query(
+            TableArrangement.table_number,
+            Guest.name.label("guest_name"),
+            Companion.name.label("companion_name"),
+            host.name.label("host_name"),
+        )
+        .outerjoin(Guest, TableArrangement.guest_id == Guest.id)
+        .outerjoin(Companion, TableArrangement.companion_id == Companion.id)
+        .outerjoin(host, Companion.guest_id == host.id)
+        # Mesmo critério de /tables/people/public: só quem confirmou (YES)
+        .filter(or_(Guest.rsvp_status == "YES", host.rsvp_status == "YES"))
+        .order_by(TableArrangement.table_number, TableArrangement.seat, TableArrangement.id)
+        .all()
+    )
+
+    tables: Dict[int, List[dict]] = {}
+    for row in rows:
+        if row.guest_name is not None:
+            person = {"name": row.guest_name, "host": None}
+        else:
+            person = {"name": row.companion_name, "host": row.host_name}
+        tables.setdefault(row.table_number, []).append(person)
+
+    return tables
+
+
+def prime_cache(db: Session) -> None:
+    """Monta os snapshots públicos das mesas (usado no aquecimento da API)."""
+    seating_cache.get("tables", lambda: _arrangements_map(db))
+    seating_cache.get("people", lambda: _confirmed_people(db))
+    seating_cache.get("seating", lambda: _seating_by_table(db))
+
+
+@router.get("/people", response_model=List[PersonInfo])
+def list_people(
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """
+    Lista todas as pessoas (guests + companions confirmados) disponíveis para organizar nas mesas.
+    Retorna em ordem alfabética com acompanhantes agrupados com seus convidados.
+    """
+    return _confirmed_people(db)
+
+
+@router.get("/arrangements", response_model=Dict[int, List[Optional[str]]])
+def get_arrangements(
+    response: Response,
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """
+    Retorna a organização atual das mesas.
+    Formato: { mesa_numero: ["guest_123", None, "companion_456", ...] }
+    (a posição na lista é o lugar na mesa; None = lugar vazio)
+    A versão atual vai no header ETag; envie-a em If-Match ao salvar.
+    """
+    response.headers["ETag"] = _version_etag(_current_version(db))
+    return _arrangements_map(db, keep_empty_seats=True)
+
+
 @router.get("/view", response_model=Dict[int, List[str]])
-def get_arrangements_public(db: Session = Depends(get_db)):
+async def get_arrangements_public(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     Endpoint PÚBLICO para visualização das mesas por convidados.
     Não requer autenticação.
     Formato: { mesa_numero: ["guest_123", "companion_456", ...] }
+
+    Servido a partir do snapshot em cache, com suporte a ETag/If-None-Match.
     """
-    arrangements = db.query(TableArrangement).all()
-    
-    tables = {}
-    for arr in arrangements:
-        if arr.table_number not in tables:
-            tables[arr.table_number] = []
-        
-        if arr.guest_id:
-            tables[arr.table_number].append(f"guest_{arr.guest_id}")
-        elif arr.companion_id:
-            tables[arr.table_number].append(f"companion_{arr.companion_id}")
-    
-    return tables
+    payload = await seating_cache.aget("tables", lambda: _arrangements_map_async(db))
+    return cached_json_response(request, payload)
 
 
 @router.get("/people/public", response_model=List[PersonInfo])
-def list_people_public(db: Session = Depends(get_db)):
+def list_people_public(request: Request, db: Session = Depends(get_db)):
     """
     Endpoint PÚBLICO - Lista pessoas para visualização das mesas.
     Não requer autenticação.
+
+    Servido a partir do snapshot em cache, com suporte a ETag/If-None-Match.
     """
-    # Pegar apenas convidados confirmados (YES)
-    confirmed_guests = db.query(Guest).filter(Guest.rsvp_status == "YES").all()
-    
-    people = []
+    payload = seating_cache.get("people", lambda: _confirmed_people(db))
+    return cached_json_response(request, payload)
+
+
+@router.get("/seating", response_model=Dict[int, List[SeatedPerson]])
+def get_seating_public(request: Request, db: Session = Depends(get_db)):
+    """
+    Endpoint PÚBLICO - Mesas com os nomes já resolvidos, em uma única resposta.
+    Substitui a combinação /tables/people/public + /tables/view no tables.js.
+    Formato: { mesa_numero: [{"name": "Maria", "host": null}, ...] }
+    """
+    payload = seating_cache.get("seating", lambda: _seating_by_table(db))
+    return cached_json_response(request, payload)
+
+
+@router.get("/export/cards.pdf")
+async def export_table_cards(
+    request: Request,
+    admin: None = Depends(require_admin)
+):
+    """
+    PDF para imprimir: um cartão (página A5) por mesa, com os acompanhantes
+    agrupados sob o seu convidado. Gerado no pool de exportação e guardado
+    em cache até a próxima mudança nas mesas ou nos convidados.
+    """
+    payload = await exports.run_in_worker(
+        lambda: seating_cache.get_payload(
+            "export:cards",
+            lambda: make_file_payload(exports.table_cards_pdf()),
+        )
+    )
+
+    filename = f"cartoes-mesas-{datetime.now().strftime('%Y-%m-%d_%H-%M')}.pdf"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "ETag": payload.etag,
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type="application/pdf", headers=headers)
+
+
+def _parse_person_id(person_id: str) -> Tuple[str, int]:
+    """'guest_123' -> ('guest', 123); 'companion_456' -> ('companion', 456)"""
+    person_type, _, raw_id = person_id.partition("_")
+    if person_type not in {"guest", "companion"} or not raw_id.isdigit():
+        raise HTTPException(400, f"Identificador inválido: {person_id}")
+    return person_type, int(raw_id)
+
+
+_PERSON_GONE = "Alguém nas mesas não está mais na lista de convidados. Recarregue as mesas."
+
+
+def _check_people_exist(db: Session, people: Iterable[Tuple[str, int]]) -> None:
+    """409 se alguma pessoa não existe (ex.: apagada enquanto o admin editava)."""
+    wanted = {"guest": set(), "companion": set()}
+    for person_type, person_id in people:
+        wanted[person_type].add(person_id)
+
+    for person_type, model in (("guest", Guest), ("companion", Companion)):
+        ids = wanted[person_type]
+        if not ids:
+            continue
+        found = {row.id for row in db.query(model.id).filter(model.id.in_(ids))}
+        missing = sorted(ids - found)
+        if missing:
+            raise HTTPException(
+                status.HTTP_409_CONFLICT,
+                f"{_PERSON_GONE} ({person_type}_{missing[0]})",
+            )
+
+
+def _seating_saved(version: int) -> None:
+    """Após o commit: limpa o cache e avisa o feed ao vivo (outros admins recarregam as mesas)."""
+    seating_cache.invalidate()
+    broker.publish("seating.updated", {"version": version})
+
+
+def _version_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    if if_match is None or if_match.strip() == "*":
+        return None
+    value = if_match.strip().removeprefix("W/").strip('"')
+    if not value.isdigit():
+        raise HTTPException(400, "If-Match inválido")
+    return int(value)
+
+
+def _current_version(db: Session) -> int:
+    state = db.get(SeatingVersion, 1)
+    return state.version if state else 0
+
+
+def _bump_version(db: Session, expected: Optional[int]) -> int:
+    """
+    Incrementa a versão das mesas dentro da transação atual.
+    Se `expected` foi informado e não é a versão atual, rejeita com 412.
+    O UPDATE também trava a linha, serializando salvamentos simultâneos.
+    """
+    if db.get(SeatingVersion, 1) is None:
+        db.add(SeatingVersion(id=1, version=0))
+        db.flush()
+
+    stmt = update(SeatingVersion).where(SeatingVersion.id == 1)
+    if expected is not None:
+        stmt = stmt.where(SeatingVersion.version == expected)
+
+    result = db.execute(stmt.values(version=SeatingVersion.version + 1))
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="As mesas foram alteradas por outra pessoa. Recarregue antes de salvar.",
+        )
+
+    return db.execute(
+        select(SeatingVersion.version).where(SeatingVersion.id == 1)
+    ).scalar_one()
+
+
+@router.post("/optimize", response_model=SeatingOptimizeResponse)
+def optimize_arrangements(
+    data: SeatingOptimizeRequest,
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """
+    Sugere uma organização das mesas para todos os confirmados.
+    Respeita capacidade, acompanhantes junto do convidado, pares juntos/separados
+    e mesas fixas, dentro do tempo limite. NÃO salva: para usar o resultado,
+    envie `tables` para POST /tables/arrangements.
+    """
+    confirmed_guests = (
+        db.query(Guest)
+        .options(selectinload(Guest.companions))
+        .filter(Guest.rsvp_status == "YES")
+        .order_by(Guest.name)
+        .all()
+    )
     
+    groups: List[List[str]] = []
     for guest in confirmed_guests:
-        # Adicionar convidado
-        people.append({
-            "id": f"guest_{guest.id}",
-            "name": guest.name,
-            "type": "guest",
-            "guest_name": None
-        })
-        
-        # Adicionar acompanhantes logo após o convidado
-        for companion in guest.companions:
-            people.append({
-                "id": f"companion_{companion.id}",
-                "name": f"  ↳ {companion.name}",  # Indentação visual
-                "type": "companion",
-                "guest_name": guest.name
-            })
+        companions = [f"companion_{c.id}" for c in guest.companions]
+        if data.keep_companions_with_host:
+            groups.append([f"guest_{guest.id}", *companions])
+        else:
+            groups.append([f"guest_{guest.id}"])
+            groups.extend([c] for c in companions)
     
-    # Ordenar por nome do convidado principal
-    people.sort(key=lambda x: (
-        x["guest_name"] if x["guest_name"] else x["name"].strip("  ↳ ")
-    ).lower())
+    capacities = [
+        data.table_capacities.get(table_number, data.seats_per_table)
+        for table_number in range(1, data.num_tables + 1)
+    ]
     
-    return people
+    try:
+        solution = optimize_seating(
+            groups,
+            capacities,
+            together=data.together,
+            apart=data.apart,
+            pinned={person_id: table - 1 for person_id, table in data.pinned.items()},
+            time_budget=data.time_budget_ms / 1000,
+            seed=data.seed,
+        )
+    except SeatingError as e:
+        raise HTTPException(400, str(e))
+    
+    return {
+        "tables": {i + 1: people for i, people in enumerate(solution.tables) if people},
+        "overflow": solution.overflow,
+        "apart_violations": solution.apart_violations,
+        "cost": solution.cost,
+        "iterations": solution.iterations,
+        "elapsed_ms": solution.elapsed_ms,
+    }
 
 
 @router.post("/arrangements", status_code=status.HTTP_201_CREATED)
 def save_arrangements(
-    data: Dict[int, List[str]],
+    data: Dict[int, List[Optional[str]]],
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin)
 ):
     """
     Salva a organização completa das mesas.
-    Recebe: { mesa_numero: ["guest_123", "companion_456", ...] }
+    Recebe: { mesa_numero: ["guest_123", None, "companion_456", ...] }
+    (a posição na lista é o lugar na mesa; None = lugar vazio)
+
+    Só grava a diferença em relação ao que já está salvo (inserções,
+    atualizações e remoções em lote, numa única transação).
+    Envie If-Match com a versão recebida no ETag: se outra pessoa salvou
+    nesse meio tempo, a resposta é 412 em vez de sobrescrever.
     """
-    # Limpar arranjos anteriores
-    db.query(TableArrangement).delete()
-    
-    # Salvar novos arranjos
+    # Organização desejada: pessoa -> (mesa, lugar)
+    desired: Dict[Tuple[str, int], Tuple[int, int]] = {}
     for table_number, people_ids in data.items():
-        for person_id in people_ids:
+        if table_number < 1:
+            raise HTTPException(400, f"Mesa inválida: {table_number}")
+        for seat, person_id in enumerate(people_ids):
             if not person_id:
                 continue
-                
-            person_type, person_id_num = person_id.split("_")
-            person_id_num = int(person_id_num)
-            
-            arrangement = TableArrangement(
-                table_number=int(table_number),
-                guest_id=person_id_num if person_type == "guest" else None,
-                companion_id=person_id_num if person_type == "companion" else None
-            )
-            db.add(arrangement)
+            key = _parse_person_id(person_id)
+            if key in desired:
+                raise HTTPException(400, f"Pessoa repetida nas mesas: {person_id}")
+            desired[key] = (int(table_number), seat)
     
-    db.commit()
+    _check_people_exist(db, desired.keys())
+    version = _bump_version(db, _parse_if_match(if_match))
     
-    return {"message": "Arranjo de mesas salvo com sucesso"}
+    current = db.query(
+        TableArrangement.id,
+        TableArrangement.guest_id,
+        TableArrangement.companion_id,
+        TableArrangement.table_number,
+        TableArrangement.seat,
+    ).all()
+    
+    to_delete: List[int] = []
+    to_update: List[dict] = []
+    for row in current:
+        key = ("guest", row.guest_id) if row.guest_id else ("companion", row.companion_id)
+        # pop: se a mesma pessoa aparecer duas vezes no banco, a cópia é removida
+        target = desired.pop(key, None)
+        if target is None:
+            to_delete.append(row.id)
+        elif (row.table_number, row.seat) != target:
+            to_update.append({"id": row.id, "table_number": target[0], "seat": target[1]})
+    
+    to_insert = [
+        {
+            "table_number": table_number,
+            "seat": seat,
+            "guest_id": person_id if person_type == "guest" else None,
+            "companion_id": person_id if person_type == "companion" else None,
+        }
+        for (person_type, person_id), (table_number, seat) in desired.items()
+    ]
+    
+    if to_delete:
+        db.query(TableArrangement).filter(TableArrangement.id.in_(to_delete)).delete(synchronize_session=False)
+    if to_update:
+        db.execute(update(TableArrangement), to_update)
+    try:
+        if to_insert:
+            db.execute(insert(TableArrangement), to_insert)
+        db.commit()
+    except IntegrityError:
+        # Alguém foi apagado depois da checagem acima
+        db.rollback()
+        raise HTTPException(status.HTTP_409_CONFLICT, _PERSON_GONE)
+    _seating_saved(version)
+    
+    response.headers["ETag"] = _version_etag(version)
+    return {
+        "message": "Arranjo de mesas salvo com sucesso",
+        "version": version,
+        "inserted": len(to_insert),
+        "updated": len(to_update),
+        "deleted": len(to_delete),
+    }
 
 
 @router.delete("/arrangements", status_code=status.HTTP_204_NO_CONTENT)
 def clear_arrangements(
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     admin: None = Depends(require_admin)
 ):
     """
     Limpa toda a organização de mesas.
+    Aceita If-Match como o salvamento.
     """
+    version = _bump_version(db, _parse_if_match(if_match))
     db.query(TableArrangement).delete()
     db.commit()
-    return
\ No newline at end of file
+    _seating_saved(version)
+    response.headers["ETag"] = _version_etag(version)
+    return
+
+
+# ==========================
+#  Alterações incrementais
+#  (só mexem nas linhas afetadas)
+# ==========================
+def _find_seat(db: Session, person_id: str) -> Optional[TableArrangement]:
+    person_type, person_id_num = _parse_person_id(person_id)
+    column = TableArrangement.guest_id if person_type == "guest" else TableArrangement.companion_id
+    return db.query(TableArrangement).filter(column == person_id_num).first()
+
+
+def _move(db: Session, op: MoveOperation) -> None:
+    person_type, person_id_num = _parse_person_id(op.person_id)
+    model = Guest if person_type == "guest" else Companion
+    if db.get(model, person_id_num) is None:
+        raise HTTPException(404, f"Pessoa não encontrada: {op.person_id}")
+
+    row = _find_seat(db, op.person_id)
+
+    seat = op.seat
+    if seat is None:
+        # Próximo lugar no fim da mesa
+        last = (
+            db.query(func.max(TableArrangement.seat))
+            .filter(TableArrangement.table_number == op.table_number)
+            .scalar()
+        )
+        seat = 0 if last is None else last + 1
+    else:
+        # Como no admin: quem estava nesse lugar fica sem mesa
+        db.query(TableArrangement).filter(
+            TableArrangement.table_number == op.table_number,
+            TableArrangement.seat == seat,
+            TableArrangement.id != (row.id if row else None),
+        ).delete(synchronize_session=False)
+
+    if row is None:
+        db.add(TableArrangement(
+            table_number=op.table_number,
+            seat=seat,
+            guest_id=person_id_num if person_type == "guest" else None,
+            companion_id=person_id_num if person_type == "companion" else None,
+        ))
+    else:
+        row.table_number = op.table_number
+        row.seat = seat
+
+
+def _remove(db: Session, op: RemoveOperation) -> None:
+    row = _find_seat(db, op.person_id)
+    if row is not None:
+        db.delete(row)
+
+
+def _swap(db: Session, op: SwapOperation) -> None:
+    first = _find_seat(db, op.person_id)
+    second = _find_seat(db, op.other_person_id)
+    if first is None or second is None:
+        missing = op.person_id if first is None else op.other_person_id
+        raise HTTPException(404, f"Pessoa sem mesa: {missing}")
+
+    first.table_number, second.table_number = second.table_number, first.table_number
+    first.seat, second.seat = second.seat, first.seat
+
+
+def _clear_table(db: Session, op: ClearTableOperation) -> None:
+    db.query(TableArrangement).filter(
+        TableArrangement.table_number == op.table_number
+    ).delete(synchronize_session=False)
+
+
+_OPERATIONS = {
+    "move": _move,
+    "remove": _remove,
+    "swap": _swap,
+    "clear_table": _clear_table,
+}
+
+
+def _apply_operations(
+    db: Session,
+    operations: List[SeatingOperation],
+    if_match: Optional[str],
+    response: Response,
+) -> dict:
+    """Aplica as operações em ordem, numa única transação e com uma única versão nova."""
+    version = _bump_version(db, _parse_if_match(if_match))
+    try:
+        for op in operations:
+            _OPERATIONS[op.op](db, op)
+            # Flush a cada operação: a próxima enxerga o resultado da anterior
+            db.flush()
+        db.commit()
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError:
+        # Pessoa apagada no meio do caminho
+        db.rollback()
+        raise HTTPException(status.HTTP_409_CONFLICT, _PERSON_GONE)
+
+    _seating_saved(version)
+    response.headers["ETag"] = _version_etag(version)
+    return {"message": "Mesas atualizadas", "version": version, "applied": len(operations)}
+
+
+@router.patch("/arrangements")
+def patch_arrangements(
+    data: SeatingPatch,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """
+    Aplica uma lista de operações (move, remove, swap, clear_table) de uma vez.
+    Ex.: { "operations": [ {"op": "move", "person_id": "guest_12", "table_number": 3, "seat": 0} ] }
+    Aceita If-Match como o salvamento completo.
+    """
+    return _apply_operations(db, data.operations, if_match, response)
+
+
+@router.post("/arrangements/move")
+def move_person(
+    op: MoveOperation,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """Coloca uma pessoa em uma mesa (e lugar, se informado)."""
+    return _apply_operations(db, [op], if_match, response)
+
+
+@router.post("/arrangements/swap")
+def swap_people(
+    op: SwapOperation,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """Troca duas pessoas de lugar."""
+    return _apply_operations(db, [op], if_match, response)
+
+
+@router.delete("/arrangements/people/{person_id}")
+def remove_person(
+    person_id: str,
+    response: Response,
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """Tira uma pessoa da sua mesa."""
+    return _apply_operations(db, [RemoveOperation(person_id=person_id)], if_match, response)
+
+
+@router.delete("/arrangements/{table_number}")
+def clear_table(
+    response: Response,
+    table_number: int = Path(..., ge=1),
+    if_match: Optional[str] = Header(default=None),
+    db: Session = Depends(get_db),
+    admin: None = Depends(require_admin)
+):
+    """Esvazia uma única mesa."""
+    return _apply_operations(db, [ClearTableOperation(table_number=table_number)], if_match, response)
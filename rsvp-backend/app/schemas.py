@@ -3,9 +3,9 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import Annotated, Dict, List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class RSVPStatus(str, Enum):
@@ -63,10 +63,22 @@ class GuestResponse(BaseModel):
 
     companions: List[CompanionResponse]
 
+    # Versão da última alteração (ver GuestChanges)
+    version: int = 1
+
     class Config:
         from_attributes = True
 
 
+class GuestChanges(BaseModel):
+    # Convidados criados ou alterados depois de `updated_since`
+    items: List[GuestResponse]
+    # Ids de convidados apagados depois de `updated_since`
+    deleted: List[int]
+    # Envie como `updated_since` na próxima sincronização
+    version: int
+
+
 class GuestUpdate(BaseModel):
     name: Optional[str] = None
     phone: Optional[str] = None
@@ -75,6 +87,33 @@ class GuestUpdate(BaseModel):
     rsvp_status: Optional[RSVPStatus] = None
     note: Optional[str] = None
 
+
+class GuestPage(BaseModel):
+    items: List[GuestResponse]
+    # Quantos convidados atendem aos filtros (em todas as páginas)
+    total: int
+    # Cursor opaco para buscar a próxima página (None = acabou)
+    next_cursor: Optional[str] = None
+
+
+class LastResponse(BaseModel):
+    id: int
+    name: str
+    responded_at: datetime
+
+
+class GuestSummary(BaseModel):
+    # Respostas por status: {"YES": 10, "NO": 2, "MAYBE": 1}
+    counts: Dict[RSVPStatus, int]
+    total_responses: int
+    companions_yes: int
+    # Confirmados + acompanhantes deles
+    people_yes: int
+    # Dos presentes (people_yes), quantos já têm lugar em uma mesa
+    seated: int
+    unseated: int
+    last_response: Optional[LastResponse] = None
+
 class PhotoUpload(BaseModel):
     sender_name: Optional[str] = None
 
@@ -83,6 +122,8 @@ class PhotoResponse(BaseModel):
     id: int
     sender_name: Optional[str]
     photo_url: str
+    thumbnail_url: Optional[str] = None
+    medium_url: Optional[str] = None
     cloudinary_public_id: str
     uploaded_at: datetime
 
@@ -90,6 +131,41 @@ class PhotoResponse(BaseModel):
         from_attributes = True
 
 
+class PhotoPage(BaseModel):
+    items: List[PhotoResponse]
+    # Cursor opaco para buscar a próxima página (None = acabou)
+    next_cursor: Optional[str] = None
+
+
+class PhotoJobStatus(str, Enum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    ERROR = "ERROR"
+
+
+class PhotoJobResponse(BaseModel):
+    id: int
+    status: PhotoJobStatus
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    photo: Optional[PhotoResponse] = None
+
+    class Config:
+        from_attributes = True
+
+
+class PhotoUploadError(BaseModel):
+    index: int  # Posição do arquivo no envio (começando em 1)
+    filename: Optional[str] = None
+    detail: str
+
+
+class PhotoUploadResponse(BaseModel):
+    jobs: List[PhotoJobResponse]
+    errors: List[PhotoUploadError] = []
+
+
 class TableAssignment(BaseModel):
     guest_id: Optional[int] = None
     companion_id: Optional[int] = None
@@ -110,8 +186,76 @@ class TableResponse(BaseModel):
         from_attributes = True
 
 
+# ==========================
+#  Operações incrementais nas mesas
+#  (person_id no formato "guest_123" ou "companion_456")
+# ==========================
+class MoveOperation(BaseModel):
+    op: Literal["move"] = "move"
+    person_id: str
+    table_number: int = Field(..., ge=1)
+    seat: Optional[int] = Field(None, ge=0)  # None = próximo lugar livre no fim da mesa
+
+
+class RemoveOperation(BaseModel):
+    op: Literal["remove"] = "remove"
+    person_id: str
+
+
+class SwapOperation(BaseModel):
+    op: Literal["swap"] = "swap"
+    person_id: str
+    other_person_id: str
+
+
+class ClearTableOperation(BaseModel):
+    op: Literal["clear_table"] = "clear_table"
+    table_number: int = Field(..., ge=1)
+
+
+SeatingOperation = Annotated[
+    Union[MoveOperation, RemoveOperation, SwapOperation, ClearTableOperation],
+    Field(discriminator="op"),
+]
+
+
+class SeatingPatch(BaseModel):
+    operations: List[SeatingOperation]
+
+
+class SeatingOptimizeRequest(BaseModel):
+    num_tables: int = Field(..., ge=1, le=500)
+    seats_per_table: int = Field(8, ge=1, le=50)
+    # Capacidade diferente para mesas específicas: { mesa_numero: lugares }
+    table_capacities: Dict[int, int] = {}
+
+    keep_companions_with_host: bool = True
+    # Pares de person_id ("guest_1", "companion_2") que devem / não devem ficar juntos
+    together: List[Tuple[str, str]] = []
+    apart: List[Tuple[str, str]] = []
+    # person_id -> mesa fixa
+    pinned: Dict[str, int] = {}
+
+    time_budget_ms: int = Field(1000, ge=10, le=10000)
+    seed: Optional[int] = None
+
+
+class SeatingOptimizeResponse(BaseModel):
+    tables: Dict[int, List[str]]  # Mesmo formato de POST /tables/arrangements
+    overflow: int  # Pessoas além da capacidade das mesas
+    apart_violations: int  # Pares "apart" que ficaram na mesma mesa
+    cost: float
+    iterations: int
+    elapsed_ms: float
+
+
 class PersonInfo(BaseModel):
     id: str  # Formato: "guest_123" ou "companion_456"
     name: str
     type: str  # "guest" ou "companion"
     guest_name: Optional[str] = None  # Nome do convidado principal (para acompanhantes)
+
+
+class SeatedPerson(BaseModel):
+    name: str
+    host: Optional[str] = None  # Nome do convidado principal (para acompanhantes)
@@ -0,0 +1,190 @@
+# app/search.py
+from __future__ import annotations
+
+import heapq
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+# Fração mínima dos trigramas da busca que precisa aparecer no texto
+MIN_SIMILARITY = 0.3
+# Máximo de registros que uma busca por trecho devolve (uma ou duas letras
+# casam com quase todo mundo; o filtro do painel vira um IN com esses ids)
+MAX_CONTAINING = int(os.getenv("SEARCH_MAX_CONTAINING", "500"))
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Minúsculas, sem acentos e só letras/números separados por espaço.
+    Ex: 'João  da Silva!' -> 'joao da silva'
+    """
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    without_accents = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", without_accents.lower()).split())
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """
+    Igual a normalize_text, mas um telefone digitado com máscara vira só
+    dígitos, como está no índice: '(11) 99999-0003' -> '11999990003'.
+    """
+    if query and re.search(r"\d", query) and not re.search(r"[^\W\d_]", query):
+        return re.sub(r"\D", "", query)
+    return normalize_text(query)
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigramas por palavra, com o mesmo preenchimento do pg_trgm ('  p', ' pa', ...)."""
+    grams: Set[str] = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Índice de busca em memória: sem acentos, por prefixo, por trecho e
+    aproximada (trigramas), com resultados ordenados por relevância.
+
+    É carregado do banco na primeira busca e depois mantido em dia pelas
+    rotas que alteram os dados (add/remove logo após o commit).
+    """
+
+    def __init__(self, loader: Callable[[Session], Iterable[Tuple[int, str]]]) -> None:
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._docs: Dict[int, str] = {}
+        self._grams: Dict[str, Set[int]] = {}
+
+    def ensure_loaded(self, db: Session) -> None:
+        with self._lock:
+            if self._loaded:
+                return
+            for doc_id, text in self._loader(db):
+                self._add(doc_id, text)
+            self._loaded = True
+
+    def reset(self) -> None:
+        """Descarta o índice; a próxima busca recarrega do banco."""
+        with self._lock:
+            self._loaded = False
+            self._docs = {}
+            self._grams = {}
+
+    def add(self, doc_id: int, *texts: Optional[str]) -> None:
+        with self._lock:
+            # Antes de carregar, o próprio carregamento vai trazer o registro
+            if self._loaded:
+                self._remove(doc_id)
+                self._add(doc_id, " ".join(t for t in texts if t))
+
+    def remove(self, *doc_ids: int) -> None:
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(doc_id)
+
+    def search(self, query: str, limit: int = 50) -> List[int]:
+        q = normalize_query(query)
+        if not q:
+            return []
+        q_grams = _trigrams(q)
+
+        with self._lock:
+            hits: Counter = Counter()
+            for gram in q_grams:
+                for doc_id in self._grams.get(gram, ()):
+                    hits[doc_id] += 1
+
+            scored: List[Tuple[float, int]] = []
+            for doc_id, common in hits.items():
+                text = self._docs[doc_id]
+                score = common / len(q_grams)
+                if q in text:
+                    score += 1.0
+                    if text == q:
+                        score += 1.0
+                    elif text.startswith(q) or f" {q}" in text:
+                        score += 0.5
+                elif score < MIN_SIMILARITY:
+                    continue
+                scored.append((score, doc_id))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [doc_id for _, doc_id in scored[:limit]]
+
+    def containing(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Registros que contêm o trecho (sem acentos), sem aproximação.
+        Acima de `limit` (padrão MAX_CONTAINING), ficam os melhores: palavras
+        que começam com o trecho primeiro, depois os mais recentes (id maior).
+        """
+        q = normalize_query(query)
+        if not q:
+            return []
+        with self._lock:
+            matches = [
+                (0 if text.startswith(q) or f" {q}" in text else 1, -doc_id)
+                for doc_id, text in self._docs.items()
+                if q in text
+            ]
+        return [-neg_id for _, neg_id in heapq.nsmallest(limit or MAX_CONTAINING, matches)]
+
+    def _add(self, doc_id: int, text: str) -> None:
+        normalized = normalize_text(text)
+        self._docs[doc_id] = normalized
+        for gram in _trigrams(normalized):
+            self._grams.setdefault(gram, set()).add(doc_id)
+
+    def _remove(self, doc_id: int) -> None:
+        text = self._docs.pop(doc_id, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            postings = self._grams.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._grams[gram]
+
+
+def _digits(phone: Optional[str]) -> str:
+    return re.sub(r"\D", "", phone or "")
+
+
+def _load_guests(db: Session) -> Iterable[Tuple[int, str]]:
+    rows = db.query(models.Guest.id, models.Guest.name, models.Guest.phone).all()
+    return [(row.id, f"{row.name} {_digits(row.phone)}") for row in rows]
+
+
+def _load_companions(db: Session) -> Iterable[Tuple[int, str]]:
+    rows = db.query(models.Companion.id, models.Companion.name).all()
+    return [(row.id, row.name) for row in rows]
+
+
+guest_index = TrigramIndex(_load_guests)
+companion_index = TrigramIndex(_load_companions)
+
+
+def index_guest(guest: models.Guest, removed_companion_ids: Iterable[int] = ()) -> None:
+    """Atualiza o convidado e seus acompanhantes nos índices (após o commit)."""
+    guest_index.add(guest.id, guest.name, _digits(guest.phone))
+    companion_index.remove(*removed_companion_ids)
+    for companion in guest.companions:
+        companion_index.add(companion.id, companion.name)
+
+
+def unindex_guest(guest_id: int, companion_ids: Iterable[int] = ()) -> None:
+    guest_index.remove(guest_id)
+    companion_index.remove(*companion_ids)
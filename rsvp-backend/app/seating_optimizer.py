@@ -0,0 +1,251 @@
+# app/seating_optimizer.py
+"""
+Otimizador de lugares nas mesas.
+
+Distribui grupos de pessoas (ex.: convidado + acompanhantes) entre as mesas:
+uma solução inicial gulosa é refinada por simulated annealing até acabar
+o tempo limite. Não acessa o banco: recebe e devolve ids ("guest_1", ...).
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+
+# Pesos da função de custo: lotação estourada >> pares separados >> equilíbrio
+OVERFLOW_WEIGHT = 1000.0
+APART_WEIGHT = 100.0
+BALANCE_WEIGHT = 1.0
+
+
+class SeatingError(ValueError):
+    """Restrições impossíveis de atender (ex.: grupo maior que qualquer mesa)."""
+
+
+@dataclass
+class SeatingSolution:
+    tables: List[List[str]]  # índice 0 = mesa 1
+    cost: float
+    overflow: int
+    apart_violations: int
+    iterations: int
+    elapsed_ms: float
+
+
+class _UnionFind:
+    def __init__(self, n: int) -> None:
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def optimize_seating(
+    groups: Sequence[Sequence[str]],
+    capacities: Sequence[int],
+    together: Sequence[Tuple[str, str]] = (),
+    apart: Sequence[Tuple[str, str]] = (),
+    pinned: Optional[Dict[str, int]] = None,
+    time_budget: float = 1.0,
+    seed: Optional[int] = None,
+) -> SeatingSolution:
+    """
+    groups: pessoas que precisam sentar juntas (cada pessoa em um único grupo)
+    capacities: lugares de cada mesa (índice 0 = mesa 1)
+    together / apart: pares de pessoas que devem / não devem ficar juntas
+    pinned: pessoa -> índice da mesa (0 = mesa 1)
+    time_budget: tempo máximo de busca, em segundos
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    pinned = pinned or {}
+    num_tables = len(capacities)
+    if num_tables == 0 or min(capacities) < 1:
+        raise SeatingError("Informe ao menos uma mesa, com pelo menos um lugar.")
+
+    # --- Grupos finais: junta os pares "together" (union-find) ---
+    person_group: Dict[str, int] = {}
+    for g, group_members in enumerate(groups):
+        for person in group_members:
+            person_group[person] = g
+
+    for a, b in list(together) + list(apart):
+        for person in (a, b):
+            if person not in person_group:
+                raise SeatingError(f"Pessoa desconhecida: {person}")
+    for person in pinned:
+        if person not in person_group:
+            raise SeatingError(f"Pessoa desconhecida: {person}")
+
+    uf = _UnionFind(len(groups))
+    for a, b in together:
+        uf.union(person_group[a], person_group[b])
+
+    root_index: Dict[int, int] = {}
+    members: List[List[str]] = []
+    for g, group_members in enumerate(groups):
+        root = uf.find(g)
+        if root not in root_index:
+            root_index[root] = len(members)
+            members.append([])
+        members[root_index[root]].extend(group_members)
+
+    unit_of = {p: root_index[uf.find(g)] for p, g in person_group.items()}
+    sizes = [len(m) for m in members]
+    n = len(members)
+
+    biggest = max(capacities)
+    for u, size in enumerate(sizes):
+        if size > biggest:
+            raise SeatingError(
+                f"Grupo de {size} pessoas ({members[u][0]}) não cabe em nenhuma mesa."
+            )
+
+    # --- Mesas fixas ---
+    fixed: Dict[int, int] = {}
+    for person, table in pinned.items():
+        if not 0 <= table < num_tables:
+            raise SeatingError(f"Mesa inválida para {person}: {table + 1}")
+        u = unit_of[person]
+        if fixed.get(u, table) != table:
+            raise SeatingError(f"{person} está fixado em mesas diferentes do seu grupo.")
+        fixed[u] = table
+
+    # --- Pares que devem ficar separados (entre grupos) ---
+    apart_of: List[Set[int]] = [set() for _ in range(n)]
+    for a, b in apart:
+        ua, ub = unit_of[a], unit_of[b]
+        if ua == ub:
+            raise SeatingError(f"{a} e {b} precisam ficar juntos e separados ao mesmo tempo.")
+        apart_of[ua].add(ub)
+        apart_of[ub].add(ua)
+
+    total_people = sum(sizes)
+    total_capacity = sum(capacities)
+    targets = [total_people * cap / total_capacity for cap in capacities]
+
+    def table_cost(t: int, load: int) -> float:
+        overflow = max(0, load - capacities[t])
+        return OVERFLOW_WEIGHT * overflow + BALANCE_WEIGHT * (load - targets[t]) ** 2
+
+    assign = [-1] * n
+    loads = [0] * num_tables
+
+    def conflicts(u: int, t: int) -> int:
+        return sum(1 for v in apart_of[u] if assign[v] == t)
+
+    # --- Solução inicial gulosa: fixos primeiro, depois maiores grupos ---
+    order = sorted(range(n), key=lambda u: (u not in fixed, -sizes[u], rng.random()))
+    for u in order:
+        if u in fixed:
+            t = fixed[u]
+        else:
+            t = min(
+                range(num_tables),
+                key=lambda t: (
+                    loads[t] + sizes[u] > capacities[t],
+                    conflicts(u, t),
+                    loads[t] + sizes[u] - capacities[t],
+                ),
+            )
+        assign[u] = t
+        loads[t] += sizes[u]
+
+    def total_cost() -> float:
+        apart_violations = sum(conflicts(u, assign[u]) for u in range(n)) // 2
+        return sum(table_cost(t, loads[t]) for t in range(num_tables)) + APART_WEIGHT * apart_violations
+
+    cost = total_cost()
+    best_cost, best_assign = cost, list(assign)
+
+    # --- Busca local: simulated annealing com movimentos e trocas ---
+    movable = [u for u in range(n) if u not in fixed]
+    deadline = started + max(0.0, time_budget)
+    temperature = max(1.0, cost / max(1, n))
+    iterations = 0
+
+    while movable and num_tables > 1:
+        if iterations % 256 == 0:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            # Resfriamento proporcional ao tempo restante
+            progress = 1 - (deadline - now) / max(1e-9, deadline - started)
+            temperature = max(1e-3, (1 - progress) * max(1.0, best_cost / max(1, n)))
+        iterations += 1
+
+        u = rng.choice(movable)
+        a = assign[u]
+
+        if rng.random() < 0.5 or len(movable) < 2:
+            # Move o grupo u para outra mesa
+            b = rng.randrange(num_tables - 1)
+            if b >= a:
+                b += 1
+            delta = (
+                table_cost(a, loads[a] - sizes[u]) - table_cost(a, loads[a])
+                + table_cost(b, loads[b] + sizes[u]) - table_cost(b, loads[b])
+                + APART_WEIGHT * (conflicts(u, b) - conflicts(u, a))
+            )
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                assign[u] = b
+                loads[a] -= sizes[u]
+                loads[b] += sizes[u]
+                cost += delta
+        else:
+            # Troca os grupos u e v de mesa
+            v = rng.choice(movable)
+            b = assign[v]
+            if a == b:
+                continue
+            diff = sizes[v] - sizes[u]
+            linked = 1 if v in apart_of[u] else 0
+            delta = (
+                table_cost(a, loads[a] + diff) - table_cost(a, loads[a])
+                + table_cost(b, loads[b] - diff) - table_cost(b, loads[b])
+                + APART_WEIGHT * (
+                    (conflicts(u, b) - linked - conflicts(u, a))
+                    + (conflicts(v, a) - linked - conflicts(v, b))
+                )
+            )
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                assign[u], assign[v] = b, a
+                loads[a] += diff
+                loads[b] -= diff
+                cost += delta
+
+        if cost < best_cost - 1e-9:
+            best_cost, best_assign = cost, list(assign)
+
+    # --- Resultado ---
+    assign = best_assign
+    loads = [0] * num_tables
+    for u in range(n):
+        loads[assign[u]] += sizes[u]
+
+    tables: List[List[str]] = [[] for _ in range(num_tables)]
+    for u in range(n):
+        tables[assign[u]].extend(members[u])
+
+    apart_violations = sum(conflicts(u, assign[u]) for u in range(n)) // 2
+    overflow = sum(max(0, loads[t] - capacities[t]) for t in range(num_tables))
+
+    return SeatingSolution(
+        tables=tables,
+        cost=round(total_cost(), 3),
+        overflow=overflow,
+        apart_violations=apart_violations,
+        iterations=iterations,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
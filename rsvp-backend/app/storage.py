@@ -0,0 +1,172 @@
+# app/storage.py
+from __future__ import annotations
+
+import os
+import urllib.request
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import cloudinary
+import cloudinary.uploader
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+MAX_DIMENSION = 1920
+
+# Versões menores geradas no upload (lado maior, em px) para a galeria
+THUMBNAIL_DIMENSION = 480
+MEDIUM_DIMENSION = 1080
+
+# Tamanho das partes enviadas ao Cloudinary (mínimo aceito pela API: 5MB)
+UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StoredPhoto:
+    url: str
+    public_id: str  # Identificador no armazenamento (salvo em Photo.cloudinary_public_id)
+    thumbnail_url: Optional[str] = None
+    medium_url: Optional[str] = None
+
+
+class StorageBackend:
+    """Interface dos armazenamentos de fotos."""
+
+    def upload(self, path: str, filename: Optional[str] = None) -> StoredPhoto:
+        raise NotImplementedError
+
+    def delete(self, public_id: str) -> None:
+        raise NotImplementedError
+
+    def read(self, photo: StoredPhoto) -> bytes:
+        """Conteúdo da foto já processada (usado na exportação em ZIP)."""
+        raise NotImplementedError
+
+
+class CloudinaryStorage(StorageBackend):
+    """Fotos no Cloudinary (redimensionamento feito por eles)."""
+
+    def __init__(self) -> None:
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+            secure=True
+        )
+
+    def upload(self, path: str, filename: Optional[str] = None) -> StoredPhoto:
+        # Envia em partes, sem carregar o arquivo inteiro na memória
+        with open(path, "rb") as stream:
+            result = cloudinary.uploader.upload_large(
+                stream,
+                filename=filename or "foto",
+                chunk_size=UPLOAD_CHUNK_SIZE,
+                folder="formatura-duda",
+                resource_type="image",
+                transformation=[
+                    {"width": MAX_DIMENSION, "height": MAX_DIMENSION, "crop": "limit"},
+                    {"quality": "auto:good"}
+                ],
+                # Gera as versões menores já no upload (mesma ordem do retorno "eager")
+                eager=[
+                    {"width": THUMBNAIL_DIMENSION, "height": THUMBNAIL_DIMENSION, "crop": "limit", "quality": "auto"},
+                    {"width": MEDIUM_DIMENSION, "height": MEDIUM_DIMENSION, "crop": "limit", "quality": "auto"},
+                ]
+            )
+
+        eager = [e.get("secure_url") for e in result.get("eager", [])]
+        return StoredPhoto(
+            url=result["secure_url"],
+            public_id=result["public_id"],
+            thumbnail_url=eager[0] if len(eager) > 0 else None,
+            medium_url=eager[1] if len(eager) > 1 else None,
+        )
+
+    def delete(self, public_id: str) -> None:
+        cloudinary.uploader.destroy(public_id)
+
+    def read(self, photo: StoredPhoto) -> bytes:
+        with urllib.request.urlopen(photo.url, timeout=30) as response:
+            return response.read()
+
+
+class LocalStorage(StorageBackend):
+    """
+    Fotos em disco local, servidas pela própria API em /photos/files/{nome}.
+    Útil para desenvolvimento e testes de carga sem depender do Cloudinary.
+    """
+
+    def __init__(self, root: str, base_url: str) -> None:
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(self.root, exist_ok=True)
+
+    def upload(self, path: str, filename: Optional[str] = None) -> StoredPhoto:
+        key = uuid.uuid4().hex
+        public_id = f"{key}.jpg"
+
+        try:
+            img = Image.open(path)
+        except UnidentifiedImageError:
+            raise ValueError("Arquivo não é uma imagem válida")
+
+        with img:
+            img = ImageOps.exif_transpose(img)
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+
+            # Do maior para o menor: cada versão parte da anterior
+            img.thumbnail((MAX_DIMENSION, MAX_DIMENSION))
+            img.save(self.path_for(public_id), "JPEG", quality=85, optimize=True)
+
+            img.thumbnail((MEDIUM_DIMENSION, MEDIUM_DIMENSION))
+            img.save(self.path_for(f"{key}_md.jpg"), "JPEG", quality=80, optimize=True)
+
+            img.thumbnail((THUMBNAIL_DIMENSION, THUMBNAIL_DIMENSION))
+            img.save(self.path_for(f"{key}_thumb.jpg"), "JPEG", quality=75, optimize=True)
+
+        return StoredPhoto(
+            url=self._url_for(public_id),
+            public_id=public_id,
+            thumbnail_url=self._url_for(f"{key}_thumb.jpg"),
+            medium_url=self._url_for(f"{key}_md.jpg"),
+        )
+
+    def delete(self, public_id: str) -> None:
+        key = os.path.splitext(os.path.basename(public_id))[0]
+        for name in (public_id, f"{key}_md.jpg", f"{key}_thumb.jpg"):
+            try:
+                os.remove(self.path_for(name))
+            except FileNotFoundError:
+                pass
+
+    def _url_for(self, name: str) -> str:
+        return f"{self.base_url}/photos/files/{name}"
+
+    def read(self, photo: StoredPhoto) -> bytes:
+        with open(self.path_for(photo.public_id), "rb") as f:
+            return f.read()
+
+    def path_for(self, public_id: str) -> str:
+        # basename impede sair do diretório (ex.: "../../etc/passwd")
+        return os.path.join(self.root, os.path.basename(public_id))
+
+
+def _create_storage() -> StorageBackend:
+    backend = os.getenv("PHOTO_STORAGE", "cloudinary").lower()
+
+    if backend == "local":
+        return LocalStorage(
+            root=os.getenv("PHOTO_STORAGE_DIR", "./uploads/photos"),
+            base_url=os.getenv("PUBLIC_BASE_URL", "http://127.0.0.1:8000"),
+        )
+
+    if backend == "cloudinary":
+        return CloudinaryStorage()
+
+    raise RuntimeError(f"PHOTO_STORAGE inválido: {backend!r} (use 'cloudinary' ou 'local')")
+
+
+# Armazenamento configurado via PHOTO_STORAGE (cloudinary | local)
+storage = _create_storage()
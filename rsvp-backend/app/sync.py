@@ -0,0 +1,68 @@
+# app/sync.py
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models import GuestListVersion, GuestTombstone
+
+
+# ==========================
+#  Versões da lista de convidados
+# ==========================
+# Cada transação que altera convidados/acompanhantes pega o próximo valor
+# do contador e grava nos registros alterados. O UPDATE trava a linha do
+# contador até o commit, então as versões são confirmadas em ordem: quem
+# leu o contador em N já enxerga todas as alterações com versão <= N.
+
+def _bump_statement():
+    return (
+        update(GuestListVersion)
+        .where(GuestListVersion.id == 1)
+        .values(version=GuestListVersion.version + 1)
+        .returning(GuestListVersion.version)
+    )
+
+
+def next_version(db: Session) -> int:
+    version = db.execute(_bump_statement()).scalar_one_or_none()
+    if version is None:
+        # Banco sem a linha do contador (não deveria acontecer após a migração 0005)
+        version = 2
+        db.add(GuestListVersion(id=1, version=version))
+        db.flush()
+    return version
+
+
+async def next_version_async(db: AsyncSession) -> int:
+    version = (await db.execute(_bump_statement())).scalar_one_or_none()
+    if version is None:
+        version = 2
+        db.add(GuestListVersion(id=1, version=version))
+        await db.flush()
+    return version
+
+
+def current_version(db: Session) -> int:
+    version = db.execute(
+        select(GuestListVersion.version).where(GuestListVersion.id == 1)
+    ).scalar_one_or_none()
+    return version or 1
+
+
+def stamp(version: int, *records) -> None:
+    """Marca convidados/acompanhantes como alterados nesta versão."""
+    now = datetime.now(timezone.utc)
+    for record in records:
+        record.version = version
+        record.updated_at = now
+
+
+def add_tombstone(db: Session, guest_id: int, version: int) -> None:
+    # merge: um id reaproveitado (SQLite) e apagado de novo só atualiza a versão
+    db.merge(GuestTombstone(
+        guest_id=guest_id, version=version, deleted_at=datetime.now(timezone.utc)
+    ))
@@ -0,0 +1,49 @@
+# migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from app import models  # noqa: F401  (registra as tabelas em Base.metadata)
+from app.database import Base, engine
+
+config = context.config
+
+# disable_existing_loggers=False: não desliga os loggers do uvicorn/app
+# quando as migrações rodam de dentro da API
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL sem conectar no banco (alembic upgrade head --sql)."""
+    context.configure(
+        url=str(engine.url),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=engine.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite não suporta a maioria dos ALTER TABLE
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
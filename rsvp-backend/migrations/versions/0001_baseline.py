@@ -0,0 +1,110 @@
+"""baseline: esquema criado antes das migrações
+
+Bancos já existentes foram criados por Base.metadata.create_all (e
+algumas colunas por ALTER TABLE na inicialização). Esta migração cria só
+o que estiver faltando, então serve tanto para banco novo quanto para o
+banco de produção que ainda não tem a tabela alembic_version.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_table_if_missing(name: str, *columns: sa.Column) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(name):
+        op.create_table(name, *columns)
+        op.create_index(f"ix_{name}_id", name, ["id"])
+
+
+def _add_column_if_missing(table: str, column: sa.Column) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if column.name not in {c["name"] for c in inspector.get_columns(table)}:
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(column)
+
+
+def _create_index_if_missing(name: str, table: str, columns: list) -> None:
+    inspector = sa.inspect(op.get_bind())
+    if name not in {i["name"] for i in inspector.get_indexes(table)}:
+        op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    _create_table_if_missing(
+        "guests",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=False),
+        sa.Column("rsvp_status", sa.String(), nullable=False),
+        sa.Column("responded_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("note", sa.Text(), nullable=True),
+    )
+
+    _create_table_if_missing(
+        "companions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("guest_id", sa.Integer(), sa.ForeignKey("guests.id", ondelete="CASCADE")),
+    )
+
+    _create_table_if_missing(
+        "photos",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sender_name", sa.String(), nullable=True),
+        sa.Column("photo_url", sa.String(), nullable=False),
+        sa.Column("thumbnail_url", sa.String(), nullable=True),
+        sa.Column("medium_url", sa.String(), nullable=True),
+        sa.Column("cloudinary_public_id", sa.String(), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    _add_column_if_missing("photos", sa.Column("thumbnail_url", sa.String(), nullable=True))
+    _add_column_if_missing("photos", sa.Column("medium_url", sa.String(), nullable=True))
+    _create_index_if_missing("ix_photos_uploaded_at_id", "photos", ["uploaded_at", "id"])
+
+    _create_table_if_missing(
+        "photo_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("sender_name", sa.String(), nullable=True),
+        sa.Column("filename", sa.String(), nullable=True),
+        sa.Column("raw_path", sa.String(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("photo_id", sa.Integer(), sa.ForeignKey("photos.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+
+    _create_table_if_missing(
+        "table_arrangements",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("table_number", sa.Integer(), nullable=False),
+        sa.Column("seat", sa.Integer(), nullable=True),
+        sa.Column("guest_id", sa.Integer(), sa.ForeignKey("guests.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("companion_id", sa.Integer(), sa.ForeignKey("companions.id", ondelete="CASCADE"), nullable=True),
+    )
+    _add_column_if_missing("table_arrangements", sa.Column("seat", sa.Integer(), nullable=True))
+
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("seating_versions"):
+        op.create_table(
+            "seating_versions",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in ("seating_versions", "table_arrangements", "photo_jobs", "photos", "companions", "guests"):
+        op.drop_table(table)
@@ -0,0 +1,57 @@
+"""índices das consultas mais usadas + um lugar por pessoa
+
+- guests.rsvp_status: filtro "YES" das mesas e das exportações
+- companions.guest_id: carregamento dos acompanhantes de cada convidado
+- table_arrangements (table_number, seat): mesa inteira / próximo lugar
+- table_arrangements.guest_id / companion_id: únicos (cada pessoa em um
+  só lugar); também servem para achar o lugar de uma pessoa
+- photos.uploaded_at já é coberto por ix_photos_uploaded_at_id (0001)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _remove_duplicate_seats(column: str) -> None:
+    """Mantém só a linha mais antiga de cada pessoa antes de criar o índice único."""
+    op.execute(sa.text(
+        f"DELETE FROM table_arrangements "
+        f"WHERE {column} IS NOT NULL AND id NOT IN ("
+        f"SELECT MIN(id) FROM table_arrangements WHERE {column} IS NOT NULL GROUP BY {column})"
+    ))
+
+
+def upgrade() -> None:
+    op.create_index("ix_guests_rsvp_status", "guests", ["rsvp_status"])
+    op.create_index("ix_companions_guest_id", "companions", ["guest_id"])
+    op.create_index(
+        "ix_table_arrangements_table_number_seat", "table_arrangements", ["table_number", "seat"]
+    )
+
+    _remove_duplicate_seats("guest_id")
+    _remove_duplicate_seats("companion_id")
+    op.create_index(
+        "uq_table_arrangements_guest_id", "table_arrangements", ["guest_id"], unique=True
+    )
+    op.create_index(
+        "uq_table_arrangements_companion_id", "table_arrangements", ["companion_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_table_arrangements_companion_id", table_name="table_arrangements")
+    op.drop_index("uq_table_arrangements_guest_id", table_name="table_arrangements")
+    op.drop_index("ix_table_arrangements_table_number_seat", table_name="table_arrangements")
+    op.drop_index("ix_companions_guest_id", table_name="companions")
+    op.drop_index("ix_guests_rsvp_status", table_name="guests")
@@ -0,0 +1,28 @@
+"""chave de idempotência do RSVP
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("guests") as batch:
+        batch.add_column(sa.Column("idempotency_key", sa.String(), nullable=True))
+    op.create_index("ix_guests_idempotency_key", "guests", ["idempotency_key"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_guests_idempotency_key", table_name="guests")
+    with op.batch_alter_table("guests") as batch:
+        batch.drop_column("idempotency_key")
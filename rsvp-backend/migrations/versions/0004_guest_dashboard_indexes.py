@@ -0,0 +1,31 @@
+"""índices do painel de convidados
+
+- (rsvp_status, responded_at, id): lista paginada de cada status,
+  da resposta mais recente para a mais antiga
+- (responded_at, id): lista sem filtro de status e "última resposta"
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_guests_rsvp_status_responded_at_id", "guests", ["rsvp_status", "responded_at", "id"]
+    )
+    op.create_index("ix_guests_responded_at_id", "guests", ["responded_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_guests_responded_at_id", table_name="guests")
+    op.drop_index("ix_guests_rsvp_status_responded_at_id", table_name="guests")
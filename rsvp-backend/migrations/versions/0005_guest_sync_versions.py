@@ -0,0 +1,62 @@
+"""versões e tombstones para a sincronização incremental de convidados
+
+- guests.version / companions.version: valor do contador na última
+  alteração (registros existentes começam na versão 1)
+- guests.updated_at / companions.updated_at: preenchidos com a data da resposta
+- guest_list_versions: contador (linha única, id=1)
+- guest_tombstones: convidados apagados, com a versão da exclusão
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for table in ("guests", "companions"):
+        with op.batch_alter_table(table) as batch:
+            batch.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+            batch.add_column(sa.Column("updated_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_guests_version", "guests", ["version"])
+
+    op.execute(sa.text("UPDATE guests SET updated_at = responded_at"))
+    op.execute(sa.text(
+        "UPDATE companions SET updated_at = "
+        "(SELECT responded_at FROM guests WHERE guests.id = companions.guest_id)"
+    ))
+
+    op.create_table(
+        "guest_list_versions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.execute(sa.text("INSERT INTO guest_list_versions (id, version) VALUES (1, 1)"))
+
+    op.create_table(
+        "guest_tombstones",
+        sa.Column("guest_id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_guest_tombstones_version", "guest_tombstones", ["version"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_guest_tombstones_version", table_name="guest_tombstones")
+    op.drop_table("guest_tombstones")
+    op.drop_table("guest_list_versions")
+    op.drop_index("ix_guests_version", table_name="guests")
+    for table in ("companions", "guests"):
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column("updated_at")
+            batch.drop_column("version")
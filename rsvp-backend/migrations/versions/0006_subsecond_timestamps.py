@@ -0,0 +1,38 @@
+"""datas com microssegundos no SQLite
+
+O server_default now() do SQLite grava "2026-10-17 07:57:55", mas o
+SQLAlchemy compara com "2026-10-17 07:57:55.000000". Como texto, a data
+sem fração é sempre menor, e os cursores da galeria e do painel
+(uploaded_at / responded_at, id) repetiam os registros do mesmo segundo.
+Completa a fração dos registros antigos; no Postgres não há o que fazer.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = (("photos", "uploaded_at"), ("guests", "responded_at"))
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table, column in _COLUMNS:
+        op.execute(sa.text(
+            f"UPDATE {table} SET {column} = {column} || '.000000' WHERE length({column}) = 19"
+        ))
+
+
+def downgrade() -> None:
+    # Os valores com fração continuam válidos
+    pass
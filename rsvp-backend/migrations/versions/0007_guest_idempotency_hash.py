@@ -0,0 +1,29 @@
+"""hash do corpo do RSVP junto da chave de idempotência
+
+Reenvios com a mesma Idempotency-Key e outro corpo passam a ser
+recusados (422) em vez de devolver o RSVP original em silêncio.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("guests") as batch:
+        batch.add_column(sa.Column("idempotency_hash", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("guests") as batch:
+        batch.drop_column("idempotency_hash")
@@ -0,0 +1,126 @@
+# tests/conftest.py
+"""
+Configuração dos testes: banco SQLite temporário, armazenamento de fotos
+local e limites de taxa desligados. As variáveis precisam estar definidas
+antes de importar o app (os engines e os limites são criados no import).
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+_TMP_DIR = tempfile.mkdtemp(prefix="rsvp-tests-")
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP_DIR, 'test.db')}"
+os.environ["ADMIN_TOKEN"] = "test-token"
+os.environ["STARTUP_WARMUP"] = "0"
+os.environ["PHOTO_STORAGE"] = "local"
+os.environ["PHOTO_STORAGE_DIR"] = os.path.join(_TMP_DIR, "photos")
+os.environ["PHOTO_SPOOL_DIR"] = os.path.join(_TMP_DIR, "pending")
+os.environ["RSVP_RATE_PER_MINUTE"] = "0"
+os.environ["RSVP_PHONE_RATE_PER_MINUTE"] = "0"
+os.environ["UPLOAD_RATE_PER_MINUTE"] = "0"
+os.environ.pop("METRICS_TOKEN", None)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models
+from app.cache import seating_cache
+from app.database import SessionLocal, async_engine, engine
+from app.main import app
+from app.search import companion_index, guest_index
+
+ADMIN = {"X-Admin-Token": "test-token"}
+
+# Tabelas de linha única (contadores de versão) ficam; o resto é apagado
+_KEEP_TABLES = {"alembic_version", "seating_versions", "guest_list_versions"}
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def wipe_database() -> None:
+    """Apaga os dados e zera os caches em memória."""
+    with engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            if table.name not in _KEEP_TABLES:
+                conn.execute(table.delete())
+    seating_cache.invalidate()
+    guest_index.reset()
+    companion_index.reset()
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Cada teste começa com o banco vazio."""
+    wipe_database()
+    yield
+
+
+# ==========================
+#  Contagem de comandos SQL
+# ==========================
+class QueryCounter:
+    def __init__(self) -> None:
+        self.statements = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries():
+    """Conta os comandos SQL (engines síncrono e assíncrono) dentro do bloco."""
+    counter = QueryCounter()
+    engines = (engine, async_engine.sync_engine)
+    for target in engines:
+        event.listen(target, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", counter)
+
+
+def seed_guests(db, n: int, companions_per_guest: int = 2, status: str = "YES", seat: bool = True):
+    """Cria `n` convidados com acompanhantes; com `seat`, senta todos em mesas de 10."""
+    guests = []
+    for i in range(n):
+        guest = models.Guest(name=f"Convidado {i}", phone=f"1199999{i:04d}", rsvp_status=status)
+        guest.companions = [
+            models.Companion(name=f"Acompanhante {i}-{j}") for j in range(companions_per_guest)
+        ]
+        guests.append(guest)
+    db.add_all(guests)
+    db.flush()
+
+    if seat:
+        people = []
+        for guest in guests:
+            people.append({"guest_id": guest.id})
+            people.extend({"companion_id": c.id} for c in guest.companions)
+        for position, person in enumerate(people):
+            db.add(models.TableArrangement(
+                table_number=position // 10 + 1, seat=position % 10 + 1, **person
+            ))
+    db.commit()
+    seating_cache.invalidate()
+    return guests
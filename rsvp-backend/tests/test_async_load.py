@@ -0,0 +1,78 @@
+# tests/test_async_load.py
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+
+from app.database import async_engine, get_db
+from app.routers.photos import _page_query, list_photos
+from app.schemas import PhotoPage, PhotoResponse
+from tests.test_photo_pagination import _seed_photo_rows
+
+
+# ==========================
+#  Benchmark: rota síncrona x assíncrona
+# ==========================
+def _sync_list_photos(db: Session = Depends(get_db), limit: int = 50):
+    """A listagem de fotos como era antes: Session síncrona, rodando no threadpool."""
+    photos = db.scalars(_page_query(None, limit)).all()
+    return PhotoPage(items=[PhotoResponse.model_validate(p) for p in photos], next_cursor=None)
+
+
+def _bench_app() -> FastAPI:
+    # Mesmo app para as duas versões: só muda a rota
+    bench = FastAPI()
+    bench.add_api_route("/sync", _sync_list_photos, response_model=PhotoPage)
+    bench.add_api_route("/async", list_photos, response_model=PhotoPage)
+    return bench
+
+
+def _load(path: str, total: int, concurrency: int):
+    """`total` requisições, `concurrency` de cada vez; devolve (req/s, p50 ms, p99 ms)."""
+    async def run():
+        latencies = []
+        transport = httpx.ASGITransport(app=_bench_app())
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                queue = iter(range(total))
+
+                async def worker():
+                    for _ in queue:
+                        started = time.perf_counter()
+                        response = await client.get(path)
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        assert response.status_code == 200
+
+                started = time.perf_counter()
+                await asyncio.gather(*[worker() for _ in range(concurrency)])
+                elapsed = time.perf_counter() - started
+        finally:
+            # As conexões assíncronas ficam presas a este event loop
+            await async_engine.dispose()
+
+        latencies.sort()
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        return total / elapsed, statistics.median(latencies), p99
+
+    return asyncio.run(run())
+
+
+def test_benchmark_sync_vs_async_photo_listing(client):
+    _seed_photo_rows(2000)
+
+    # Acima de ~40 simultâneas (threads do threadpool) a rota síncrona trava
+    # até o pool_timeout: as threads esperando conexão ocupam todas as vagas e
+    # quem tem conexão não consegue serializar a resposta para devolvê-la
+    results = {}
+    for concurrency in (1, 10, 30):
+        for path in ("/sync", "/async"):
+            results[path, concurrency] = _load(path, 400, concurrency)
+
+    print()
+    for (path, concurrency), (rps, p50, p99) in results.items():
+        print(f"{path:>6} x{concurrency:<3} {rps:7.0f} req/s  p50={p50:6.1f}ms  p99={p99:6.1f}ms")
+
+    assert all(rps > 0 for rps, _, _ in results.values())
@@ -0,0 +1,118 @@
+# tests/test_events.py
+import asyncio
+import json
+
+from app.events import EventBroker, RESYNC, broker
+from app.main import app
+from tests.conftest import ADMIN, seed_guests
+
+
+def _events_after(action, count: int = 1):
+    """Inscreve no broker, roda `action` (síncrona, fora do loop) e devolve os eventos recebidos."""
+    async def run():
+        subscription = broker.subscribe()
+        try:
+            await asyncio.to_thread(action)
+            events = []
+            for _ in range(count):
+                event = await subscription.get(timeout=2)
+                assert event is not None, "nenhum evento publicado"
+                events.append(event)
+            return events
+        finally:
+            broker.unsubscribe(subscription)
+
+    return asyncio.run(run())
+
+
+def test_rsvp_publishes_guest_created(client):
+    rsvp = {"name": "ana lima", "phone": "11999990001", "rsvp_status": "YES", "companions": []}
+    [event] = _events_after(lambda: client.post("/guests/", json=rsvp))
+
+    assert event.type == "guest.created"
+    assert json.loads(event.data)["name"] == "Ana Lima"
+    assert event.encode().startswith(f"id: {event.id}\nevent: guest.created\ndata: ")
+
+
+def test_seating_change_publishes_new_version(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    move = {"operations": [{"op": "move", "person_id": f"guest_{guest.id}", "table_number": 1}]}
+    responses = []
+
+    [event] = _events_after(lambda: responses.append(
+        client.patch("/tables/arrangements", json=move, headers=ADMIN)
+    ))
+
+    assert event.type == "seating.updated"
+    assert f'"{json.loads(event.data)["version"]}"' == responses[0].headers["etag"]
+
+
+def test_reconnect_replays_missed_events_or_asks_for_resync():
+    local = EventBroker(buffer_size=10, history_size=3)
+
+    async def run():
+        for i in range(5):
+            local.publish("guest.updated", {"id": i})
+        replay = local.subscribe(last_event_id=3)
+        too_old = local.subscribe(last_event_id=1)
+        return (
+            [await replay.get(0.1) for _ in range(2)],
+            await too_old.get(0.1),
+        )
+
+    replayed, resync = asyncio.run(run())
+    assert [e.id for e in replayed] == [4, 5]
+    assert resync is RESYNC
+
+
+def test_slow_client_gets_resync_instead_of_unbounded_buffer():
+    local = EventBroker(buffer_size=2)
+
+    async def run():
+        subscription = local.subscribe()
+        for i in range(5):
+            local.publish("guest.updated", {"id": i})
+        return await subscription.get(0.1), await subscription.get(0.01)
+
+    first, second = asyncio.run(run())
+    assert first is RESYNC
+    assert second is None
+
+
+def test_disconnect_unsubscribes_the_client():
+    async def run():
+        disconnected = asyncio.Event()
+        first_chunk = asyncio.Event()
+        chunks = []
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                chunks.append(message["body"])
+                first_chunk.set()
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/events/", "query_string": b"",
+            "headers": [(b"x-admin-token", ADMIN["X-Admin-Token"].encode())],
+            "client": ("127.0.0.1", 1), "root_path": "", "http_version": "1.1",
+            "scheme": "http", "server": ("test", 80),
+        }
+        before = broker.client_count
+        request = asyncio.create_task(app(scope, receive, send))
+        await asyncio.wait_for(first_chunk.wait(), 2)
+        connected = broker.client_count
+
+        disconnected.set()
+        await asyncio.wait_for(request, 2)
+        return before, connected, broker.client_count, chunks[0]
+
+    before, connected, after, first = asyncio.run(run())
+    assert first == b"retry: 5000\n\n"
+    assert connected == before + 1
+    assert after == before
@@ -0,0 +1,138 @@
+# tests/test_exports.py
+import csv
+import io
+import time
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from app import models
+from tests.conftest import ADMIN, seed_guests
+
+_NS = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def _csv_rows(body: bytes):
+    text = body.decode("utf-8")
+    assert text.startswith("\ufeff")
+    return [tuple(row) for row in csv.reader(io.StringIO(text[1:]), delimiter=";")]
+
+
+def _xlsx_rows(body: bytes):
+    with zipfile.ZipFile(io.BytesIO(body)) as zf:
+        assert zf.testzip() is None
+        assert {"[Content_Types].xml", "xl/workbook.xml"} <= set(zf.namelist())
+        sheet = ElementTree.fromstring(zf.read("xl/worksheets/sheet1.xml"))
+
+    rows = []
+    for row in sheet.iterfind(".//x:row", _NS):
+        values = []
+        for cell in row.iterfind("x:c", _NS):
+            text = cell.find("x:is/x:t", _NS)
+            number = cell.find("x:v", _NS)
+            values.append(text.text if text is not None else number.text if number is not None else "")
+        rows.append(tuple(values))
+    return rows
+
+
+@pytest.fixture
+def party(db):
+    guests = seed_guests(db, 3)
+    # Caracteres que precisam de escape no CSV (;) e no XML (& <)
+    tricky = models.Guest(name="Zé & <Filhos>; Ltda", phone="1", rsvp_status="YES")
+    tricky.companions = [models.Companion(name='Ana "Bia"')]
+    db.add_all([tricky, models.Guest(name="Não Vai", phone="2", rsvp_status="NO")])
+    db.commit()
+    return guests
+
+
+@pytest.mark.parametrize("group_by_table", [False, True])
+def test_csv_and_xlsx_round_trip(client, party, group_by_table):
+    params = {"group_by_table": group_by_table}
+    csv_response = client.get("/guests/export/confirmed.csv", headers=ADMIN, params=params)
+    xlsx_response = client.get("/guests/export/confirmed.xlsx", headers=ADMIN, params=params)
+    assert csv_response.status_code == xlsx_response.status_code == 200
+
+    csv_rows = _csv_rows(csv_response.content)
+    xlsx_rows = _xlsx_rows(xlsx_response.content)
+
+    assert csv_rows[0] == ("Nome", "Convidado principal", "Mesa")
+    assert csv_rows == xlsx_rows
+    # 3 convidados x 3 pessoas + o convidado sem mesa e a acompanhante; "NO" fica de fora
+    assert len(csv_rows) - 1 == 11
+    assert ("Zé & <Filhos>; Ltda", "", "") in csv_rows
+    assert ('Ana "Bia"', "Zé & <Filhos>; Ltda", "") in csv_rows
+    assert ("Acompanhante 0-0", "Convidado 0", "1") in csv_rows
+
+
+def test_csv_and_xlsx_neutralize_formulas(client, db):
+    host = models.Guest(name="=HYPERLINK(\"http://x\")", phone="1", rsvp_status="YES")
+    host.companions = [models.Companion(name="+55 11"), models.Companion(name="@soma"), models.Companion(name="-1")]
+    db.add(host)
+    db.commit()
+
+    csv_rows = _csv_rows(client.get("/guests/export/confirmed.csv", headers=ADMIN).content)
+    xlsx_rows = _xlsx_rows(client.get("/guests/export/confirmed.xlsx", headers=ADMIN).content)
+
+    assert csv_rows == xlsx_rows
+    assert set(csv_rows[1:]) == {
+        ("'=HYPERLINK(\"http://x\")", "", ""),
+        ("'+55 11", "'=HYPERLINK(\"http://x\")", ""),
+        ("'@soma", "'=HYPERLINK(\"http://x\")", ""),
+        ("'-1", "'=HYPERLINK(\"http://x\")", ""),
+    }
+
+
+@pytest.mark.parametrize("ext", ["docx", "pdf"])
+def test_cached_documents_honour_if_none_match(client, party, ext):
+    path = f"/guests/export/confirmed.{ext}"
+    first = client.get(path, headers=ADMIN)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"outro", {etag}', "*"):
+        response = client.get(path, headers={**ADMIN, "If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+    assert client.get(path, headers={**ADMIN, "If-None-Match": '"outro"'}).status_code == 200
+
+
+def test_export_cache_is_invalidated_by_changes(client, party):
+    path = "/guests/export/confirmed.pdf"
+    etag = client.get(path, headers=ADMIN).headers["etag"]
+    client.post("/guests/", json={"name": "nova", "phone": "3", "rsvp_status": "YES", "companions": []})
+    assert client.get(path, headers={**ADMIN, "If-None-Match": etag}).status_code == 200
+
+
+# ==========================
+#  Benchmark: 5 mil presentes
+# ==========================
+def test_benchmark_exports_with_5k_attendees(client, db):
+    seed_guests(db, 1700)  # 1700 convidados + 3400 acompanhantes
+
+    timings = {}
+    for ext in ("csv", "xlsx", "docx", "pdf"):
+        started = time.perf_counter()
+        response = client.get(f"/guests/export/confirmed.{ext}", headers=ADMIN)
+        timings[ext] = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200
+
+    # Segundo download dos documentos em cache
+    started = time.perf_counter()
+    client.get("/guests/export/confirmed.pdf", headers=ADMIN)
+    timings["pdf (cache)"] = (time.perf_counter() - started) * 1000
+
+    print("\n" + ", ".join(f"{name}={ms:.0f}ms" for name, ms in timings.items()))
+    assert len(_csv_rows(client.get("/guests/export/confirmed.csv", headers=ADMIN).content)) == 5101
+    assert timings["pdf (cache)"] < timings["pdf"]
+
+
+def test_table_cards_honour_weak_and_listed_etags(client, party):
+    first = client.get("/tables/export/cards.pdf", headers=ADMIN)
+    assert first.status_code == 200
+    assert first.content.startswith(b"%PDF")
+    etag = first.headers["etag"]
+
+    for if_none_match in (etag, f"W/{etag}", f'"outro", W/{etag}'):
+        response = client.get("/tables/export/cards.pdf", headers={**ADMIN, "If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
@@ -0,0 +1,153 @@
+# tests/test_guest_search.py
+import time
+
+import pytest
+from sqlalchemy import insert
+
+from app import models, search
+from app.database import engine
+from app.search import normalize_query
+from tests.conftest import ADMIN, count_queries, seed_guests
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("(11) 99999-0003", "11999990003"),
+        ("99999-0003", "999990003"),
+        ("+55 11 99999 0003", "5511999990003"),
+        ("João da Silva", "joao da silva"),
+        ("Mesa 3", "mesa 3"),
+    ],
+)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+@pytest.fixture
+def maria(client):
+    response = client.post("/guests/", json={
+        "name": "Maria Souza", "phone": "(11) 99999-0003", "rsvp_status": "YES",
+        "companions": [{"name": "Pedro"}],
+    })
+    client.post("/guests/", json={
+        "name": "Outra Pessoa", "phone": "(21) 98888-1234", "rsvp_status": "YES", "companions": [],
+    })
+    return response.json()
+
+
+@pytest.mark.parametrize("q", ["(11) 99999-0003", "99999-0003", "11999990003", "9999 0003", "maria", "pedro"])
+def test_dashboard_search_finds_guest(client, maria, q):
+    page = client.get("/guests/page", headers=ADMIN, params={"q": q}).json()
+    assert [g["id"] for g in page["items"]] == [maria["id"]]
+    assert page["total"] == 1
+
+
+@pytest.mark.parametrize("q", ["(11) 99999-0003", "99999-0003"])
+def test_find_matches_formatted_phone(client, maria, q):
+    results = client.get("/guests/find", headers=ADMIN, params={"q": q}).json()
+    assert results[0]["id"] == maria["id"]
+
+
+def test_broad_search_caps_the_in_list(client, db, monkeypatch):
+    monkeypatch.setattr(search, "MAX_CONTAINING", 20)
+    seed_guests(db, 60, companions_per_guest=1, seat=False)
+    db.add(models.Guest(name="Olga", phone="1", rsvp_status="YES", note="vou com o convidado 3"))
+    db.commit()
+
+    with count_queries() as counter:
+        page = client.get("/guests/page", headers=ADMIN, params={"q": "co", "limit": 200}).json()
+
+    # 20 pelo nome + até 20 pelos acompanhantes (os mesmos donos) + o recado
+    assert 20 <= page["total"] <= 41
+    assert any(g["name"] == "Olga" for g in page["items"])
+    assert max(statement.count("?") for statement in counter.statements) < 60
+
+
+def test_containing_prefers_word_prefixes(db):
+    index = search.TrigramIndex(lambda _db: [(1, "Marco"), (2, "Ana Costa"), (3, "Rico"), (4, "Corina")])
+    index.ensure_loaded(db)
+    assert index.containing("co", limit=2) == [4, 2]
+    assert sorted(index.containing("co")) == [1, 2, 3, 4]
+
+
+def test_dashboard_pages_walk_every_guest_once(client, db):
+    seed_guests(db, 25, companions_per_guest=0, seat=False)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/guests/page", headers=ADMIN, params=params).json()
+        seen.extend(g["id"] for g in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == len(set(seen)) == 25
+
+
+# ==========================
+#  Benchmark: 10 mil e 100 mil convidados
+# ==========================
+_FIRST = ("João", "Maria", "José", "Ana", "Luíza", "Pedro", "Gabriel", "Júlia", "Conceição", "André")
+_LAST = ("Silva", "Souza", "Oliveira", "Lima", "Gonçalves", "Araújo", "Fernandes", "Ribeiro", "Simões", "Brandão")
+
+
+def _seed_guest_rows(count: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(models.Guest), [
+            {
+                "name": f"{_FIRST[i % 10]} {_LAST[i // 10 % 10]} {_LAST[i // 100 % 10]} {i}",
+                "phone": f"119{i:08d}",
+                "rsvp_status": "YES",
+            }
+            for i in range(count)
+        ])
+
+
+def _ilike_ids(db, q: str, limit: int = 50):
+    """A busca antiga: ILIKE '%q%' em nome e telefone (varre a tabela)."""
+    return [
+        row.id for row in db.query(models.Guest.id)
+        .filter(models.Guest.name.ilike(f"%{q}%") | models.Guest.phone.ilike(f"%{q}%"))
+        .limit(limit)
+    ]
+
+
+@pytest.mark.parametrize("total", [10_000, 100_000])
+def test_benchmark_search(client, db, total):
+    _seed_guest_rows(total)
+    queries = ("joao", "Conceição Brandão", "goncalvs", "119000012", "ribeiro simoes 4")
+
+    started = time.perf_counter()
+    search.guest_index.ensure_loaded(db)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    timings = {}
+    for q in queries:
+        started = time.perf_counter()
+        for _ in range(5):
+            ids = search.guest_index.search(q, 50)
+        index_ms = (time.perf_counter() - started) * 1000 / 5
+
+        started = time.perf_counter()
+        for _ in range(5):
+            ilike = _ilike_ids(db, q)
+        ilike_ms = (time.perf_counter() - started) * 1000 / 5
+
+        started = time.perf_counter()
+        response = client.get("/guests/find", headers=ADMIN, params={"q": q, "limit": 50})
+        api_ms = (time.perf_counter() - started) * 1000
+
+        assert response.status_code == 200
+        assert [g["id"] for g in response.json()] == ids
+        timings[q] = (index_ms, ilike_ms, api_ms, len(ids), len(ilike))
+
+    print(f"\n{total} convidados, índice carregado em {load_ms:.0f}ms")
+    for q, (index_ms, ilike_ms, api_ms, found, found_ilike) in timings.items():
+        print(
+            f"  {q!r}: índice={index_ms:.1f}ms ({found}) ILIKE={ilike_ms:.1f}ms ({found_ilike}) "
+            f"/guests/find={api_ms:.1f}ms"
+        )
+
+    # Sem acento e com erro de digitação: o ILIKE não acha, o índice acha
+    assert timings["joao"][3] == 50 and timings["joao"][4] == 0
+    assert timings["goncalvs"][3] > 0 and timings["goncalvs"][4] == 0
@@ -0,0 +1,74 @@
+# tests/test_guest_sync.py
+from tests.conftest import ADMIN
+
+
+def _sync(client, since: int) -> dict:
+    response = client.get("/guests/", headers=ADMIN, params={"updated_since": since})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _create(client, name: str) -> dict:
+    response = client.post("/guests/", json={
+        "name": name, "phone": "11999990001", "rsvp_status": "YES", "companions": [{"name": "Bia"}],
+    })
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_first_sync_returns_everything(client):
+    ana = _create(client, "Ana")
+    changes = _sync(client, 0)
+    assert [g["id"] for g in changes["items"]] == [ana["id"]]
+    assert changes["deleted"] == []
+    assert changes["version"] >= 1
+
+
+def test_unchanged_list_gives_empty_delta(client):
+    _create(client, "Ana")
+    version = _sync(client, 0)["version"]
+
+    changes = _sync(client, version)
+    assert changes == {"items": [], "deleted": [], "version": version}
+
+
+def test_edit_shows_up_in_delta_and_bumps_version(client):
+    ana = _create(client, "Ana")
+    _create(client, "Caio")
+    version = _sync(client, 0)["version"]
+
+    response = client.patch(f"/guests/{ana['id']}", json={"rsvp_status": "NO"}, headers=ADMIN)
+    assert response.status_code == 200
+
+    changes = _sync(client, version)
+    assert [(g["id"], g["rsvp_status"]) for g in changes["items"]] == [(ana["id"], "NO")]
+    assert changes["version"] > version
+    assert _sync(client, changes["version"])["items"] == []
+
+
+def test_companion_change_shows_the_guest_in_delta(client):
+    ana = _create(client, "Ana")
+    version = _sync(client, 0)["version"]
+
+    response = client.post(f"/companions/{ana['id']}", json={"name": "Davi"}, headers=ADMIN)
+    assert response.status_code == 201
+
+    changes = _sync(client, version)
+    assert [g["id"] for g in changes["items"]] == [ana["id"]]
+    assert {c["name"] for c in changes["items"][0]["companions"]} == {"Bia", "Davi"}
+
+
+def test_delete_shows_up_as_tombstone(client):
+    ana = _create(client, "Ana")
+    caio = _create(client, "Caio")
+    version = _sync(client, 0)["version"]
+
+    assert client.delete(f"/guests/{ana['id']}", headers=ADMIN).status_code == 204
+
+    changes = _sync(client, version)
+    assert changes["items"] == []
+    assert changes["deleted"] == [ana["id"]]
+    assert changes["version"] > version
+    # Quem sincroniza do zero não recebe o apagado
+    full = _sync(client, 0)
+    assert [g["id"] for g in full["items"]] == [caio["id"]]
@@ -0,0 +1,51 @@
+# tests/test_gzip.py
+import asyncio
+
+from PIL import Image
+
+from app.main import SelectiveGZipMiddleware
+from app.models import Photo
+from app.storage import storage
+from tests.conftest import ADMIN, seed_guests
+
+
+def test_large_json_is_compressed(client, db):
+    seed_guests(db, 50)
+    response = client.get("/tables/seating", headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") == "gzip"
+
+
+def test_zip_export_is_not_recompressed(client, db, tmp_path):
+    image_path = tmp_path / "foto.jpg"
+    Image.new("RGB", (200, 200), "red").save(image_path)
+    stored = storage.upload(str(image_path), "foto.jpg")
+    db.add(Photo(photo_url=stored.url, cloudinary_public_id=stored.public_id))
+    db.commit()
+
+    response = client.get("/photos/export.zip", headers={**ADMIN, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+
+
+def test_event_stream_bypasses_gzip():
+    sent = []
+
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start", "status": 200,
+            "headers": [(b"content-type", b"text/event-stream")],
+        })
+        await send({"type": "http.response.body", "body": b"x" * 2000, "more_body": True})
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "method": "GET", "path": "/events/",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(SelectiveGZipMiddleware(app, minimum_size=1000)(scope, None, send))
+
+    # O primeiro pedaço sai na hora, sem compressão
+    assert [m["type"] for m in sent] == ["http.response.start", "http.response.body"]
+    assert (b"content-encoding", b"gzip") not in sent[0]["headers"]
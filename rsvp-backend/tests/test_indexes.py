@@ -0,0 +1,70 @@
+# tests/test_indexes.py
+"""
+As consultas mais usadas precisam usar os índices das migrações 0002 e
+0004 (EXPLAIN QUERY PLAN do SQLite), inclusive para o ORDER BY.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.database import engine
+from tests.conftest import seed_guests
+
+HOT_QUERIES = [
+    (
+        "SELECT * FROM guests WHERE rsvp_status = 'YES'",
+        "ix_guests_rsvp_status",
+    ),
+    (
+        "SELECT * FROM companions WHERE guest_id IN (1, 2, 3)",
+        "ix_companions_guest_id",
+    ),
+    (
+        "SELECT * FROM table_arrangements WHERE guest_id = 1",
+        "uq_table_arrangements_guest_id",
+    ),
+    (
+        "SELECT * FROM table_arrangements WHERE companion_id = 1",
+        "uq_table_arrangements_companion_id",
+    ),
+    (
+        "SELECT * FROM table_arrangements WHERE table_number = 3 ORDER BY seat",
+        "ix_table_arrangements_table_number_seat",
+    ),
+    (
+        "SELECT * FROM photos ORDER BY uploaded_at DESC, id DESC LIMIT 10",
+        "ix_photos_uploaded_at_id",
+    ),
+    (
+        "SELECT * FROM guests WHERE rsvp_status = 'YES' "
+        "ORDER BY responded_at DESC, id DESC LIMIT 10",
+        "ix_guests_rsvp_status_responded_at_id",
+    ),
+    (
+        "SELECT * FROM guests ORDER BY responded_at DESC, id DESC LIMIT 10",
+        "ix_guests_responded_at_id",
+    ),
+]
+
+
+def _plan(sql: str) -> str:
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("sql,index", HOT_QUERIES)
+def test_hot_query_uses_index(db, sql, index):
+    seed_guests(db, 30)
+    plan = _plan(sql)
+    assert index in plan, plan
+    # Sem ordenação extra: o índice já entrega na ordem certa
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_one_seat_per_person(db):
+    guest = seed_guests(db, 1, companions_per_guest=0)[0]
+    db.add(models.TableArrangement(table_number=9, seat=1, guest_id=guest.id))
+    with pytest.raises(IntegrityError):
+        db.commit()
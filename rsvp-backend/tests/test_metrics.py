@@ -0,0 +1,102 @@
+# tests/test_metrics.py
+import re
+
+from app import limits
+from app.limits import TokenBucketLimiter
+from app.metrics import Counter, Histogram
+from tests.conftest import ADMIN, seed_guests
+
+
+def _metrics(client) -> str:
+    response = client.get("/metrics", headers=ADMIN)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def _series(text: str, name: str, **labels) -> float:
+    """Valor da série com exatamente esses labels (0 se não existe)."""
+    wanted = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(wanted)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_histogram_and_counter_exposition_format():
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), (0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5.0, "/a")
+    gauge = Counter("demo_in_flight", "Em andamento.", kind="gauge")
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 5.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
+    assert gauge.render() == [
+        "# HELP demo_in_flight Em andamento.",
+        "# TYPE demo_in_flight gauge",
+        "demo_in_flight 0",
+    ]
+
+
+def test_labels_use_the_route_template(client, db):
+    guest = seed_guests(db, 1, seat=False)[0]
+    before = _metrics(client)
+    labels = dict(method="GET", route="/guests/{guest_id}", status="200")
+
+    assert client.get(f"/guests/{guest.id}", headers=ADMIN).status_code == 200
+    text = _metrics(client)
+
+    assert _series(text, "http_request_duration_seconds_count", **labels) == \
+        _series(before, "http_request_duration_seconds_count", **labels) + 1
+    assert f'route="/guests/{guest.id}"' not in text
+    assert 'http_request_sql_statements_count{method="GET",route="/guests/{guest_id}"}' in text
+
+
+def test_unknown_path_is_unmatched(client):
+    client.get("/nada-aqui")
+    assert _series(
+        _metrics(client), "http_request_duration_seconds_count",
+        method="GET", route="unmatched", status="404",
+    ) >= 1
+
+
+def test_rate_limited_requests_keep_their_route(client, monkeypatch):
+    monkeypatch.setattr(limits, "rsvp_ip_limiter", TokenBucketLimiter(per_minute=1, burst=1))
+    rsvp = {"name": "Ana", "phone": "11999990001", "rsvp_status": "NO", "companions": []}
+    labels = dict(method="POST", route="/guests/", status="429")
+    before = _series(_metrics(client), "http_request_duration_seconds_count", **labels)
+
+    client.post("/guests/", json=rsvp)
+    assert client.post("/guests/", json=rsvp).status_code == 429
+
+    assert _series(_metrics(client), "http_request_duration_seconds_count", **labels) == before + 1
+
+
+def test_busy_upload_keeps_its_route(client, monkeypatch):
+    monkeypatch.setattr(limits.photo_jobs, "pending_count", lambda: limits.UPLOAD_MAX_PENDING_JOBS)
+    labels = dict(method="POST", route="/photos/upload", status="503")
+    before = _series(_metrics(client), "http_request_duration_seconds_count", **labels)
+
+    response = client.post("/photos/upload", files=[("files", ("a.png", b"x", "image/png"))])
+    assert response.status_code == 503
+
+    assert _series(_metrics(client), "http_request_duration_seconds_count", **labels) == before + 1
+
+
+def test_server_timing_header_reports_app_and_db(client, db):
+    seed_guests(db, 3, seat=False)
+    response = client.get("/guests/", headers=ADMIN)
+
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(r'app;dur=\d+\.\d, db;dur=\d+\.\d;desc="\d+ queries"', timing), timing
+    assert int(re.search(r'"(\d+) queries"', timing).group(1)) >= 2
+
+
+def test_metrics_require_auth(client):
+    assert client.get("/metrics").status_code == 401
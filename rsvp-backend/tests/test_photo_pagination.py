@@ -0,0 +1,122 @@
+# tests/test_photo_pagination.py
+import base64
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from PIL import Image
+from sqlalchemy import insert, select, text
+from sqlalchemy.orm import Session
+
+from app import photo_jobs
+from app.database import engine
+from app.models import Photo, PhotoJob
+from app.routers.photos import _encode_cursor, _page_query
+
+
+def _process_photos(db, count: int) -> None:
+    """Cria e processa `count` jobs na hora (as fotos saem no mesmo segundo)."""
+    jobs = []
+    for i in range(count):
+        buffer = io.BytesIO()
+        Image.new("RGB", (32, 32), (i * 20, 0, 0)).save(buffer, "PNG")
+        buffer.seek(0)
+        jobs.append(PhotoJob(filename=f"{i}.png", raw_path=photo_jobs.spool_upload(buffer)))
+    db.add_all(jobs)
+    db.commit()
+    for job in jobs:
+        photo_jobs.process_job(job.id)
+
+
+def test_cursor_pages_through_photos_from_the_same_second(client, db):
+    _process_photos(db, 7)
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/photos/", params=params).json()
+        seen.extend(photo["id"] for photo in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert cursor is None, "a paginação não terminou"
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    assert seen == sorted(seen, reverse=True)
+
+
+# ==========================
+#  Benchmark: OFFSET x cursor
+# ==========================
+def _seed_photo_rows(count: int) -> None:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(Photo), [
+            {
+                "photo_url": f"https://example.com/{i}.jpg",
+                "cloudinary_public_id": f"p{i}",
+                "uploaded_at": start + timedelta(seconds=i // 3),  # 3 fotos por segundo
+            }
+            for i in range(count)
+        ])
+
+
+def test_benchmark_offset_vs_cursor(client):
+    total, page_size = 20_000, 50
+    _seed_photo_rows(total)
+    deep_offset = total - page_size
+
+    # Página profunda com OFFSET: o banco percorre e descarta as linhas anteriores
+    offset_sql = text(
+        "SELECT * FROM photos ORDER BY uploaded_at DESC, id DESC LIMIT :limit OFFSET :offset"
+    )
+    with engine.connect() as conn:
+        started = time.perf_counter()
+        for _ in range(20):
+            rows = conn.execute(offset_sql, {"limit": page_size, "offset": deep_offset}).all()
+        offset_ms = (time.perf_counter() - started) * 1000 / 20
+    assert len(rows) == page_size
+
+    # Mesma página pelo cursor (mesma consulta da API), a partir da foto anterior
+    with Session(engine) as session:
+        previous = session.scalars(
+            select(Photo).order_by(Photo.uploaded_at.desc(), Photo.id.desc()).offset(deep_offset - 1).limit(1)
+        ).one()
+        cursor = _encode_cursor(previous)
+        started = time.perf_counter()
+        for _ in range(20):
+            keyset = session.scalars(_page_query(cursor, page_size)).all()
+        cursor_ms = (time.perf_counter() - started) * 1000 / 20
+    assert [photo.id for photo in keyset] == [row.id for row in rows]
+
+    # Percorrer tudo pela API
+    started = time.perf_counter()
+    seen, cursor, requests = 0, None, 0
+    while True:
+        params = {"limit": 200, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/photos/", params=params).json()
+        seen += len(page["items"])
+        requests += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    walk_ms = (time.perf_counter() - started) * 1000
+
+    print(
+        f"\n{total} fotos, página {deep_offset // page_size + 1}: OFFSET={offset_ms:.2f}ms "
+        f"cursor={cursor_ms:.2f}ms; API inteira em {requests} páginas: {walk_ms:.0f}ms"
+    )
+    assert seen == total
+    assert cursor_ms < offset_ms
+
+
+def test_cursor_query_seeks_into_the_index():
+    statement = _page_query(_encode_cursor(Photo(id=10, uploaded_at=datetime(2026, 1, 1))), 50)
+    compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    # SEARCH = começa no ponto do cursor; SCAN percorreria desde a primeira foto
+    assert "SEARCH photos USING INDEX ix_photos_uploaded_at_id" in plan, plan
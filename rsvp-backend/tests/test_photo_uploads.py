@@ -0,0 +1,152 @@
+# tests/test_photo_uploads.py
+import asyncio
+import io
+import os
+import time
+import tracemalloc
+
+import pytest
+from PIL import Image
+
+from app import limits, photo_jobs
+from app.main import app
+
+
+class _GeneratedStream:
+    """Arquivo de `size` bytes gerado sob demanda (nunca inteiro na memória)."""
+
+    def __init__(self, size: int) -> None:
+        self.remaining = size
+        self.bytes_read = 0
+
+    def read(self, n: int = -1) -> bytes:
+        if n < 0:
+            n = self.remaining
+        n = min(n, self.remaining)
+        self.remaining -= n
+        self.bytes_read += n
+        return b"\xff" * n
+
+
+def _png(color: str = "red") -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_spool_memory_stays_flat_regardless_of_batch_size():
+    tracemalloc.start()
+    try:
+        paths = [photo_jobs.spool_upload(_GeneratedStream(5 * 1024 * 1024)) for _ in range(20)]
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    try:
+        # 100MB gravados; na memória, só alguns blocos de READ_CHUNK_SIZE por vez
+        assert peak < 4 * photo_jobs.READ_CHUNK_SIZE
+        assert all(os.path.getsize(path) == 5 * 1024 * 1024 for path in paths)
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+def test_spool_rejects_oversized_stream_early():
+    stream = _GeneratedStream(100 * 1024 * 1024)
+    before = set(os.listdir(photo_jobs.SPOOL_DIR)) if os.path.isdir(photo_jobs.SPOOL_DIR) else set()
+
+    with pytest.raises(ValueError):
+        photo_jobs.spool_upload(stream)
+
+    # Parou logo depois do limite e não deixou o arquivo parcial para trás
+    assert stream.bytes_read <= photo_jobs.MAX_PHOTO_SIZE + photo_jobs.READ_CHUNK_SIZE
+    assert set(os.listdir(photo_jobs.SPOOL_DIR)) == before
+
+
+def test_spool_rejects_declared_size_without_reading():
+    stream = _GeneratedStream(1024)
+    with pytest.raises(ValueError):
+        photo_jobs.spool_upload(stream, size=photo_jobs.MAX_PHOTO_SIZE + 1)
+    assert stream.bytes_read == 0
+
+
+def test_upload_accepts_valid_files_and_reports_oversized(client):
+    big = b"\xff" * (photo_jobs.MAX_PHOTO_SIZE + 1)
+    response = client.post(
+        "/photos/upload",
+        data={"sender_name": "Ana"},
+        files=[
+            ("files", ("a.png", _png(), "image/png")),
+            ("files", ("grande.jpg", big, "image/jpeg")),
+            ("files", ("b.png", _png("blue"), "image/png")),
+        ],
+    )
+    assert response.status_code == 202, response.text
+    body = response.json()
+    assert [job["filename"] for job in body["jobs"]] == ["a.png", "b.png"]
+    assert [(error["index"], error["filename"]) for error in body["errors"]] == [(2, "grande.jpg")]
+
+    # Espera o processamento em segundo plano (as fotos ficam na galeria)
+    ids = [job["id"] for job in body["jobs"]]
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        jobs = client.get("/photos/jobs", params={"ids": ids}).json()
+        if all(job["status"] in {"DONE", "ERROR"} for job in jobs):
+            break
+        time.sleep(0.05)
+    assert [job["status"] for job in jobs] == ["DONE", "DONE"]
+
+
+# ==========================
+#  Corpo grande demais (antes do parse do multipart)
+# ==========================
+def _asgi_post(headers, chunks):
+    """Chama o app ASGI direto; devolve o status e quantos pedaços foram lidos."""
+    state = {"read": 0, "status": None}
+    pending = list(chunks)
+
+    async def receive():
+        if not pending:
+            return {"type": "http.request", "body": b"", "more_body": False}
+        state["read"] += 1
+        return {"type": "http.request", "body": pending.pop(0), "more_body": bool(pending)}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and state["status"] is None:
+            state["status"] = message["status"]
+
+    scope = {
+        "type": "http", "method": "POST", "path": "/photos/upload", "headers": headers,
+        "client": ("127.0.0.1", 1), "query_string": b"", "root_path": "",
+        "http_version": "1.1", "scheme": "http", "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return state
+
+
+def test_upload_rejects_large_content_length_without_reading(monkeypatch):
+    monkeypatch.setattr(limits, "UPLOAD_MAX_BODY_BYTES", 1000)
+    state = _asgi_post(
+        [(b"content-type", b"multipart/form-data; boundary=x"), (b"content-length", b"5000")],
+        [b"x" * 1000] * 5,
+    )
+    assert state["status"] == 413
+    assert state["read"] == 0
+
+
+def test_upload_caps_chunked_body(monkeypatch):
+    monkeypatch.setattr(limits, "UPLOAD_MAX_BODY_BYTES", 64 * 1024)
+    before = set(os.listdir(photo_jobs.SPOOL_DIR)) if os.path.isdir(photo_jobs.SPOOL_DIR) else set()
+
+    part = (
+        b"--x\r\nContent-Disposition: form-data; name=\"files\"; filename=\"a.png\"\r\n"
+        b"Content-Type: image/png\r\n\r\n"
+    )
+    chunks = [part] + [b"\xff" * 16 * 1024] * 100  # ~1.6MB, sem Content-Length
+    state = _asgi_post([(b"content-type", b"multipart/form-data; boundary=x")], chunks)
+
+    assert state["status"] == 413
+    # Parou logo depois do limite, sem ler o resto nem criar jobs
+    assert state["read"] <= 6
+    after = set(os.listdir(photo_jobs.SPOOL_DIR)) if os.path.isdir(photo_jobs.SPOOL_DIR) else set()
+    assert after == before
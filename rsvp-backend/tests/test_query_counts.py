@@ -0,0 +1,45 @@
+# tests/test_query_counts.py
+"""
+As listagens não podem fazer uma consulta por convidado (N+1): o número
+de comandos SQL deve ser o mesmo com 1 ou com 50 convidados.
+"""
+import pytest
+
+from tests.conftest import ADMIN, count_queries, seed_guests, wipe_database
+
+LISTINGS = [
+    "/guests/",
+    "/companions/",
+    "/tables/people",
+    "/tables/people/public",
+    "/tables/arrangements",
+    "/tables/view",
+    "/tables/seating",
+]
+
+
+def _queries_for(client, db, path: str, n: int) -> int:
+    seed_guests(db, n)
+    with count_queries() as counter:
+        response = client.get(path, headers=ADMIN)
+    assert response.status_code == 200, response.text
+    return counter.count
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_listing_query_count_does_not_grow_with_guests(client, db, path):
+    few = _queries_for(client, db, path, 1)
+
+    # Recomeça do zero com 50 convidados (150 pessoas)
+    wipe_database()
+
+    many = _queries_for(client, db, path, 50)
+    assert many == few, f"{path}: {few} consultas com 1 convidado, {many} com 50"
+
+
+def test_listing_returns_everyone(client, db):
+    seed_guests(db, 50)
+    assert len(client.get("/guests/", headers=ADMIN).json()) == 50
+    assert len(client.get("/companions/", headers=ADMIN).json()) == 100
+    seated = client.get("/tables/arrangements", headers=ADMIN).json()
+    assert sum(1 for people in seated.values() for person in people if person) == 150
@@ -0,0 +1,93 @@
+# tests/test_rate_limits.py
+import pytest
+
+from app import limits, models, photo_jobs
+from app.limits import ConcurrencyLimit, TokenBucketLimiter, client_ip
+from app.routers import guests as guests_router
+
+
+def _rsvp(phone: str = "11999990001") -> dict:
+    return {"name": "Ana", "phone": phone, "rsvp_status": "NO", "companions": []}
+
+
+def test_token_bucket_allows_burst_then_asks_to_wait(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(limits.time, "monotonic", lambda: now[0])
+    limiter = TokenBucketLimiter(per_minute=6, burst=2)
+
+    assert limiter.hit("ip") is None
+    assert limiter.hit("ip") is None
+    wait = limiter.hit("ip")
+    assert wait == pytest.approx(10.0)  # 6/min = uma ficha a cada 10s
+    assert limiter.hit("outro-ip") is None
+
+    now[0] += 10
+    assert limiter.hit("ip") is None
+
+
+def test_disabled_limiter_never_blocks():
+    limiter = TokenBucketLimiter(per_minute=0, burst=1)
+    assert all(limiter.hit("ip") is None for _ in range(100))
+
+
+def test_client_ip_uses_the_proxy_hop(monkeypatch):
+    scope = {"headers": [(b"x-forwarded-for", b"6.6.6.6, 1.2.3.4")], "client": ("10.0.0.1", 5000)}
+    monkeypatch.setattr(limits, "PROXY_HOPS", 1)
+    assert client_ip(scope) == "1.2.3.4"  # o primeiro pode ser forjado pelo cliente
+    monkeypatch.setattr(limits, "PROXY_HOPS", 0)
+    assert client_ip(scope) == "10.0.0.1"
+
+
+def test_rsvp_flood_gets_429_with_retry_after(client, db, monkeypatch):
+    monkeypatch.setattr(limits, "rsvp_ip_limiter", TokenBucketLimiter(per_minute=10, burst=3))
+
+    statuses = [client.post("/guests/", json=_rsvp(f"1199999{i:04d}")).status_code for i in range(20)]
+    assert statuses[:3] == [201, 201, 201]
+    assert set(statuses[3:]) == {429}
+
+    response = client.post("/guests/", json=_rsvp("11999990999"))
+    assert int(response.headers["retry-after"]) >= 1
+    assert "Aguarde" in response.json()["detail"]
+    # As recusadas não chegaram ao banco
+    assert db.query(models.Guest).count() == 3
+
+
+def test_same_phone_is_limited(client, monkeypatch):
+    monkeypatch.setattr(guests_router, "rsvp_phone_limiter", TokenBucketLimiter(per_minute=2, burst=1))
+    assert client.post("/guests/", json=_rsvp()).status_code == 201
+    response = client.post("/guests/", json=_rsvp("(11) 99999-0001"))
+    assert response.status_code == 429
+    assert "retry-after" in response.headers
+
+
+def test_uploads_get_503_when_slots_are_full(client, monkeypatch):
+    slots = ConcurrencyLimit(1)
+    assert slots.try_acquire()
+    monkeypatch.setattr(limits, "upload_slots", slots)
+
+    response = client.post("/photos/upload", files=[("files", ("a.png", b"x", "image/png"))])
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(limits.BUSY_RETRY_AFTER)
+
+
+def test_uploads_get_503_when_job_queue_is_full(client, monkeypatch):
+    monkeypatch.setattr(photo_jobs, "pending_count", lambda: limits.UPLOAD_MAX_PENDING_JOBS)
+    response = client.post("/photos/upload", files=[("files", ("a.png", b"x", "image/png"))])
+    assert response.status_code == 503
+
+
+def test_upload_slot_is_released_after_request(client, monkeypatch):
+    slots = ConcurrencyLimit(1)
+    monkeypatch.setattr(limits, "upload_slots", slots)
+    for _ in range(3):
+        # Arquivo inválido (400), mas o lugar precisa ser devolvido
+        response = client.post("/photos/upload", files=[("files", ("a.txt", b"x", "text/plain"))])
+        assert response.status_code == 400
+    assert slots.try_acquire()
+
+
+def test_reads_are_not_limited(client, monkeypatch):
+    monkeypatch.setattr(limits, "rsvp_ip_limiter", TokenBucketLimiter(per_minute=1, burst=1))
+    for _ in range(3):
+        client.post("/guests/", json=_rsvp())
+    assert all(client.get("/tables/view").status_code == 200 for _ in range(20))
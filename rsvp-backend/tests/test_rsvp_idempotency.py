@@ -0,0 +1,92 @@
+# tests/test_rsvp_idempotency.py
+import asyncio
+
+import httpx
+
+from app import models
+from app.database import async_engine
+from app.main import app
+from app.routers import guests as guests_router
+
+RSVP = {
+    "name": "maria silva",
+    "phone": "11999990001",
+    "rsvp_status": "YES",
+    "companions": [{"name": "joão"}, {"name": "ana"}],
+}
+
+
+def _post_concurrently(payload: dict, key: str, count: int):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*[
+                    client.post("/guests/", json=payload, headers={"Idempotency-Key": key})
+                    for _ in range(count)
+                ])
+        finally:
+            # As conexões assíncronas ficam presas a este event loop
+            await async_engine.dispose()
+
+    return asyncio.run(run())
+
+
+def _assert_single_guest(db, responses):
+    assert {r.status_code for r in responses} == {201}, [r.text for r in responses]
+    bodies = [r.json() for r in responses]
+    assert all(body == bodies[0] for body in bodies)
+    assert sum(1 for r in responses if r.headers.get("idempotent-replayed") != "true") == 1
+
+    assert db.query(models.Guest).count() == 1
+    assert db.query(models.Companion).count() == 2
+
+
+def test_parallel_submissions_with_same_key_create_one_guest(db):
+    responses = _post_concurrently(RSVP, "chave-1", 20)
+    _assert_single_guest(db, responses)
+
+
+def test_race_past_the_lookup_replays_the_winner(db, monkeypatch):
+    # Todas as requisições passam pela checagem inicial sem achar nada e
+    # colidem no INSERT: só o caminho IntegrityError -> replay pode salvar
+    original = guests_router._guest_by_idempotency_key
+    missed = set()
+
+    async def miss_first_lookup(session, key):
+        if id(session) not in missed:
+            missed.add(id(session))
+            return None
+        return await original(session, key)
+
+    monkeypatch.setattr(guests_router, "_guest_by_idempotency_key", miss_first_lookup)
+    responses = _post_concurrently(RSVP, "chave-2", 8)
+    _assert_single_guest(db, responses)
+
+
+def test_different_keys_create_different_guests(db):
+    _post_concurrently(RSVP, "chave-a", 1)
+    _post_concurrently(RSVP, "chave-b", 1)
+    assert db.query(models.Guest).count() == 2
+
+
+def test_same_key_with_different_body_is_rejected(db):
+    first = _post_concurrently(RSVP, "chave-c", 1)[0]
+    assert first.status_code == 201
+
+    changed = {**RSVP, "rsvp_status": "NO", "companions": []}
+    replay = _post_concurrently(changed, "chave-c", 1)[0]
+
+    assert replay.status_code == 422
+    assert "Idempotency-Key" in replay.json()["detail"]
+    guest = db.query(models.Guest).one()
+    assert guest.rsvp_status == "YES"
+
+
+def test_same_key_with_same_body_still_replays(db):
+    first = _post_concurrently(RSVP, "chave-d", 1)[0]
+    replay = _post_concurrently(dict(RSVP), "chave-d", 1)[0]
+
+    assert replay.status_code == 201
+    assert replay.headers["idempotent-replayed"] == "true"
+    assert replay.json() == first.json()
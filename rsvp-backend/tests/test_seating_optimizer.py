@@ -0,0 +1,123 @@
+# tests/test_seating_optimizer.py
+import random
+import time
+
+import pytest
+
+from app.seating_optimizer import SeatingError, optimize_seating
+from tests.conftest import ADMIN, seed_guests
+
+
+def _table_of(solution):
+    return {person: t for t, people in enumerate(solution.tables) for person in people}
+
+
+def _party_groups(num_people: int, seed: int = 1):
+    """Convidados com 0 a 3 acompanhantes, até somar `num_people` pessoas."""
+    rng = random.Random(seed)
+    groups, i = [], 0
+    while i < num_people:
+        size = min(rng.randint(1, 4), num_people - i)
+        groups.append([f"p{i + k}" for k in range(size)])
+        i += size
+    return groups
+
+
+def test_respects_groups_pairs_pins_and_capacity():
+    groups = [["g1", "c1", "c2"], ["g2", "c3"], ["g3"], ["g4"], ["g5", "c4"], ["g6"]]
+    solution = optimize_seating(
+        groups,
+        capacities=[4, 4, 4],
+        together=[("g3", "g4")],
+        apart=[("g1", "g2")],
+        pinned={"g6": 2},
+        time_budget=0.2,
+        seed=42,
+    )
+    table = _table_of(solution)
+
+    assert sorted(table) == sorted(p for g in groups for p in g)
+    for group in groups:
+        assert len({table[p] for p in group}) == 1
+    assert table["g3"] == table["g4"]
+    assert table["g1"] != table["g2"]
+    assert table["g6"] == 2
+    assert all(len(people) <= 4 for people in solution.tables)
+    assert solution.overflow == 0
+    assert solution.apart_violations == 0
+
+
+def test_reports_overflow_instead_of_dropping_people():
+    solution = optimize_seating([["a", "b"], ["c", "d"], ["e"]], capacities=[2, 2], time_budget=0.05, seed=1)
+    assert sum(len(people) for people in solution.tables) == 5
+    assert solution.overflow == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"groups": [["a", "b", "c"]], "capacities": [2]},
+        {"groups": [["a"], ["b"]], "capacities": [4], "together": [("a", "b")], "apart": [("a", "b")]},
+        {"groups": [["a"]], "capacities": [4], "pinned": {"a": 3}},
+        {"groups": [["a"]], "capacities": [4], "apart": [("a", "x")]},
+    ],
+)
+def test_impossible_constraints_raise(kwargs):
+    with pytest.raises(SeatingError):
+        optimize_seating(time_budget=0.05, **kwargs)
+
+
+def test_endpoint_keeps_companions_with_host(client, db):
+    guests = seed_guests(db, 6, companions_per_guest=2, seat=False)
+    response = client.post(
+        "/tables/optimize",
+        headers=ADMIN,
+        json={"num_tables": 3, "seats_per_table": 6, "time_budget_ms": 100, "seed": 7},
+    )
+    assert response.status_code == 200, response.text
+    body = response.json()
+    table = {person: t for t, people in body["tables"].items() for person in people}
+
+    for guest in guests:
+        host_table = table[f"guest_{guest.id}"]
+        assert all(table[f"companion_{c.id}"] == host_table for c in guest.companions)
+    assert body["overflow"] == 0
+
+
+def test_endpoint_rejects_group_larger_than_any_table(client, db):
+    seed_guests(db, 1, companions_per_guest=4, seat=False)
+    response = client.post(
+        "/tables/optimize", headers=ADMIN,
+        json={"num_tables": 2, "seats_per_table": 3, "time_budget_ms": 50},
+    )
+    assert response.status_code == 400
+
+
+# ==========================
+#  Benchmark (qualidade e tempo)
+# ==========================
+@pytest.mark.parametrize("num_people", [100, 500, 2000])
+def test_benchmark_quality_and_runtime(num_people):
+    groups = _party_groups(num_people)
+    # ~10% de folga nas mesas de 10
+    capacities = [10] * (num_people * 11 // 100 + 1)
+    rng = random.Random(num_people)
+    people = [p for g in groups for p in g]
+    hosts = [g[0] for g in groups]
+    apart = [tuple(rng.sample(hosts, 2)) for _ in range(num_people // 20)]
+    budget = 0.3
+
+    started = time.perf_counter()
+    solution = optimize_seating(groups, capacities, apart=apart, time_budget=budget, seed=3)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"\n{num_people} pessoas: custo={solution.cost:.1f} overflow={solution.overflow} "
+        f"separados_juntos={solution.apart_violations} iterações={solution.iterations} "
+        f"tempo={elapsed * 1000:.0f}ms"
+    )
+    assert sorted(_table_of(solution)) == sorted(people)
+    assert solution.overflow == 0
+    assert solution.apart_violations == 0
+    # Respeita o tempo limite (com folga para montar a solução inicial)
+    assert elapsed < budget + 1.0
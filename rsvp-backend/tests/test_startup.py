@@ -0,0 +1,62 @@
+# tests/test_startup.py
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app import main
+from app.cache import seating_cache
+from app.database import async_engine, engine, warm_up_pool
+from tests.conftest import count_queries, seed_guests
+
+
+def test_sqlite_pragmas_are_applied():
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+
+def test_warm_up_pool_opens_connections():
+    assert warm_up_pool() >= 1
+
+
+def test_warm_up_primes_public_caches(client, db, monkeypatch):
+    seed_guests(db, 40)
+    monkeypatch.setenv("STARTUP_WARMUP", "1")
+
+    async def warm_up():
+        try:
+            await main.warm_up()
+        finally:
+            # As conexões assíncronas ficam presas a este event loop
+            await async_engine.dispose()
+
+    started = time.perf_counter()
+    asyncio.run(warm_up())
+    warm_up_ms = (time.perf_counter() - started) * 1000
+
+    # Primeiras requisições depois do aquecimento: nenhuma consulta ao banco
+    with count_queries() as counter:
+        for path in ("/tables/view", "/tables/people/public", "/tables/seating"):
+            assert client.get(path).status_code == 200
+    assert counter.count == 0, counter.statements
+
+    # Comparação com um início a frio (cache vazio)
+    seating_cache.invalidate()
+    started = time.perf_counter()
+    with count_queries() as cold:
+        client.get("/tables/seating")
+    cold_ms = (time.perf_counter() - started) * 1000
+    print(f"\naquecimento={warm_up_ms:.0f}ms, primeira /tables/seating a frio={cold_ms:.1f}ms ({cold.count} consultas)")
+    assert cold.count > 0
+
+
+def test_warm_up_can_be_disabled(client, monkeypatch):
+    monkeypatch.setenv("STARTUP_WARMUP", "0")
+    asyncio.run(main.warm_up())
+
+    # Nada foi pré-carregado: a primeira requisição vai ao banco
+    with count_queries() as counter:
+        client.get("/tables/seating")
+    assert counter.count > 0
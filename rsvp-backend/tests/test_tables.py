@@ -0,0 +1,167 @@
+# tests/test_tables.py
+from tests.conftest import ADMIN, seed_guests
+
+
+def _etag(client) -> str:
+    response = client.get("/tables/arrangements", headers=ADMIN)
+    assert response.status_code == 200
+    return response.headers["etag"]
+
+
+def _version(etag: str) -> int:
+    return int(etag.strip('"'))
+
+
+# ==========================
+#  POST /tables/arrangements (salvar tudo, com If-Match)
+# ==========================
+def test_save_bumps_version_and_returns_new_etag(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=1, seat=False)[0]
+    etag = _etag(client)
+
+    response = client.post(
+        "/tables/arrangements",
+        json={"1": [f"guest_{guest.id}", f"companion_{guest.companions[0].id}"]},
+        headers={**ADMIN, "If-Match": etag},
+    )
+
+    assert response.status_code == 201
+    assert response.json()["version"] == _version(etag) + 1
+    assert response.headers["etag"] == f'"{_version(etag) + 1}"'
+    assert client.get("/tables/arrangements", headers=ADMIN).json() == {
+        "1": [f"guest_{guest.id}", f"companion_{guest.companions[0].id}"],
+    }
+
+
+def test_save_with_stale_if_match_is_rejected(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    stale = _etag(client)
+    assert client.post(
+        "/tables/arrangements", json={"1": [f"guest_{guest.id}"]},
+        headers={**ADMIN, "If-Match": stale},
+    ).status_code == 201
+
+    response = client.post(
+        "/tables/arrangements", json={"2": [f"guest_{guest.id}"]},
+        headers={**ADMIN, "If-Match": stale},
+    )
+
+    assert response.status_code == 412
+    assert client.get("/tables/arrangements", headers=ADMIN).json() == {"1": [f"guest_{guest.id}"]}
+
+
+def test_save_without_if_match_skips_the_check(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    before = _version(_etag(client))
+
+    response = client.post("/tables/arrangements", json={"3": [f"guest_{guest.id}"]}, headers=ADMIN)
+
+    assert response.status_code == 201
+    assert response.json()["version"] == before + 1
+
+
+def test_save_with_malformed_if_match_is_400(client, db):
+    response = client.post(
+        "/tables/arrangements", json={}, headers={**ADMIN, "If-Match": '"abc"'},
+    )
+    assert response.status_code == 400
+
+
+def test_save_with_deleted_person_is_409_and_keeps_version(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    etag = _etag(client)
+
+    response = client.post(
+        "/tables/arrangements",
+        json={"1": [f"guest_{guest.id}", "guest_999999"]},
+        headers={**ADMIN, "If-Match": etag},
+    )
+
+    assert response.status_code == 409
+    assert "guest_999999" in response.json()["detail"]
+    assert _etag(client) == etag
+    assert client.get("/tables/arrangements", headers=ADMIN).json() == {}
+
+
+# ==========================
+#  PATCH /tables/arrangements (operações incrementais)
+# ==========================
+def _patch(client, *operations, if_match=None):
+    headers = {**ADMIN, "If-Match": if_match} if if_match else ADMIN
+    return client.patch("/tables/arrangements", json={"operations": list(operations)}, headers=headers)
+
+
+def _tables(client) -> dict:
+    return client.get("/tables/arrangements", headers=ADMIN).json()
+
+
+def test_patch_move_seats_person_and_frees_the_target_seat(client, db):
+    first, second = seed_guests(db, 2, companions_per_guest=0, seat=False)
+    a, b = f"guest_{first.id}", f"guest_{second.id}"
+
+    assert _patch(client, {"op": "move", "person_id": a, "table_number": 2}).status_code == 200
+    assert _patch(client, {"op": "move", "person_id": b, "table_number": 2}).status_code == 200
+    assert _tables(client) == {"2": [a, b]}
+
+    # Mover para um lugar ocupado tira quem estava lá
+    response = _patch(client, {"op": "move", "person_id": b, "table_number": 2, "seat": 0})
+    assert response.status_code == 200
+    assert _tables(client) == {"2": [b]}
+
+
+def test_patch_swap_remove_and_clear_table(client, db):
+    guests = seed_guests(db, 3, companions_per_guest=0, seat=False)
+    a, b, c = (f"guest_{g.id}" for g in guests)
+    _patch(
+        client,
+        {"op": "move", "person_id": a, "table_number": 1, "seat": 0},
+        {"op": "move", "person_id": b, "table_number": 2, "seat": 0},
+        {"op": "move", "person_id": c, "table_number": 2, "seat": 1},
+    )
+
+    assert _patch(client, {"op": "swap", "person_id": a, "other_person_id": b}).status_code == 200
+    assert _tables(client) == {"1": [b], "2": [a, c]}
+
+    assert _patch(client, {"op": "remove", "person_id": c}).status_code == 200
+    assert _tables(client) == {"1": [b], "2": [a]}
+
+    response = _patch(client, {"op": "clear_table", "table_number": 1})
+    assert response.json()["applied"] == 1
+    assert _tables(client) == {"2": [a]}
+
+
+def test_patch_is_all_or_nothing(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    etag = _etag(client)
+
+    response = _patch(
+        client,
+        {"op": "move", "person_id": f"guest_{guest.id}", "table_number": 1},
+        {"op": "swap", "person_id": f"guest_{guest.id}", "other_person_id": "guest_999999"},
+    )
+
+    assert response.status_code == 404
+    assert _tables(client) == {}
+    assert _etag(client) == etag
+
+
+def test_patch_with_stale_if_match_is_rejected(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    stale = _etag(client)
+    move = {"op": "move", "person_id": f"guest_{guest.id}", "table_number": 1}
+    first = _patch(client, move, if_match=stale)
+    assert first.status_code == 200
+    assert first.headers["etag"] == f'"{_version(stale) + 1}"'
+
+    assert _patch(client, {**move, "table_number": 2}, if_match=stale).status_code == 412
+    assert _tables(client) == {"1": [f"guest_{guest.id}"]}
+
+
+def test_patch_rejects_negative_seat_and_table(client, db):
+    guest = seed_guests(db, 1, companions_per_guest=0, seat=False)[0]
+    person = f"guest_{guest.id}"
+
+    assert _patch(client, {"op": "move", "person_id": person, "table_number": 1, "seat": -5}).status_code == 422
+    assert _patch(client, {"op": "move", "person_id": person, "table_number": 0}).status_code == 422
+    assert _patch(client, {"op": "clear_table", "table_number": -1}).status_code == 422
+    assert client.delete("/tables/arrangements/0", headers=ADMIN).status_code == 422
@@ -8,6 +8,9 @@ const els = {
   btnRefresh: document.getElementById("btn-refresh"),
   btnExportDocx: document.getElementById("btn-export-docx"),
   btnExportPdf: document.getElementById("btn-export-pdf"),
+  btnExportXlsx: document.getElementById("btn-export-xlsx"),
+  btnExportCsv: document.getElementById("btn-export-csv"),
+  exportByTable: document.getElementById("export-by-table"),
   btnLogout: document.getElementById("btn-logout"),
 
   search: document.getElementById("search"),
@@ -32,6 +35,16 @@ const els = {
 
 let allGuests = [];
 
+// Cópia local da lista completa (checklist), atualizada por versão
+const guestsById = new Map();
+let guestsVersion = 0;
+
+// Painel: uma página por status, buscada no servidor já filtrada
+const PAGE_SIZE = 50;
+const STATUSES = ["YES", "NO", "MAYBE"];
+let guestPages = {};
+let searchTimer = null;
+
 function setStatus(msg, kind = "info") {
   if (!els.status) return;
   els.status.textContent = msg || "";
@@ -109,31 +122,13 @@ function authedHeaders(extra = {}) {
 }
 
 /* ===== Filters ===== */
-function getCompanionsText(g) {
-  const comps = Array.isArray(g.companions) ? g.companions : [];
-  return comps.map(c => c?.name).filter(Boolean).join(", ");
-}
-
-function matchesFilters(g) {
-  const q = normalize(els.search?.value || "");
-  const hideEmptyNotes = !!els.hideEmptyNotes?.checked;
-  const hideNoComp = !!els.hideNoCompanions?.checked;
-
-  const note = (g.note || "").trim();
-  const compsTxt = getCompanionsText(g);
-
-  if (hideEmptyNotes && !note) return false;
-  if (hideNoComp && (!g.companions || g.companions.length === 0)) return false;
-
-  if (!q) return true;
-
-  const hay =
-    normalize(g.name) + " " +
-    normalize(g.phone) + " " +
-    normalize(note) + " " +
-    normalize(compsTxt);
-
-  return hay.includes(q);
+function filterParams() {
+  const params = new URLSearchParams();
+  const q = (els.search?.value || "").trim();
+  if (q) params.set("q", q);
+  if (els.hideEmptyNotes?.checked) params.set("with_note", "true");
+  if (els.hideNoCompanions?.checked) params.set("with_companions", "true");
+  return params;
 }
 
 /* ===== Render ===== */
@@ -172,39 +167,31 @@ function renderRow(g) {
   `;
 }
 
-function renderTable(tbody, guests) {
-  tbody.innerHTML = guests.map(renderRow).join("");
-}
+function renderTable(tbody, status) {
+  const page = guestPages[status];
+  let html = page.items.map(renderRow).join("");
 
-function groupGuests(guests) {
-  const groups = { YES: [], NO: [], MAYBE: [] };
-  for (const g of guests) {
-    const s = (g.rsvp_status || "").toUpperCase();
-    if (s === "YES") groups.YES.push(g);
-    else if (s === "NO") groups.NO.push(g);
-    else groups.MAYBE.push(g);
+  if (page.nextCursor) {
+    html += `
+      <tr class="load-more-row">
+        <td colspan="5">
+          <button class="btn-secondary" type="button" data-load-more="${status}">
+            Carregar mais (${page.items.length} de ${page.total})
+          </button>
+        </td>
+      </tr>
+    `;
   }
-
-  const sorter = (a, b) => new Date(b.responded_at) - new Date(a.responded_at);
-  groups.YES.sort(sorter);
-  groups.NO.sort(sorter);
-  groups.MAYBE.sort(sorter);
-
-  return groups;
+  tbody.innerHTML = html;
 }
 
-function renderSummary(groups) {
-  const yes = groups.YES.length;
-  const no = groups.NO.length;
-  const maybe = groups.MAYBE.length;
-  const total = yes + no + maybe;
-
-  const companionsYes = groups.YES.reduce((acc, g) => acc + ((g.companions || []).length), 0);
-  const peopleYes = yes + companionsYes;
+function tbodyFor(status) {
+  return status === "YES" ? els.tbodyYes : status === "NO" ? els.tbodyNo : els.tbodyMaybe;
+}
 
-  const last = [...allGuests]
-    .filter(g => g.responded_at)
-    .sort((a,b) => new Date(b.responded_at) - new Date(a.responded_at))[0];
+function renderSummary(summary) {
+  const counts = summary.counts || {};
+  const last = summary.last_response;
 
   const lastName = last ? last.name : "—";
   const lastDate = last ? formatDate(last.responded_at) : "";
@@ -213,12 +200,17 @@ function renderSummary(groups) {
     <div class="summary-grid">
       <div class="summary-card">
         <div class="summary-label">Respostas</div>
-        <div class="summary-value">${total}</div>
+        <div class="summary-value">${summary.total_responses}</div>
       </div>
 
       <div class="summary-card">
         <div class="summary-label">Presentes (YES + acomp.)</div>
-        <div class="summary-value">${peopleYes}</div>
+        <div class="summary-value">${summary.people_yes}</div>
+      </div>
+
+      <div class="summary-card">
+        <div class="summary-label">Com mesa / sem mesa</div>
+        <div class="summary-value">${summary.seated} / ${summary.unseated}</div>
       </div>
 
       <div class="summary-card">
@@ -229,28 +221,19 @@ function renderSummary(groups) {
     </div>
   `;
 
-  els.countYes.textContent = String(yes);
-  els.countNo.textContent = String(no);
-  els.countMaybe.textContent = String(maybe);
+  els.countYes.textContent = String(counts.YES || 0);
+  els.countNo.textContent = String(counts.NO || 0);
+  els.countMaybe.textContent = String(counts.MAYBE || 0);
 }
 
-function applyAndRender() {
-  const filtered = allGuests.filter(matchesFilters);
-  const groups = groupGuests(filtered);
-
-  renderSummary(groupGuests(allGuests));
-  renderTable(els.tbodyYes, groups.YES);
-  renderTable(els.tbodyNo, groups.NO);
-  renderTable(els.tbodyMaybe, groups.MAYBE);
-
-  setStatus(`Carregado: ${allGuests.length} respostas. Mostrando: ${filtered.length}.`, "success");
+function renderStatusLine(summary) {
+  const showing = STATUSES.reduce((acc, s) => acc + (guestPages[s]?.total || 0), 0);
+  setStatus(`Carregado: ${summary.total_responses} respostas. Mostrando: ${showing}.`, "success");
 }
 
 /* ===== Data ===== */
-async function loadGuests() {
-  setStatus("Carregando...", "info");
-
-  const res = await fetch(`${API_BASE_URL}/guests/`, {
+async function fetchAdminJson(path) {
+  const res = await fetch(`${API_BASE_URL}${path}`, {
     headers: authedHeaders(),
   });
 
@@ -262,12 +245,14 @@ async function loadGuests() {
 
   if (!res.ok) {
     const txt = await res.text().catch(() => "");
-    throw new Error(`Erro ao buscar /guests (HTTP ${res.status}). ${txt}`);
+    throw new Error(`Erro ao buscar ${path.split("?")[0]} (HTTP ${res.status}). ${txt}`);
   }
 
-  const data = await res.json();
+  return res.json();
+}
 
-  allGuests = (Array.isArray(data) ? data : []).map(g => ({
+function normalizeGuest(g) {
+  return {
     id: g.id,
     name: g.name || "",
     phone: g.phone || "",
@@ -275,13 +260,80 @@ async function loadGuests() {
     responded_at: g.responded_at || null,
     note: g.note || "",
     companions: Array.isArray(g.companions) ? g.companions : [],
-  }));
+  };
+}
+
+// Lista completa: usada só pelo checklist de presença.
+// Só baixa o que mudou desde a última versão recebida.
+async function loadGuests() {
+  const changes = await fetchAdminJson(`/guests/?updated_since=${guestsVersion}`);
+
+  for (const g of changes.items || []) guestsById.set(g.id, normalizeGuest(g));
+  for (const id of changes.deleted || []) guestsById.delete(id);
+  guestsVersion = changes.version ?? guestsVersion;
+
+  allGuests = [...guestsById.values()];
+}
+
+async function loadSummary() {
+  return fetchAdminJson("/guests/summary");
+}
+
+async function loadGuestPage(status, cursor = null) {
+  const params = filterParams();
+  params.set("status", status);
+  params.set("limit", String(PAGE_SIZE));
+  if (cursor) params.set("cursor", cursor);
+
+  const page = await fetchAdminJson(`/guests/page?${params}`);
+  return {
+    items: (page.items || []).map(normalizeGuest),
+    total: page.total || 0,
+    nextCursor: page.next_cursor || null,
+  };
+}
+
+// Recarrega só as listas (busca e filtros mudaram)
+async function reloadGuestLists() {
+  const pages = await Promise.all(STATUSES.map(s => loadGuestPage(s)));
+  STATUSES.forEach((s, i) => {
+    guestPages[s] = pages[i];
+    renderTable(tbodyFor(s), s);
+  });
+}
+
+async function loadMore(status) {
+  const current = guestPages[status];
+  if (!current?.nextCursor) return;
+
+  const next = await loadGuestPage(status, current.nextCursor);
+  guestPages[status] = {
+    items: current.items.concat(next.items),
+    total: next.total,
+    nextCursor: next.nextCursor,
+  };
+  renderTable(tbodyFor(status), status);
 }
 
 async function init() {
   try {
-    await loadGuests();
-    applyAndRender();
+    setStatus("Carregando...", "info");
+    const [summary] = await Promise.all([loadSummary(), reloadGuestLists()]);
+    renderSummary(summary);
+    renderStatusLine(summary);
+    startLiveFeed();
+  } catch (err) {
+    console.error(err);
+    if (String(err.message || "").includes("Não autorizado")) return;
+    setStatus(err.message || "Erro desconhecido.", "error");
+  }
+}
+
+async function applyFilters() {
+  try {
+    await reloadGuestLists();
+    const showing = STATUSES.reduce((acc, s) => acc + guestPages[s].total, 0);
+    setStatus(`Mostrando: ${showing}.`, "success");
   } catch (err) {
     console.error(err);
     if (String(err.message || "").includes("Não autorizado")) return;
@@ -302,8 +354,9 @@ function downloadBlob(filename, blob) {
 }
 
 async function exportConfirmed(kind) {
-  const ext = kind === "pdf" ? "pdf" : "docx";
-  const url = `${API_BASE_URL}/guests/export/confirmed.${ext}`;
+  const ext = ["pdf", "xlsx", "csv"].includes(kind) ? kind : "docx";
+  const byTable = els.exportByTable?.checked ? "true" : "false";
+  const url = `${API_BASE_URL}/guests/export/confirmed.${ext}?group_by_table=${byTable}`;
 
   setStatus("Gerando exportação...", "info");
 
@@ -329,13 +382,34 @@ async function exportConfirmed(kind) {
 
 /* ===== Events ===== */
 els.btnRefresh?.addEventListener("click", init);
-els.search?.addEventListener("input", () => applyAndRender());
-els.hideEmptyNotes?.addEventListener("change", () => applyAndRender());
-els.hideNoCompanions?.addEventListener("change", () => applyAndRender());
+els.search?.addEventListener("input", () => {
+  // Espera a pessoa parar de digitar antes de buscar no servidor
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(applyFilters, 300);
+});
+els.hideEmptyNotes?.addEventListener("change", applyFilters);
+els.hideNoCompanions?.addEventListener("change", applyFilters);
+[els.tbodyYes, els.tbodyNo, els.tbodyMaybe].forEach(tbody => {
+  tbody?.addEventListener("click", async (e) => {
+    const btn = e.target.closest("[data-load-more]");
+    if (!btn) return;
+    btn.disabled = true;
+    try {
+      await loadMore(btn.dataset.loadMore);
+    } catch (err) {
+      console.error(err);
+      btn.disabled = false;
+      setStatus(err.message || "Erro ao carregar mais.", "error");
+    }
+  });
+});
 els.btnExportDocx?.addEventListener("click", () => exportConfirmed("docx"));
 els.btnExportPdf?.addEventListener("click", () => exportConfirmed("pdf"));
+els.btnExportXlsx?.addEventListener("click", () => exportConfirmed("xlsx"));
+els.btnExportCsv?.addEventListener("click", () => exportConfirmed("csv"));
 
 els.btnLogout?.addEventListener("click", () => {
+  stopLiveFeed();
   clearToken();
   openLogin("Você saiu.");
 });
@@ -358,6 +432,109 @@ els.loginForm?.addEventListener("submit", async (e) => {
   }
 });
 
+/* ===== Feed ao vivo (SSE) ===== */
+// fetch em vez de EventSource: EventSource não envia o header X-Admin-Token
+const LIVE_RETRY_MS = 5000;
+let liveFeedAbort = null;
+let liveRefreshTimer = null;
+let pendingLive = { guests: false, photos: false };
+
+function parseSseBlock(block) {
+  const evt = { id: null, type: "message", data: "" };
+  for (const line of block.split("\n")) {
+    if (line.startsWith(":")) continue; // comentário (ping)
+    const idx = line.indexOf(":");
+    const field = idx >= 0 ? line.slice(0, idx) : line;
+    const value = idx >= 0 ? line.slice(idx + 1).replace(/^ /, "") : "";
+    if (field === "id") evt.id = value;
+    else if (field === "event") evt.type = value;
+    else if (field === "data") evt.data += value;
+  }
+  return evt;
+}
+
+// Vários eventos seguidos viram uma única atualização
+function scheduleLiveRefresh() {
+  clearTimeout(liveRefreshTimer);
+  liveRefreshTimer = setTimeout(async () => {
+    const what = pendingLive;
+    pendingLive = { guests: false, photos: false };
+    try {
+      if (what.guests) {
+        const summary = await loadSummary();
+        renderSummary(summary);
+        await reloadGuestLists();
+        renderStatusLine(summary);
+      }
+      if (what.photos && currentTab === "photos") {
+        await loadPhotos();
+      }
+    } catch (err) {
+      console.error(err);
+    }
+  }, 1000);
+}
+
+function handleLiveEvent(type, data) {
+  if (type.startsWith("guest.")) pendingLive.guests = true;
+  else if (type.startsWith("photo.")) pendingLive.photos = true;
+  else if (type === "resync") pendingLive = { guests: true, photos: true };
+  else if (type === "seating.updated") return handleSeatingEvent(data);
+  else return;
+
+  if (type === "guest.created") {
+    try {
+      const g = JSON.parse(data);
+      setStatus(`Nova resposta: ${g.name}`, "success");
+    } catch { /* ignore */ }
+  }
+  scheduleLiveRefresh();
+}
+
+async function startLiveFeed() {
+  if (liveFeedAbort) return;
+  liveFeedAbort = new AbortController();
+  const { signal } = liveFeedAbort;
+  let lastEventId = null;
+
+  while (getToken() && !signal.aborted) {
+    try {
+      const headers = authedHeaders({ Accept: "text/event-stream" });
+      if (lastEventId) headers["Last-Event-ID"] = lastEventId;
+
+      const res = await fetch(`${API_BASE_URL}/events/`, { headers, signal });
+      if (res.status === 401) break;
+      if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+      const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value.replace(/\r\n?/g, "\n");
+
+        let sep;
+        while ((sep = buffer.indexOf("\n\n")) >= 0) {
+          const evt = parseSseBlock(buffer.slice(0, sep));
+          buffer = buffer.slice(sep + 2);
+          if (evt.id) lastEventId = evt.id;
+          if (evt.type !== "message") handleLiveEvent(evt.type, evt.data);
+        }
+      }
+    } catch (err) {
+      if (signal.aborted) break;
+      console.warn("Feed ao vivo desconectado:", err);
+    }
+    await new Promise(resolve => setTimeout(resolve, LIVE_RETRY_MS));
+  }
+  liveFeedAbort = null;
+}
+
+function stopLiveFeed() {
+  liveFeedAbort?.abort();
+  liveFeedAbort = null;
+}
+
 /* ===== Boot ===== */
 if (!getToken()) {
   openLogin();
@@ -502,11 +679,21 @@ async function loadPhotos() {
     photosEmpty?.classList.add('hidden');
     photosGallery.innerHTML = '';
     
-    const response = await fetch(`${API_BASE_URL}/photos/`);
-    
-    if (!response.ok) throw new Error('Erro ao carregar fotos');
-    
-    allPhotos = await response.json();
+    // O admin precisa da lista completa (busca e contagem): percorre todas as páginas
+    allPhotos = [];
+    let cursor = null;
+    do {
+      const params = new URLSearchParams({ limit: 200 });
+      if (cursor) params.set('cursor', cursor);
+      
+      const response = await fetch(`${API_BASE_URL}/photos/?${params}`);
+      
+      if (!response.ok) throw new Error('Erro ao carregar fotos');
+      
+      const page = await response.json();
+      allPhotos = allPhotos.concat(page.items);
+      cursor = page.next_cursor;
+    } while (cursor);
     
     // Atualizar contador
     if (photosTotalCount) {
@@ -544,7 +731,7 @@ function renderPhotosGallery(photos) {
     return `
       <div class="photo-admin-item" data-photo-id="${photo.id}">
         <img 
-          src="${escapeHtml(photo.photo_url)}" 
+          src="${escapeHtml(photo.thumbnail_url || photo.photo_url)}" 
           alt="Foto" 
           class="photo-admin-img"
           loading="lazy"
@@ -709,71 +896,26 @@ if (btnDownloadPhotos) {
       btnDownloadPhotos.textContent = 'Preparando download...';
       setStatus('Baixando fotos...', 'info');
       
-      const zip = new JSZip();
-      const folder = zip.folder('fotos-festa-duda');
-      
-      // Baixar todas as fotos
-      let downloadedCount = 0;
+      // O servidor monta o ZIP em streaming a partir do armazenamento
+      const response = await fetch(`${API_BASE_URL}/photos/export.zip`, {
+        headers: { 'X-Admin-Token': getToken() }
+      });
       
-      for (const photo of allPhotos) {
-        try {
-          btnDownloadPhotos.textContent = `Baixando ${downloadedCount + 1}/${allPhotos.length}...`;
-          
-          // Fetch da imagem
-          const response = await fetch(photo.photo_url);
-          const blob = await response.blob();
-          
-          // Nome do arquivo
-          const date = new Date(photo.uploaded_at);
-          const dateStr = date.toISOString().split('T')[0]; // YYYY-MM-DD
-          const timeStr = date.toTimeString().split(' ')[0].replace(/:/g, '-'); // HH-MM-SS
-          
-          // Extensão da imagem
-          const extension = photo.photo_url.split('.').pop().split('?')[0] || 'jpg';
-          
-          // Nome: data_hora_nome.ext ou data_hora.ext
-          let filename;
-          if (photo.sender_name) {
-            const safeName = photo.sender_name.replace(/[^a-zA-Z0-9]/g, '_');
-            filename = `${dateStr}_${timeStr}_${safeName}.${extension}`;
-          } else {
-            filename = `${dateStr}_${timeStr}.${extension}`;
-          }
-          
-          // Adicionar ao ZIP
-          folder.file(filename, blob);
-          downloadedCount++;
-          
-        } catch (error) {
-          console.error(`Erro ao baixar foto ${photo.id}:`, error);
-        }
+      if (response.status === 401) {
+        clearToken();
+        openLogin('PIN inválido.');
+        throw new Error('Não autorizado.');
       }
       
-      if (downloadedCount === 0) {
-        throw new Error('Nenhuma foto foi baixada com sucesso');
+      if (!response.ok) {
+        const t = await response.text().catch(() => '');
+        throw new Error(`HTTP ${response.status}. ${t}`);
       }
       
-      // Gerar ZIP
-      setStatus('Gerando arquivo ZIP...', 'info');
-      btnDownloadPhotos.textContent = 'Gerando ZIP...';
-      
-      const zipBlob = await zip.generateAsync({ 
-        type: 'blob',
-        compression: 'DEFLATE',
-        compressionOptions: { level: 6 }
-      });
-      
-      // Download do ZIP
-      const url = URL.createObjectURL(zipBlob);
-      const a = document.createElement('a');
-      a.href = url;
-      a.download = `fotos-festa-duda-${new Date().toISOString().split('T')[0]}.zip`;
-      document.body.appendChild(a);
-      a.click();
-      document.body.removeChild(a);
-      URL.revokeObjectURL(url);
+      const zipBlob = await response.blob();
+      downloadBlob(`fotos-festa-duda-${new Date().toISOString().split('T')[0]}.zip`, zipBlob);
       
-      setStatus(`${downloadedCount} fotos baixadas com sucesso!`, 'success');
+      setStatus(`${allPhotos.length} fotos baixadas com sucesso!`, 'success');
       
       setTimeout(() => {
         setStatus('');
@@ -797,6 +939,7 @@ if (btnDownloadPhotos) {
 let allPeople = [];
 let tablesData = {};
 let tablesSeats = {}; // Armazena número de lugares por mesa
+let tablesVersion = null; // Versão salva no servidor (ETag), enviada em If-Match
 let assignedPeople = new Set();
 
 // Elementos
@@ -806,6 +949,7 @@ const numTablesInput = document.getElementById('num-tables');
 const btnGenerateTables = document.getElementById('btn-generate-tables');
 const btnSaveTables = document.getElementById('btn-save-tables');
 const btnClearTables = document.getElementById('btn-clear-tables');
+const btnTableCards = document.getElementById('btn-table-cards');
 
 // Carregar pessoas disponíveis
 async function loadPeople() {
@@ -855,6 +999,7 @@ async function loadTablesArrangement() {
     
     if (!response.ok) throw new Error('Erro ao carregar arranjo de mesas');
     
+    tablesVersion = response.headers.get('ETag');
     const savedTables = await response.json();
     
     // Se tem mesas salvas, gerar interface com elas
@@ -1077,6 +1222,13 @@ function handleSeatChange(e) {
   
   // Re-renderizar
   renderTables();
+  
+  // Autosave: só a alteração deste lugar
+  if (personId) {
+    sendSeatingOps([{ op: 'move', person_id: personId, table_number: Number(tableNum), seat: seatIndex }]);
+  } else if (oldPersonId) {
+    sendSeatingOps([{ op: 'remove', person_id: oldPersonId }]);
+  }
 }
 
 // Remover pessoa de um assento
@@ -1092,6 +1244,123 @@ function handleRemovePerson(e) {
   
   tablesData[tableNum][seatIndex] = null;
   renderTables();
+  
+  if (personId) {
+    sendSeatingOps([{ op: 'remove', person_id: personId }]);
+  }
+}
+
+// Alterações pontuais ainda não enviadas e o envio em andamento.
+// Um PATCH por vez: cada um leva no If-Match a versão devolvida pelo anterior
+// (dois envios simultâneos com a mesma versão dariam 412 no segundo).
+let pendingSeatingOps = [];
+let seatingSaveInFlight = null;
+
+// Envia alterações pontuais (move/remove/swap/clear_table) para o servidor
+function sendSeatingOps(operations) {
+  pendingSeatingOps.push(...operations);
+  if (!seatingSaveInFlight) {
+    seatingSaveInFlight = flushSeatingOps().finally(() => {
+      seatingSaveInFlight = null;
+    });
+  }
+  return seatingSaveInFlight;
+}
+
+// Espera os autosaves pendentes (antes de salvar/limpar tudo)
+async function waitForSeatingSaves() {
+  while (seatingSaveInFlight) {
+    await seatingSaveInFlight;
+  }
+}
+
+// Envia o que acumulou enquanto o PATCH anterior estava em andamento, em lote
+async function flushSeatingOps() {
+  while (pendingSeatingOps.length > 0) {
+    const operations = pendingSeatingOps;
+    pendingSeatingOps = [];
+
+    const saved = await patchSeatingOps(operations);
+    if (!saved) {
+      // As próximas alterações partiam de um estado que não vale mais
+      pendingSeatingOps = [];
+      return;
+    }
+  }
+}
+
+async function patchSeatingOps(operations) {
+  try {
+    const response = await fetch(`${API_BASE_URL}/tables/arrangements`, {
+      method: 'PATCH',
+      headers: {
+        ...authedHeaders(),
+        'Content-Type': 'application/json',
+        ...(tablesVersion ? { 'If-Match': tablesVersion } : {})
+      },
+      body: JSON.stringify({ operations })
+    });
+    
+    if (response.status === 401) {
+      clearToken();
+      openLogin("PIN inválido.");
+      return false;
+    }
+    
+    if (response.status === 412) {
+      await reloadTablesAfterConflict('As mesas foram alteradas por outra pessoa. Carregamos a versão atual; refaça sua última alteração.');
+      return false;
+    }
+    
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    
+    tablesVersion = response.headers.get('ETag') || tablesVersion;
+    setStatus('Alteração salva', 'success');
+    setTimeout(() => setStatus(''), 1500);
+    return true;
+    
+  } catch (error) {
+    console.error('Erro ao salvar alteração da mesa:', error);
+    setStatus('Erro ao salvar alteração. Use "Salvar mesas" para tentar de novo.', 'error');
+    return false;
+  }
+}
+
+// 412: alguém salvou antes. Recarrega as mesas (e a versão) do servidor
+// Outro admin salvou as mesas: recarrega, a menos que a gente esteja salvando
+async function handleSeatingEvent(data) {
+  let version;
+  try {
+    version = `"${JSON.parse(data).version}"`;
+  } catch {
+    return;
+  }
+  if (tablesVersion === null || version === tablesVersion) return;
+  if (seatingSaveInFlight || pendingSeatingOps.length > 0) return;
+  try {
+    await reloadTablesFromServer();
+  } catch (err) {
+    console.error(err);
+  }
+}
+
+async function reloadTablesAfterConflict(message) {
+  await reloadTablesFromServer();
+  setStatus(message, 'error');
+}
+
+async function reloadTablesFromServer() {
+  const previousData = tablesData;
+  const previousVersion = tablesVersion;
+  await loadTablesArrangement();
+  
+  // Servidor sem ninguém sentado: mantém as mesas, vazias
+  if (tablesData === previousData && tablesVersion !== previousVersion) {
+    for (const tableNum in tablesData) {
+      tablesData[tableNum] = [];
+    }
+  }
+  renderTables();
 }
 
 // Salvar mesas
@@ -1100,12 +1369,14 @@ if (btnSaveTables) {
     try {
       btnSaveTables.disabled = true;
       btnSaveTables.textContent = 'Salvando...';
+      await waitForSeatingSaves();
       
       const response = await fetch(`${API_BASE_URL}/tables/arrangements`, {
         method: 'POST',
         headers: {
           ...authedHeaders(),
-          'Content-Type': 'application/json'
+          'Content-Type': 'application/json',
+          ...(tablesVersion ? { 'If-Match': tablesVersion } : {})
         },
         body: JSON.stringify(tablesData)
       });
@@ -1116,8 +1387,14 @@ if (btnSaveTables) {
         throw new Error("Não autorizado");
       }
       
+      if (response.status === 412) {
+        await reloadTablesAfterConflict('As mesas foram alteradas por outra pessoa. Carregamos a versão atual; confira antes de salvar.');
+        return;
+      }
+      
       if (!response.ok) throw new Error('Erro ao salvar mesas');
       
+      tablesVersion = response.headers.get('ETag') || tablesVersion;
       setStatus('Mesas salvas com sucesso!', 'success');
       
       setTimeout(() => setStatus(''), 2000);
@@ -1133,6 +1410,40 @@ if (btnSaveTables) {
 }
 
 // Limpar todas as mesas
+// Cartões para imprimir: uma página por mesa (gerado pelo servidor)
+if (btnTableCards) {
+  btnTableCards.addEventListener('click', async () => {
+    try {
+      btnTableCards.disabled = true;
+      setStatus('Gerando cartões das mesas...', 'info');
+
+      const response = await fetch(`${API_BASE_URL}/tables/export/cards.pdf`, {
+        headers: authedHeaders()
+      });
+
+      if (response.status === 401) {
+        clearToken();
+        openLogin('PIN inválido.');
+        throw new Error('Não autorizado.');
+      }
+
+      if (!response.ok) {
+        const t = await response.text().catch(() => '');
+        throw new Error(`HTTP ${response.status}. ${t}`);
+      }
+
+      const blob = await response.blob();
+      downloadBlob(`cartoes-mesas-${new Date().toISOString().split('T')[0]}.pdf`, blob);
+      setStatus('Cartões gerados ✅', 'ok');
+    } catch (error) {
+      console.error('Erro ao gerar cartões:', error);
+      setStatus(`Erro ao gerar cartões: ${error.message}`, 'error');
+    } finally {
+      btnTableCards.disabled = false;
+    }
+  });
+}
+
 if (btnClearTables) {
   btnClearTables.addEventListener('click', async () => {
     if (!confirm('Tem certeza que deseja limpar TODA a organização de mesas? Esta ação não pode ser desfeita.')) {
@@ -1141,10 +1452,14 @@ if (btnClearTables) {
     
     try {
       btnClearTables.disabled = true;
+      await waitForSeatingSaves();
       
       const response = await fetch(`${API_BASE_URL}/tables/arrangements`, {
         method: 'DELETE',
-        headers: authedHeaders()
+        headers: {
+          ...authedHeaders(),
+          ...(tablesVersion ? { 'If-Match': tablesVersion } : {})
+        }
       });
       
       if (response.status === 401) {
@@ -1153,8 +1468,15 @@ if (btnClearTables) {
         throw new Error("Não autorizado");
       }
       
+      if (response.status === 412) {
+        await reloadTablesAfterConflict('As mesas foram alteradas por outra pessoa. Carregamos a versão atual; confira antes de limpar.');
+        return;
+      }
+      
       if (!response.ok) throw new Error('Erro ao limpar mesas');
       
+      tablesVersion = response.headers.get('ETag') || tablesVersion;
+      
       // Limpar dados locais
       for (const tableNum in tablesData) {
         tablesData[tableNum] = [];
@@ -1341,12 +1663,10 @@ async function loadChecklist() {
 
   loadArrivedState();
 
-  // Usa allGuests se já carregado, senão busca
-  if (allGuests.length === 0) {
-    try {
-      await loadGuests();
-    } catch { return; }
-  }
+  // Atualiza a cópia local (só o que mudou desde a última vez)
+  try {
+    await loadGuests();
+  } catch { return; }
 
   // Montar lista: confirmados + acompanhantes, com mesa
   // Buscar arranjos de mesa
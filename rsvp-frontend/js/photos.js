@@ -3,8 +3,11 @@
 const API_BASE_URL = "https://rsvp-api-o8zt.onrender.com";
 const MAX_PHOTOS_PER_UPLOAD = 30;
 
+const PHOTOS_PAGE_SIZE = 30;
+
 // Estado da galeria
 let allPhotos = [];
+let nextPhotosCursor = null;
 let isLoadingPhotos = false;
 let selectedFiles = [];
 
@@ -16,30 +19,37 @@ document.addEventListener("DOMContentLoaded", () => {
 });
 
 // ========== CARREGAR FOTOS ==========
-async function loadPhotos() {
+// Carrega a primeira página (reset = true) ou a próxima, usando o cursor
+async function loadPhotos(reset = true) {
   if (isLoadingPhotos) return;
+  if (!reset && !nextPhotosCursor) return;
   
   isLoadingPhotos = true;
   const container = document.getElementById("photos-gallery");
   const loadingEl = document.getElementById("photos-loading");
   const emptyEl = document.getElementById("photos-empty");
-  const countEl = document.getElementById("photos-count");
 
   try {
     loadingEl?.classList.remove("hidden");
     emptyEl?.classList.add("hidden");
 
-    const response = await fetch(`${API_BASE_URL}/photos/`);
+    const params = new URLSearchParams({ limit: PHOTOS_PAGE_SIZE });
+    if (!reset) params.set("cursor", nextPhotosCursor);
+
+    const response = await fetch(`${API_BASE_URL}/photos/?${params}`);
     
     if (!response.ok) {
       throw new Error("Erro ao carregar fotos");
     }
 
-    allPhotos = await response.json();
+    const page = await response.json();
+    nextPhotosCursor = page.next_cursor;
 
-    // Atualizar contador
-    if (countEl) {
-      countEl.textContent = allPhotos.length;
+    if (reset) {
+      allPhotos = page.items;
+      loadPhotosCount();
+    } else {
+      allPhotos = allPhotos.concat(page.items);
     }
 
     // Renderizar galeria
@@ -48,13 +58,15 @@ async function loadPhotos() {
         container.innerHTML = "";
         emptyEl?.classList.remove("hidden");
       } else {
-        renderGallery(allPhotos, container);
+        renderGallery(page.items, container, !reset);
       }
     }
 
+    setupInfiniteScroll(container);
+
   } catch (error) {
     console.error("Erro ao carregar fotos:", error);
-    if (container) {
+    if (container && reset) {
       container.innerHTML = `
         <div class="error-message">
           Não foi possível carregar as fotos. 
@@ -70,14 +82,54 @@ async function loadPhotos() {
   }
 }
 
+async function loadPhotosCount() {
+  const countEl = document.getElementById("photos-count");
+  if (!countEl) return;
+
+  try {
+    const response = await fetch(`${API_BASE_URL}/photos/count`);
+    if (!response.ok) return;
+    const data = await response.json();
+    countEl.textContent = data.total;
+  } catch (error) {
+    console.error("Erro ao carregar total de fotos:", error);
+  }
+}
+
+// Sentinela no fim da galeria: quando aparece na tela, busca a próxima página
+let photosObserver = null;
+
+function setupInfiniteScroll(container) {
+  if (!container || !("IntersectionObserver" in window)) return;
+
+  let sentinel = document.getElementById("photos-sentinel");
+  if (!sentinel) {
+    sentinel = document.createElement("div");
+    sentinel.id = "photos-sentinel";
+    container.after(sentinel);
+  }
+
+  if (!photosObserver) {
+    photosObserver = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        loadPhotos(false);
+      }
+    }, { rootMargin: "400px" });
+    photosObserver.observe(sentinel);
+  }
+}
+
 // ========== RENDERIZAR GALERIA ==========
-function renderGallery(photos, container) {
-  container.innerHTML = photos
+function renderGallery(photos, container, append = false) {
+  const html = photos
     .map(
       (photo) => `
       <div class="photo-item" data-photo-id="${photo.id}">
         <img 
-          src="${photo.photo_url}" 
+          src="${photo.thumbnail_url || photo.photo_url}" 
+          ${photo.thumbnail_url && photo.medium_url
+            ? `srcset="${photo.thumbnail_url} 480w, ${photo.medium_url} 1080w" sizes="(max-width: 600px) 50vw, 33vw"`
+            : ""}
           alt="Foto da festa" 
           class="photo-img js-open-photo"
           loading="lazy"
@@ -92,6 +144,12 @@ function renderGallery(photos, container) {
     `
     )
     .join("");
+
+  if (append) {
+    container.insertAdjacentHTML("beforeend", html);
+  } else {
+    container.innerHTML = html;
+  }
 }
 
 // ========== UPLOAD DE FOTOS ==========
@@ -194,11 +252,23 @@ function setupPhotoUpload() {
         throw new Error(error.detail || "Erro ao enviar fotos");
       }
 
-      const uploadedPhotos = await response.json();
+      const result = await response.json();
+      const rejected = result.errors || [];
+
+      if (rejected.length) {
+        console.warn("Fotos recusadas:", rejected);
+      }
+
+      // O servidor processa as fotos em segundo plano: acompanhar os jobs
+      showPhotoStatus("Processando fotos...", "");
+      const jobs = await waitForPhotoJobs((result.jobs || []).map((j) => j.id));
+      const uploadedCount = jobs.filter((j) => j.status === "DONE").length;
+      const failedCount = rejected.length + jobs.filter((j) => j.status === "ERROR").length;
 
       // Sucesso!
       showPhotoStatus(
-        `${uploadedPhotos.length} foto${uploadedPhotos.length > 1 ? 's' : ''} enviada${uploadedPhotos.length > 1 ? 's' : ''} com sucesso! 🎉`, 
+        `${uploadedCount} foto${uploadedCount > 1 ? 's' : ''} enviada${uploadedCount > 1 ? 's' : ''} com sucesso! 🎉` +
+          (failedCount ? ` (${failedCount} com erro)` : ""), 
         "success"
       );
       
@@ -222,6 +292,27 @@ function setupPhotoUpload() {
   });
 }
 
+// Consulta /photos/jobs até todos os jobs terminarem (DONE ou ERROR)
+async function waitForPhotoJobs(jobIds, intervalMs = 1500, timeoutMs = 180000) {
+  if (!jobIds.length) return [];
+
+  const query = jobIds.map((id) => `ids=${encodeURIComponent(id)}`).join("&");
+  const deadline = Date.now() + timeoutMs;
+  let jobs = [];
+
+  while (Date.now() < deadline) {
+    const response = await fetch(`${API_BASE_URL}/photos/jobs?${query}`);
+    if (response.ok) {
+      jobs = await response.json();
+      const pending = jobs.some((j) => j.status === "PENDING" || j.status === "PROCESSING");
+      if (!pending) return jobs;
+    }
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+
+  return jobs;
+}
+
 // ========== PREVIEWS ==========
 function showPreviews(files) {
   const previewContainer = document.getElementById("photo-preview-container");
@@ -163,6 +163,29 @@ function validateForm() {
 /* ===========================
    Envio do formulário
 =========================== */
+// Mesma chave nos reenvios da mesma resposta (duplo clique, nova
+// tentativa após erro de rede): o servidor devolve o RSVP já gravado
+// em vez de criar outro convidado. Resposta diferente = chave nova
+// (o servidor recusa a mesma chave com outro corpo).
+function newIdempotencyKey() {
+  return window.crypto && crypto.randomUUID
+    ? crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+}
+
+let idempotencyKey = newIdempotencyKey();
+let idempotencyBody = null;
+
+function resetIdempotencyKey() {
+  idempotencyKey = newIdempotencyKey();
+  idempotencyBody = null;
+}
+
+// Voltar para a página pelo histórico (bfcache) não reaproveita a chave
+window.addEventListener("pageshow", (event) => {
+  if (event.persisted) resetIdempotencyKey();
+});
+
 if (form) {
   // Estado inicial
   toggleCompanionsSection();
@@ -201,14 +224,23 @@ if (form) {
       companions,
     };
 
+    const body = JSON.stringify(payload);
+    if (idempotencyBody !== null && idempotencyBody !== body) {
+      resetIdempotencyKey();
+    }
+    idempotencyBody = body;
+
     submitBtn.disabled = true;
     submitBtn.textContent = "Enviando...";
 
     try {
       const response = await fetch(`${API_BASE_URL}/guests/`, {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify(payload),
+        headers: {
+          "Content-Type": "application/json",
+          "Idempotency-Key": idempotencyKey,
+        },
+        body,
       });
 
       const text = await response.text();
@@ -218,9 +250,18 @@ if (form) {
           errorData = JSON.parse(text);
         } catch {}
         console.error("Erro ao enviar RSVP", errorData);
+        // 429/503: servidor pediu para esperar (Retry-After)
+        if (response.status === 429 || response.status === 503) {
+          const wait = Number(response.headers.get("Retry-After")) || 30;
+          throw new Error(
+            `${errorData.detail || "Muitas tentativas."} Tente de novo em ${wait} segundos.`
+          );
+        }
         throw new Error("Erro ao enviar sua resposta. Tente novamente.");
       }
 
+      // Próximo envio (ex.: outra pessoa no mesmo aparelho) é outro RSVP
+      resetIdempotencyKey();
       window.location.href = `success.html?status=${encodeURIComponent(
         rsvp_status
       )}`;
@@ -12,7 +12,6 @@ const noTablesEl = document.getElementById('no-tables');
 const tablesContainer = document.getElementById('tables-container');
 
 let allTables = {};
-let allPeople = [];
 
 // Carregar dados ao iniciar
 document.addEventListener('DOMContentLoaded', () => {
@@ -30,43 +29,24 @@ async function loadTablesData() {
     noTablesEl?.classList.add('hidden');
     tablesContainer.innerHTML = '';
 
-    console.log('Carregando pessoas...');
-    
-    // Carregar lista de pessoas (endpoint público)
-    const peopleResponse = await fetch(`${API_URL}/tables/people/public`);
-    console.log('People response status:', peopleResponse.status);
-    
-    if (!peopleResponse.ok) {
-      const errorText = await peopleResponse.text();
-      console.error('Erro ao carregar pessoas:', errorText);
-      
-      // Se o endpoint não existe (404), mostrar mensagem específica
-      if (peopleResponse.status === 404) {
-        throw new Error('BACKEND_NOT_DEPLOYED');
-      }
-      throw new Error('Erro ao carregar pessoas');
-    }
-    
-    allPeople = await peopleResponse.json();
-    console.log('Pessoas carregadas:', allPeople.length);
-
     console.log('Carregando mesas...');
     
-    // Carregar arranjo de mesas (endpoint público)
-    const tablesResponse = await fetch(`${API_URL}/tables/view`);
-    console.log('Tables response status:', tablesResponse.status);
+    // Mesas com nomes já resolvidos, em uma única requisição (endpoint público)
+    const seatingResponse = await fetch(`${API_URL}/tables/seating`);
+    console.log('Seating response status:', seatingResponse.status);
     
-    if (!tablesResponse.ok) {
-      const errorText = await tablesResponse.text();
+    if (!seatingResponse.ok) {
+      const errorText = await seatingResponse.text();
       console.error('Erro ao carregar mesas:', errorText);
       
-      if (tablesResponse.status === 404) {
+      // Se o endpoint não existe (404), mostrar mensagem específica
+      if (seatingResponse.status === 404) {
         throw new Error('BACKEND_NOT_DEPLOYED');
       }
       throw new Error('Erro ao carregar mesas');
     }
     
-    allTables = await tablesResponse.json();
+    allTables = await seatingResponse.json();
     console.log('Mesas carregadas:', Object.keys(allTables).length);
 
     loadingEl?.classList.add('hidden');
@@ -94,8 +74,7 @@ async function loadTablesData() {
           </p>
           <p style="margin-top: 1rem; font-size: 0.9rem; color: #666;">
             Endpoints necessários:<br>
-            • GET /tables/view<br>
-            • GET /tables/people/public
+            • GET /tables/seating
           </p>
         `;
       }
@@ -123,20 +102,16 @@ function renderTables(searchQuery = '') {
 
   const renderedTables = tableNumbers
     .map((tableNum) => {
-      const peopleIds = allTables[tableNum] || [];
+      const seated = allTables[tableNum] || [];
       
-      if (peopleIds.length === 0) return null; // Não mostrar mesas vazias
+      if (seated.length === 0) return null; // Não mostrar mesas vazias
 
       // Obter informações das pessoas
-      const peopleInfo = peopleIds
-        .map((personId, index) => {
-          if (!personId) return null;
-          
-          const person = allPeople.find((p) => p.id === personId);
-          if (!person) return null;
-
-          // Remover setinhas de acompanhante e limpar nome
-          const cleanName = person.name.replace('  ↳ ', '').trim();
+      const peopleInfo = seated
+        .map((person, index) => {
+          if (!person || !person.name) return null;
+
+          const cleanName = person.name.trim();
 
           // Normalizar nome para comparação
           const normalizedName = normalizeText(cleanName);